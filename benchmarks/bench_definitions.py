@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Micro-benchmarks of the coordinate table conversions used by the auto_input
+and auto_output methods of the data definitions.
+
+Each structure is timed with the per-coordinate loops used before the
+conversions were vectorised and with get_coords_frame. Run as:
+
+    python benchmarks/bench_definitions.py [n_points]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import MultiPoint, Point, Polygon
+
+from dtocean_app.data.definitions import get_coords_frame, get_point_coords
+
+
+def legacy_cartesian_list(coords):
+
+    x_vals = [x[0] for x in coords]
+    y_vals = [x[1] for x in coords]
+    z_vals = [x[2] for x in coords]
+
+    raw_dict = {"x": x_vals,
+                "y": y_vals,
+                "z": z_vals}
+
+    return pd.DataFrame(raw_dict)
+
+
+def legacy_point_list(points):
+
+    coords = [x.coords[0] for x in points]
+
+    x_vals = [x[0] for x in coords]
+    y_vals = [x[1] for x in coords]
+
+    z_vals = []
+
+    for x in coords:
+
+        if len(x) == 3:
+            z_vals.append(x[2])
+        else:
+            z_vals.append(None)
+
+    raw_dict = {"x": x_vals,
+                "y": y_vals,
+                "z": z_vals}
+
+    return pd.DataFrame(raw_dict)
+
+
+def legacy_point_dict(point_dict):
+
+    coord_dict = {k: v.coords[0] for k, v in point_dict.items()}
+
+    x_vals = [x[0] for x in coord_dict.values()]
+    y_vals = [x[1] for x in coord_dict.values()]
+
+    z_vals = []
+
+    for x in coord_dict.values():
+
+        if len(x) == 3:
+            z_vals.append(x[2])
+        else:
+            z_vals.append(None)
+
+    raw_dict = {"Key": coord_dict.keys(),
+                "x": x_vals,
+                "y": y_vals,
+                "z": z_vals}
+
+    return pd.DataFrame(raw_dict)
+
+
+def legacy_polygon(polygon):
+
+    coords = list(polygon.exterior.coords)[:-1]
+
+    x_vals = [x[0] for x in coords]
+    y_vals = [x[1] for x in coords]
+    z_vals = [x[2] for x in coords]
+
+    raw_dict = {"x": x_vals,
+                "y": y_vals,
+                "z": z_vals}
+
+    return pd.DataFrame(raw_dict)
+
+
+def vector_point_dict(point_dict):
+
+    keys = point_dict.keys()
+    coords = get_point_coords(point_dict[k] for k in keys)
+
+    return get_coords_frame(coords, keys)
+
+
+def vector_polygon(polygon):
+
+    coords = np.asarray(polygon.exterior.coords)[:-1]
+
+    return get_coords_frame(coords)
+
+
+def get_cases(n_points):
+
+    coords = np.random.rand(n_points, 3)
+    points = [Point(coord) for coord in coords]
+    point_dict = {"point{}".format(i): point
+                                        for i, point in enumerate(points)}
+
+    angles = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+    ring = np.column_stack([np.cos(angles),
+                            np.sin(angles),
+                            np.zeros(n_points)])
+    polygon = Polygon(ring)
+
+    cases = [("CartesianList",
+              legacy_cartesian_list,
+              get_coords_frame,
+              coords),
+             ("PointList",
+              legacy_point_list,
+              lambda x: get_coords_frame(get_point_coords(x)),
+              points),
+             ("MultiPoint",
+              legacy_point_list,
+              lambda x: get_coords_frame(get_point_coords(x)),
+              MultiPoint(points)),
+             ("PointDict",
+              legacy_point_dict,
+              vector_point_dict,
+              point_dict),
+             ("PolygonData",
+              legacy_polygon,
+              vector_polygon,
+              polygon)]
+
+    return cases
+
+
+def main(n_points=50000, repeat=5):
+
+    print "{} points, best of {} runs".format(n_points, repeat)
+    print "{:<15}{:>12}{:>12}{:>10}".format("Structure",
+                                            "Loops (s)",
+                                            "Vector (s)",
+                                            "Speed-up")
+
+    for name, legacy, vector, data in get_cases(n_points):
+
+        legacy_time = min(timeit.repeat(lambda: legacy(data),
+                                        number=1,
+                                        repeat=repeat))
+        vector_time = min(timeit.repeat(lambda: vector(data),
+                                        number=1,
+                                        repeat=repeat))
+
+        print "{:<15}{:>12.4f}{:>12.4f}{:>9.1f}x".format(
+                                                name,
+                                                legacy_time,
+                                                vector_time,
+                                                legacy_time / vector_time)
+
+    return
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -16,6 +16,7 @@
 
 import os
 import sys
+import logging
 import argparse
 import warnings
 import traceback
@@ -173,6 +174,12 @@ def main(debug=False, trace_warnings=False):
     
     # Bring up the logger
     start_logging(debug)
+    
+    # Figures are only shown in embedded canvases, so pyplot does not need a
+    # GUI backend. With Agg, figures can also be created outside of the GUI
+    # thread.
+    import matplotlib.pyplot as plt
+    plt.switch_backend("agg")
 
     # Build the main app
     app = QtGui.QApplication(sys.argv)
@@ -233,3 +240,115 @@ def gui_interface():
 
     return
 
+
+def batch_parser(args):
+    
+    '''Command line parser for run_batch.
+    
+    Example:
+    
+        To get help::
+        
+            $ dtocean-app-batch -h
+            
+    '''
+    
+    from .batch import RUN_OPTIONS
+    
+    epiStr = ('Mathew Topper (c) 2017.')
+              
+    desStr = ("Execute a DTOcean project without the graphical interface "
+              "and save the result.")
+
+    parser = argparse.ArgumentParser(description=desStr,
+                                     epilog=epiStr)
+    
+    parser.add_argument("project_path",
+                        help=("path to the .dto or .prj project file"),
+                        type=str)
+    
+    parser.add_argument("-r", "--run",
+                        help=("what to execute: the current module, the "
+                              "assessment themes or the stored strategy "
+                              "(default: current)"),
+                        choices=RUN_OPTIONS,
+                        default="current")
+
+    parser.add_argument("-o", "--out",
+                        help=("path to the .dto file to save, defaults to "
+                              "overwriting the input project"),
+                        type=str,
+                        default=None)
+    
+    parser.add_argument("--compression",
+                        help=("compression type for the saved project, "
+                              "overriding the files.ini configuration"),
+                        choices=["gzip", "zstd"],
+                        default=None)
+    
+    parser.add_argument("--level",
+                        help=("compression level for the saved project, "
+                              "overriding the files.ini configuration"),
+                        type=int,
+                        default=None)
+    
+    parser.add_argument("--trace-warnings",
+                        help=("add stack trace to warnings"),
+                        action='store_true')
+                        
+    args = parser.parse_args(args)
+
+    project_path = args.project_path
+    run = args.run
+    save_path = args.out
+    compression = args.compression
+    level = args.level
+    trace_warnings = args.trace_warnings
+    
+    return (project_path,
+            run,
+            save_path,
+            compression,
+            level,
+            trace_warnings)
+
+
+def batch_interface():
+    
+    '''Command line interface for run_batch.'''
+    
+    (project_path,
+     run,
+     save_path,
+     compression,
+     level,
+     trace_warnings) = batch_parser(sys.argv[1:])
+    
+    # Add traces to warnings
+    if trace_warnings: warnings.showwarning = warn_with_traceback
+    
+    # Disable the logging widget handler and log to the console instead
+    start_logging(debug=True)
+    
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(
+                    '%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+    logging.getLogger().addHandler(console)
+    
+    # Records of the dtocean_app logger only reach the root handlers if it
+    # propagates, so the console is added to it otherwise
+    app_logger = logging.getLogger("dtocean_app")
+    if not app_logger.propagate: app_logger.addHandler(console)
+    
+    from .batch import run_batch
+    from .configure import get_save_options
+    
+    save_options = get_save_options()
+    
+    if compression is not None: save_options["compression"] = compression
+    if level is not None: save_options["level"] = level
+    
+    dst_path = run_batch(project_path, save_path, run, **save_options)
+    print "Project saved to {}".format(dst_path)
+
+    return
@@ -0,0 +1,1464 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Reading and writing of .dto project archives.
+
+A .dto file is a tar archive. Archives written by this module contain a JSON
+manifest, the output scope, the optional dumped strategy, the project
+structure without its data pool and one member for each distinct entry of
+the data pool. The project and pool members are
+pickled and compressed straight into the archive, which is written next to
+the target path and moved into place once complete. Pool members are named
+by the SHA-1 digest of their pickled data, so that identical entries are
+stored once.
+
+When loading lazily, only the project structure is read and each entry of
+the data pool is read from the archive the first time it is accessed.
+Incremental saves append the changed pool entries, the project structure and
+a new manifest to the existing archive. The scope, strategy and project
+members of each save are numbered, so that they never replace the members of
+an earlier save, and the manifest is written last. Only the members listed
+by the last complete manifest are read, so an interrupted save leaves the
+previous save intact.
+
+Older archives, which contain the dumped project as project.prj, can still be
+read. These functions do not depend on the GUI so that projects can also be
+processed without a display.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import os
+import re
+import copy
+import json
+import time
+import zlib
+import shutil
+import tarfile
+import hashlib
+import tempfile
+import threading
+import cPickle as pickle
+
+from dtocean_core.core import Core
+from dtocean_core.extensions import StrategyManager
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+ARCHIVE_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+COMPRESSION_EXTS = {"gzip": ".gz",
+                    "zstd": ".zst"}
+
+# Pool members named by the SHA-1 digest of their pickled data
+DIGEST_MEMBER_RE = re.compile(r"^pool/([0-9a-f]{40})\.pkl\.")
+
+# Serialises reads of lazily loaded pool entries
+_lazy_lock = threading.Lock()
+
+
+def get_compression_types():
+
+    '''Get the available compression types for writing archives'''
+
+    compression_types = ["gzip"]
+    if zstd is not None: compression_types.append("zstd")
+
+    return compression_types
+
+
+class CompressedWriter(object):
+
+    '''File-like object which compresses the data written to it into
+    another (open) file object. If a hashlib object is given, it is updated
+    with the uncompressed data. Closing the writer does not close the
+    underlying file.'''
+
+    buffer_size = 1048576
+
+    def __init__(self, fileobj, compression="gzip", level=6, hasher=None):
+
+        self._fileobj = fileobj
+        self._hasher = hasher
+        self._compressor = self._get_compressor(compression, level)
+        self._buffer = []
+        self._buffer_len = 0
+
+        return
+
+    def write(self, data):
+
+        self._buffer.append(data)
+        self._buffer_len += len(data)
+
+        if self._buffer_len >= self.buffer_size: self._flush_buffer()
+
+        return
+
+    def close(self):
+
+        self._flush_buffer()
+        self._fileobj.write(self._compressor.flush())
+
+        return
+
+    def _flush_buffer(self):
+
+        if not self._buffer: return
+
+        data = "".join(self._buffer)
+        self._fileobj.write(self._compressor.compress(data))
+
+        if self._hasher is not None: self._hasher.update(data)
+
+        self._buffer = []
+        self._buffer_len = 0
+
+        return
+
+    @staticmethod
+    def _get_compressor(compression, level):
+
+        if compression == "gzip":
+
+            compressor = zlib.compressobj(level,
+                                          zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+
+        elif compression == "zstd":
+
+            if zstd is None:
+                errStr = "zstd compression requires the zstandard package"
+                raise ImportError(errStr)
+
+            compressor = zstd.ZstdCompressor(level=level).compressobj()
+
+        else:
+
+            errStr = ("Compression type must be one of {}. Passed type was "
+                      "'{}'").format(", ".join(COMPRESSION_EXTS.keys()),
+                                     compression)
+            raise ValueError(errStr)
+
+        return compressor
+
+
+class CompressedReader(object):
+
+    '''File-like object which decompresses data read from another file
+    object. Supports the read and readline methods required by pickle.'''
+
+    chunk_size = 1048576
+
+    def __init__(self, fileobj, compression="gzip"):
+
+        self._fileobj = fileobj
+        self._decompressor = self._get_decompressor(compression)
+        self._buffer = ""
+        self._eof = False
+
+        return
+
+    def read(self, size=-1):
+
+        if size < 0:
+
+            while not self._eof: self._fill()
+
+            data = self._buffer
+            self._buffer = ""
+
+            return data
+
+        while len(self._buffer) < size and not self._eof: self._fill()
+
+        data = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+
+        return data
+
+    def readline(self):
+
+        while "\n" not in self._buffer and not self._eof: self._fill()
+
+        index = self._buffer.find("\n")
+
+        if index < 0:
+            index = len(self._buffer)
+        else:
+            index += 1
+
+        data = self._buffer[:index]
+        self._buffer = self._buffer[index:]
+
+        return data
+
+    def _fill(self):
+
+        raw_data = self._fileobj.read(self.chunk_size)
+
+        if not raw_data:
+
+            self._eof = True
+
+            return
+
+        self._buffer += self._decompressor.decompress(raw_data)
+
+        return
+
+    @staticmethod
+    def _get_decompressor(compression):
+
+        if compression == "gzip":
+
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        elif compression == "zstd":
+
+            if zstd is None:
+                errStr = "zstd compression requires the zstandard package"
+                raise ImportError(errStr)
+
+            decompressor = zstd.ZstdDecompressor().decompressobj()
+
+        else:
+
+            errStr = "Compression type '{}' not recognised".format(
+                                                                compression)
+            raise ValueError(errStr)
+
+        return decompressor
+
+
+class ArchiveWriter(object):
+
+    '''Write members into an uncompressed tar file without knowing their size
+    in advance. The header of each member is written once its data is
+    complete, so the target file must be seekable.
+
+    Args:
+      fileobj (file): open, seekable file object
+      compression (str, optional): compression for pickled members
+      level (int, optional): compression level
+      existing_members (list, optional): names of members already in the
+        archive, when appending to it
+    '''
+
+    def __init__(self, fileobj,
+                       compression="gzip",
+                       level=6,
+                       existing_members=None):
+
+        if compression not in COMPRESSION_EXTS:
+
+            errStr = ("Compression type must be one of {}. Passed type was "
+                      "'{}'").format(", ".join(COMPRESSION_EXTS.keys()),
+                                     compression)
+            raise ValueError(errStr)
+
+        self.compression = compression
+        self.level = level
+        self._fileobj = fileobj
+        self._header_pos = None
+        self._start_pos = fileobj.tell()
+
+        if existing_members is None:
+            self._existing_members = set()
+        else:
+            self._existing_members = set(existing_members)
+
+        # Data offset and size of each member
+        self.members = {}
+
+        return
+
+    def add_bytes(self, name, data):
+
+        '''Add a member containing the given string'''
+
+        self._start_member()
+        self._fileobj.write(data)
+        self._end_member(name)
+
+        return name
+
+    def add_file(self, name, file_path):
+
+        '''Add a member containing a copy of the given file'''
+
+        with open(file_path, "rb") as fstream:
+            self.add_fileobj(name, fstream)
+
+        return name
+
+    def add_fileobj(self, name, fileobj):
+
+        '''Add a member containing the remaining data in fileobj'''
+
+        self._start_member()
+        shutil.copyfileobj(fileobj, self._fileobj)
+        self._end_member(name)
+
+        return name
+
+    def add_pickle(self, name, obj):
+
+        '''Add a member containing the compressed pickle of obj. The
+        compression extension is added to the name, which is returned.'''
+
+        name += COMPRESSION_EXTS[self.compression]
+
+        self._start_member()
+
+        writer = CompressedWriter(self._fileobj, self.compression, self.level)
+        pickle.dump(obj, writer, -1)
+        writer.close()
+
+        self._end_member(name)
+
+        return name
+
+    def add_data_pickle(self, obj, digest=None):
+
+        '''Add a pool member containing the compressed pickle of obj, named
+        by the SHA-1 digest of the pickle. If the archive already contains
+        a member with the same name, nothing is written. If the digest is
+        already known it can be given to avoid pickling obj needlessly.
+        Returns the member name.'''
+
+        if digest is not None:
+
+            name = self._get_digest_name(digest)
+            if self.has_member(name): return name
+
+        hasher = hashlib.sha1()
+
+        self._start_member()
+
+        writer = CompressedWriter(self._fileobj,
+                                  self.compression,
+                                  self.level,
+                                  hasher)
+        pickle.dump(obj, writer, -1)
+        writer.close()
+
+        name = self._get_digest_name(hasher.hexdigest())
+
+        if self.has_member(name):
+            self._discard_member()
+        else:
+            self._end_member(name)
+
+        return name
+
+    def has_member(self, name):
+
+        return name in self.members or name in self._existing_members
+
+    def get_bytes_written(self):
+
+        return self._fileobj.tell() - self._start_pos
+
+    def close(self):
+
+        '''Write the end of archive marker'''
+
+        self._fileobj.write(tarfile.NUL * tarfile.BLOCKSIZE * 2)
+
+        _, remainder = divmod(self._fileobj.tell(), tarfile.RECORDSIZE)
+
+        if remainder > 0:
+            self._fileobj.write(tarfile.NUL *
+                                        (tarfile.RECORDSIZE - remainder))
+
+        return
+
+    def _get_digest_name(self, digest):
+
+        return "pool/{}.pkl{}".format(digest,
+                                      COMPRESSION_EXTS[self.compression])
+
+    def _discard_member(self):
+
+        self._fileobj.seek(self._header_pos)
+        self._fileobj.truncate()
+        self._header_pos = None
+
+        return
+
+    def _start_member(self):
+
+        self._header_pos = self._fileobj.tell()
+        self._fileobj.write(tarfile.NUL * tarfile.BLOCKSIZE)
+
+        return
+
+    def _end_member(self, name):
+
+        size = self._fileobj.tell() - self._header_pos - tarfile.BLOCKSIZE
+
+        _, remainder = divmod(size, tarfile.BLOCKSIZE)
+
+        if remainder > 0:
+            self._fileobj.write(tarfile.NUL *
+                                        (tarfile.BLOCKSIZE - remainder))
+
+        tarinfo = tarfile.TarInfo(name)
+        tarinfo.size = size
+        tarinfo.mtime = int(time.time())
+        tarinfo.mode = 0644
+
+        header = tarinfo.tobuf(tarfile.USTAR_FORMAT)
+        end_pos = self._fileobj.tell()
+
+        if len(header) != tarfile.BLOCKSIZE:
+            errStr = "Archive member name '{}' is too long".format(name)
+            raise ValueError(errStr)
+
+        self._fileobj.seek(self._header_pos)
+        self._fileobj.write(header)
+        self._fileobj.seek(end_pos)
+
+        self.members[name] = (self._header_pos + tarfile.BLOCKSIZE, size)
+        self._header_pos = None
+
+        return
+
+class _MemberFile(object):
+
+    '''Read-only file object limited to a single archive member'''
+
+    def __init__(self, fileobj, size):
+
+        self._fileobj = fileobj
+        self._remaining = size
+
+        return
+
+    def read(self, size=-1):
+
+        if size < 0 or size > self._remaining: size = self._remaining
+        if size == 0: return ""
+
+        data = self._fileobj.read(size)
+        self._remaining -= len(data)
+
+        return data
+
+
+class ArchiveSource(object):
+
+    '''Random access to the members of an archive written by this module.
+    The archive is reopened for every read, so no file handle is held between
+    reads.
+
+    Args:
+      path (str): path to the archive
+      compression (str): compression of the pickled members
+      offsets (dict): (data offset, size) tuple of each member, keyed by the
+        member name
+    '''
+
+    def __init__(self, path, compression, offsets):
+
+        self.path = path
+        self.compression = compression
+        self._offsets = offsets
+        self._replaced = False
+
+        return
+
+    @property
+    def replaced(self):
+        return self._replaced
+
+    def redirect(self, source, member_map):
+
+        '''Read the members from another archive, which has replaced this
+        archive on disk. member_map gives the name in the new archive of each
+        member still in use. Must be called with the lazy loading lock held.'''
+
+        self.path = source.path
+        self.compression = source.compression
+        self._offsets = {name: source._offsets[new_name]
+                                for name, new_name in member_map.iteritems()}
+
+        # The member names no longer match the archive on disk
+        self._replaced = True
+
+        return
+
+    def read_pickle(self, member_name):
+
+        '''Read the object pickled in the given member'''
+
+        with open(self.path, "rb") as fstream:
+
+            member_file = self._open_member(fstream, member_name)
+            reader = CompressedReader(member_file, self.compression)
+            obj = pickle.load(reader)
+
+        return obj
+
+    def copy_member(self, member_name, writer, name):
+
+        '''Copy the (compressed) data of the given member into a new member
+        of an ArchiveWriter'''
+
+        with open(self.path, "rb") as fstream:
+
+            member_file = self._open_member(fstream, member_name)
+            writer.add_fileobj(name, member_file)
+
+        return name
+
+    def _open_member(self, fstream, member_name):
+
+        offset, size = self._offsets[member_name]
+        fstream.seek(offset)
+
+        return _MemberFile(fstream, size)
+
+
+class LazyPoolData(dict):
+
+    '''Dictionary for the data of a DataPool which is backed by an archive.
+    Entries which are unchanged since the archive was read or written are
+    recorded against their archive member. Those which have not been read
+    yet are read the first time they are accessed, but still appear as keys
+    of the dictionary.
+
+    Args:
+      source (ArchiveSource): archive containing the entries
+      members (dict): member name of each entry stored in the archive, keyed
+        by data index
+    '''
+
+    def __init__(self, source, members):
+
+        super(LazyPoolData, self).__init__()
+
+        self._source = source
+        self._members = dict(members)
+
+        # Last key read from each member, for sharing identical data
+        self._member_keys = {}
+
+        return
+
+    @property
+    def source(self):
+        return self._source
+
+    def is_loaded(self, key):
+
+        return dict.__contains__(self, key)
+
+    def is_saved(self, key):
+
+        '''True if the entry is unchanged since the archive was written'''
+
+        return key in self._members
+
+    def get_n_unloaded(self):
+
+        return len(self._get_unloaded_keys())
+
+    def get_digests(self):
+
+        '''Get the digests of the unchanged entries stored in members named
+        by digest, keyed by data index'''
+
+        digests = {}
+
+        for key, member_name in self._members.iteritems():
+
+            match = DIGEST_MEMBER_RE.match(member_name)
+            if match is not None: digests[key] = match.group(1)
+
+        return digests
+
+    def get_source_member(self, key):
+
+        '''Get the source and member name of an entry which is unchanged since
+        the archive was written, or None otherwise'''
+
+        member_name = self._members.get(key)
+        if member_name is None: return None
+
+        return self._source, member_name
+
+    def set_source(self, source, members):
+
+        '''Change the archive backing the entries, for instance after the
+        pool has been saved. All current entries must be stored in it.'''
+
+        with _lazy_lock:
+
+            self._source = source
+            self._members = {key: members[key] for key in self.keys()
+                                                            if key in members}
+            self._member_keys = {}
+
+        return
+
+    def set_saved(self, snapshot):
+
+        '''Take the archive backing the entries from a saved copy of this
+        dictionary and record the entries which are unchanged since the
+        copy was made.'''
+
+        with _lazy_lock:
+
+            members = {}
+
+            for key, member_name in snapshot._members.iteritems():
+
+                if (key in self._members or
+                    (dict.__contains__(self, key) and
+                     dict.__contains__(snapshot, key) and
+                     dict.__getitem__(self, key) is
+                                            dict.__getitem__(snapshot, key))):
+                    members[key] = member_name
+
+            self._source = snapshot._source
+            self._members = members
+            self._member_keys = {}
+
+        return
+
+    def load_all(self):
+
+        for key in self._get_unloaded_keys(): self[key]
+
+        return
+
+    def _get_unloaded_keys(self):
+
+        return [key for key in self._members.keys()
+                                        if not dict.__contains__(self, key)]
+
+    def __missing__(self, key):
+
+        with _lazy_lock:
+
+            if dict.__contains__(self, key):
+                return dict.__getitem__(self, key)
+
+            if key not in self._members: raise KeyError(key)
+
+            member_name = self._members[key]
+            other_key = self._member_keys.get(member_name)
+
+            # Share the data if the member has already been read
+            if (other_key is not None and
+                self._members.get(other_key) == member_name and
+                dict.__contains__(self, other_key)):
+                value = dict.__getitem__(self, other_key)
+            else:
+                value = self._source.read_pickle(member_name)
+
+            dict.__setitem__(self, key, value)
+            self._member_keys[member_name] = key
+
+        return value
+
+    def __contains__(self, key):
+
+        return dict.__contains__(self, key) or key in self._members
+
+    def __setitem__(self, key, value):
+
+        self._members.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+        return
+
+    def __delitem__(self, key):
+
+        if key not in self: raise KeyError(key)
+
+        self._members.pop(key, None)
+        if dict.__contains__(self, key): dict.__delitem__(self, key)
+
+        return
+
+    def __iter__(self):
+
+        return iter(self.keys())
+
+    def __len__(self):
+
+        return dict.__len__(self) + len(self._get_unloaded_keys())
+
+    def get(self, key, default=None):
+
+        if key in self: return self[key]
+
+        return default
+
+    def pop(self, key, *args):
+
+        if key in self: self[key]
+        self._members.pop(key, None)
+
+        return dict.pop(self, key, *args)
+
+    def keys(self):
+
+        return dict.keys(self) + self._get_unloaded_keys()
+
+    def iterkeys(self):
+
+        return iter(self.keys())
+
+    def values(self):
+
+        self.load_all()
+
+        return dict.values(self)
+
+    def itervalues(self):
+
+        self.load_all()
+
+        return dict.itervalues(self)
+
+    def items(self):
+
+        self.load_all()
+
+        return dict.items(self)
+
+    def iteritems(self):
+
+        self.load_all()
+
+        return dict.iteritems(self)
+
+    def copy(self):
+
+        return _rebuild_lazy_pool_data(self._source,
+                                       self._members,
+                                       dict(dict.iteritems(self)))
+
+    def __reduce__(self):
+
+        loaded = dict(dict.iteritems(self))
+
+        # Copies and pickles of a fully read pool are plain dictionaries
+        if not self._get_unloaded_keys(): return (dict, (loaded,))
+
+        return (_rebuild_lazy_pool_data,
+                (self._source, self._members, loaded))
+
+
+def _rebuild_lazy_pool_data(source, members, loaded):
+
+    pool_data = LazyPoolData(source, members)
+    dict.update(pool_data, loaded)
+
+    return pool_data
+
+
+def get_project_snapshot(project):
+
+    '''Copy a project so that it can be saved while the original remains in
+    use. The project structure is copied and the data pool entries, which
+    are replaced rather than modified, are shared.'''
+
+    snapshot = copy.deepcopy(get_project_structure(project))
+    pool_data = project._pool._data
+
+    if isinstance(pool_data, LazyPoolData):
+        snapshot._pool._data = pool_data.copy()
+    else:
+        snapshot._pool._data = dict(pool_data)
+
+    return snapshot
+
+
+def set_project_saved(project, snapshot):
+
+    '''Record the data pool entries of project which are unchanged since
+    snapshot was saved, so that they are not written again by the next
+    incremental save.'''
+
+    pool_data = project._pool._data
+
+    if not isinstance(pool_data, LazyPoolData):
+        pool_data = _rebuild_lazy_pool_data(None, {}, pool_data)
+        project._pool._data = pool_data
+
+    pool_data.set_saved(snapshot._pool._data)
+
+    return
+
+
+def load_project_data(project):
+
+    '''Read the data pool entries of project which are still stored in its
+    archive, so that the project no longer depends on the archive file'''
+
+    pool_data = project._pool._data
+
+    if isinstance(pool_data, LazyPoolData): pool_data.load_all()
+
+    return
+
+
+def get_project_structure(project):
+
+    '''Get a shallow copy of the project with an empty data pool. The pool
+    retains its indexes and links, so that its data can be restored.'''
+
+    structure = copy.copy(project)
+
+    pool = copy.copy(project._pool)
+    pool._data = {}
+
+    structure._pool = pool
+
+    return structure
+
+
+def load_project_archive(load_path,
+                         core,
+                         strategy_manager_cls=StrategyManager,
+                         lazy=False):
+
+    '''Load a project from a .dto archive or a .prj file.
+
+    Args:
+      load_path (str): path to the .dto or .prj file
+      core (Core): core used to load the project
+      strategy_manager_cls (class, optional): StrategyManager (sub)class used
+        to load any strategy found in the archive
+      lazy (bool, optional): if True, the entries of the data pool are read
+        from the archive when first accessed, rather than on loading. Only
+        applies to archives with a manifest; older files are always read in
+        full. The archive must not be moved or deleted while the project is
+        in use.
+
+    Returns:
+      tuple: (project, scope, strategy). The project is a dtocean-core
+        Project, the scope defaults to "global" and the strategy is None if
+        none was found.
+    '''
+
+    ext = os.path.splitext(load_path)[1]
+
+    if ext == ".prj":
+
+        project = Core.load_project(core, load_path)
+
+        return project, "global", None
+
+    elif ext != ".dto":
+
+        errStr = ("The file path must be a file with either .dto or "
+                  ".prj extension")
+        raise ValueError(errStr)
+
+    tar = tarfile.open(load_path)
+
+    try:
+
+        if MANIFEST_NAME in tar.getnames():
+            result = _load_archive(tar,
+                                   load_path,
+                                   strategy_manager_cls,
+                                   lazy)
+        else:
+            result = _load_legacy_archive(tar, core, strategy_manager_cls)
+
+    finally:
+
+        tar.close()
+
+    return result
+
+
+def _load_archive(tar, load_path, strategy_manager_cls, lazy):
+
+    manifest_member = _get_manifest_member(tar)
+    manifest = json.load(tar.extractfile(manifest_member))
+
+    if manifest["version"] > ARCHIVE_VERSION:
+
+        errStr = ("Archive version {} is not supported. Please upgrade "
+                  "dtocean-app").format(manifest["version"])
+        raise IOError(errStr)
+
+    compression = manifest["compression"]
+    members = _get_manifest_members(tar, manifest_member, manifest)
+
+    project = _read_pickle(tar, members[manifest["project"]], compression)
+
+    # JSON keys are unicode but the pool indexes are not
+    pool_members = {str(data_index): member_name
+                    for data_index, member_name in manifest["pool"].iteritems()}
+
+    offsets = {name: (member.offset_data, member.size)
+                                        for name, member in members.iteritems()}
+    source = ArchiveSource(os.path.abspath(load_path), compression, offsets)
+
+    if lazy:
+
+        project._pool._data = LazyPoolData(source, pool_members)
+
+    else:
+
+        loaded = {}
+
+        for data_index, member_name in pool_members.iteritems():
+            loaded[data_index] = _read_pickle(tar,
+                                              members[member_name],
+                                              compression)
+
+        project._pool._data = _rebuild_lazy_pool_data(source,
+                                                      pool_members,
+                                                      loaded)
+
+    scope = json.load(tar.extractfile(members[manifest["scope"]]))
+    strategy = None
+
+    if manifest["strategy"] is not None:
+
+        dto_dir_path = tempfile.mkdtemp()
+
+        try:
+
+            tar.extract(members[manifest["strategy"]], dto_dir_path)
+            stg_file_path = os.path.join(dto_dir_path, manifest["strategy"])
+
+            strategy_manager = strategy_manager_cls()
+            strategy = strategy_manager.load_strategy(stg_file_path)
+
+        finally:
+
+            shutil.rmtree(dto_dir_path)
+
+    return project, scope, strategy
+
+
+def _get_manifest_member(tar):
+
+    '''Get the last manifest in the archive. Any members after it belong to
+    a save that did not complete.'''
+
+    for member in reversed(tar.getmembers()):
+        if member.name == MANIFEST_NAME: return member
+
+    errStr = "No manifest found in archive"
+    raise IOError(errStr)
+
+
+def _get_manifest_members(tar, manifest_member, manifest):
+
+    '''Get the members listed in a manifest, ignoring any members written
+    after it'''
+
+    names = set(manifest["pool"].values())
+    names.update(name for name in (manifest["project"],
+                                   manifest["scope"],
+                                   manifest["strategy"]) if name is not None)
+
+    members = {}
+
+    for member in tar.getmembers():
+
+        if member.offset > manifest_member.offset: break
+
+        # Later members replace earlier members with the same name
+        if member.name in names: members[member.name] = member
+
+    missing = names - set(members)
+
+    if missing:
+
+        errStr = ("Archive members listed in the manifest are "
+                  "missing: {}").format(", ".join(sorted(missing)))
+        raise IOError(errStr)
+
+    return members
+
+
+def _get_member_end(member):
+
+    n_blocks, remainder = divmod(member.size, tarfile.BLOCKSIZE)
+    if remainder: n_blocks += 1
+
+    return member.offset_data + n_blocks * tarfile.BLOCKSIZE
+
+
+def _read_pickle(tar, member, compression):
+
+    fileobj = tar.extractfile(member)
+    reader = CompressedReader(fileobj, compression)
+    obj = pickle.load(reader)
+
+    return obj
+
+
+def _load_legacy_archive(tar, core, strategy_manager_cls):
+
+    dto_dir_path = tempfile.mkdtemp()
+
+    try:
+
+        tar.extractall(dto_dir_path)
+
+        prj_file_path = os.path.join(dto_dir_path, "project.prj")
+        sco_file_path = os.path.join(dto_dir_path, "scope.json")
+        stg_file_path = os.path.join(dto_dir_path, "strategy.pkl")
+
+        # Load up the project
+        project = Core.load_project(core, prj_file_path)
+
+        # Load up the scope if one was found
+        if os.path.isfile(sco_file_path):
+
+            with open(sco_file_path, 'rb') as json_file:
+                scope = json.load(json_file)
+
+        else:
+
+            scope = "global"
+
+        # Load up the strategy if one was found
+        if os.path.isfile(stg_file_path):
+
+            strategy_manager = strategy_manager_cls()
+            strategy = strategy_manager.load_strategy(stg_file_path)
+
+        else:
+
+            strategy = None
+
+    finally:
+
+        # Delete temp directory
+        shutil.rmtree(dto_dir_path)
+
+    return project, scope, strategy
+
+
+def save_project_archive(save_path,
+                         project,
+                         scope="global",
+                         strategy=None,
+                         strategy_manager_cls=StrategyManager,
+                         compression="gzip",
+                         level=6,
+                         incremental=False,
+                         progress_callback=None):
+
+    '''Save a project, its output scope and an optional strategy to a .dto
+    archive. The archive is written to a temporary file in the same
+    directory as save_path and moved into place once complete.
+
+    If incremental is True and the project was last loaded from or saved to
+    save_path, with the same compression type, then only the data pool
+    entries which have changed since are written. These are appended to the
+    existing archive, with the project structure and a new manifest, and
+    the unchanged entries are referenced from the earlier saves. A full
+    (non-incremental) save removes the superseded members again.
+
+    Args:
+      save_path (str): path to the .dto file
+      project (Project): dtocean-core project to save
+      scope (str, optional): output scope
+      strategy (Strategy, optional): strategy to save
+      strategy_manager_cls (class, optional): StrategyManager (sub)class used
+        to dump the strategy
+      compression (str, optional): "gzip" or "zstd"
+      level (int, optional): compression level
+      incremental (bool, optional): append the changes to the existing
+        archive, if possible
+      progress_callback (callable, optional): called after each data pool
+        entry with the number of bytes written, the number of entries
+        processed and the total number of entries
+
+    Returns:
+      tuple: (file size in bytes, time taken in seconds)
+    '''
+
+    # Check the extension
+    if os.path.splitext(save_path)[1] != ".dto":
+
+        errStr = "The file path must be a file with .dto extension"
+        raise ValueError(errStr)
+
+    start_time = time.time()
+    save_path = os.path.abspath(save_path)
+    pool_data = project._pool._data
+
+    if incremental and _can_append(save_path, pool_data, compression):
+
+        (pool_members,
+         offsets,
+         n_changed) = _append_archive(save_path,
+                                      project,
+                                      scope,
+                                      strategy,
+                                      strategy_manager_cls,
+                                      compression,
+                                      level,
+                                      progress_callback)
+
+        offsets = dict(pool_data.source._offsets.items() + offsets.items())
+        save_type = "{} changed entries".format(n_changed)
+
+    else:
+
+        pool_members, offsets = _write_new_archive(save_path,
+                                                   project,
+                                                   scope,
+                                                   strategy,
+                                                   strategy_manager_cls,
+                                                   compression,
+                                                   level,
+                                                   progress_callback)
+        save_type = "full"
+
+    # The pool entries must now be read from the saved archive, as the
+    # original may have been replaced
+    source = ArchiveSource(save_path, compression, offsets)
+
+    if isinstance(pool_data, LazyPoolData):
+        pool_data.set_source(source, pool_members)
+    else:
+        project._pool._data = _rebuild_lazy_pool_data(source,
+                                                      pool_members,
+                                                      pool_data)
+
+    file_size = os.path.getsize(save_path)
+    elapsed = time.time() - start_time
+
+    msgStr = ("Saved project to {} ({}, {:.1f} MB, {} compression level {}) "
+              "in {:.1f} seconds").format(save_path,
+                                          save_type,
+                                          file_size / 1048576.,
+                                          compression,
+                                          level,
+                                          elapsed)
+    module_logger.info(msgStr)
+
+    return file_size, elapsed
+
+
+def _can_append(save_path, pool_data, compression):
+
+    if not isinstance(pool_data, LazyPoolData): return False
+    if not os.path.isfile(save_path): return False
+
+    source = pool_data.source
+
+    return (not source.replaced and
+            source.path == save_path and
+            source.compression == compression)
+
+
+def _write_new_archive(save_path,
+                       project,
+                       scope,
+                       strategy,
+                       strategy_manager_cls,
+                       compression,
+                       level,
+                       progress_callback):
+
+    save_dir = os.path.dirname(save_path)
+    pool_data = project._pool._data
+
+    temp_file = tempfile.NamedTemporaryFile(suffix=".dto.tmp",
+                                            dir=save_dir,
+                                            delete=False)
+
+    try:
+
+        with temp_file:
+            writer = ArchiveWriter(temp_file, compression, level)
+            pool_members, _ = _write_archive(writer,
+                                             project,
+                                             scope,
+                                             strategy,
+                                             strategy_manager_cls,
+                                             1,
+                                             progress_callback)
+
+        member_map = _get_replaced_members(pool_data,
+                                           save_path,
+                                           pool_members)
+
+        # Holding the lock ensures that no entry is being read from the file
+        # being replaced. Any pools which share its source, such as the
+        # project a snapshot was taken from, then read from the new file.
+        with _lazy_lock:
+
+            _replace_file(temp_file.name, save_path)
+
+            if member_map is not None:
+                source = ArchiveSource(save_path, compression, writer.members)
+                pool_data.source.redirect(source, member_map)
+
+    except:
+
+        if os.path.isfile(temp_file.name): os.remove(temp_file.name)
+        raise
+
+    return pool_members, writer.members
+
+
+def _get_replaced_members(pool_data, save_path, pool_members):
+
+    '''Map the names of the members of the archive at save_path which back
+    pool_data to their names in the archive replacing it, or return None if
+    pool_data is not backed by that archive'''
+
+    if not isinstance(pool_data, LazyPoolData): return None
+    if pool_data.source.path != save_path: return None
+
+    member_map = {}
+
+    for data_index, member_name in pool_members.iteritems():
+
+        source_member = pool_data.get_source_member(data_index)
+        if source_member is None: continue
+
+        member_map[source_member[1]] = member_name
+
+    return member_map
+
+
+def _append_archive(save_path,
+                    project,
+                    scope,
+                    strategy,
+                    strategy_manager_cls,
+                    compression,
+                    level,
+                    progress_callback):
+
+    # Append after the last manifest, dropping the members of any save that
+    # did not complete
+    tar = tarfile.open(save_path)
+
+    try:
+        manifest_member = _get_manifest_member(tar)
+        manifest = json.load(tar.extractfile(manifest_member))
+    finally:
+        tar.close()
+
+    append_pos = _get_member_end(manifest_member)
+    save_id = manifest.get("save", 0) + 1
+
+    with open(save_path, "r+b") as fileobj:
+
+        fileobj.seek(append_pos)
+        fileobj.truncate()
+
+        existing_members = project._pool._data.source._offsets.keys()
+        writer = ArchiveWriter(fileobj, compression, level, existing_members)
+
+        try:
+
+            pool_members, n_changed = _write_archive(writer,
+                                                     project,
+                                                     scope,
+                                                     strategy,
+                                                     strategy_manager_cls,
+                                                     save_id,
+                                                     progress_callback,
+                                                     incremental=True)
+
+        except:
+
+            # Restore the previous end of the archive
+            fileobj.seek(append_pos)
+            fileobj.truncate()
+            ArchiveWriter(fileobj).close()
+
+            raise
+
+        fileobj.truncate()
+
+    return pool_members, writer.members, n_changed
+
+
+def _write_archive(writer,
+                   project,
+                   scope,
+                   strategy,
+                   strategy_manager_cls,
+                   save_id,
+                   progress_callback=None,
+                   incremental=False):
+
+    # Members are numbered by save, so that an appended save never
+    # replaces the members read through the previous manifest
+    scope_member = writer.add_bytes("scope.{}.json".format(save_id),
+                                    json.dumps(scope))
+
+    # Dump the strategy (if there is one)
+    if strategy is None:
+
+        strategy_member = None
+
+    else:
+
+        dto_dir_path = tempfile.mkdtemp()
+
+        try:
+
+            strategy_manager = strategy_manager_cls()
+            stg_file_path = os.path.join(dto_dir_path, "strategy.pkl")
+            strategy_manager.dump_strategy(strategy, stg_file_path)
+
+            strategy_member = writer.add_file(
+                                        "strategy.{}.pkl".format(save_id),
+                                        stg_file_path)
+
+        finally:
+
+            shutil.rmtree(dto_dir_path)
+
+    # Dump the project structure and then each entry of the pool
+    structure = get_project_structure(project)
+    project_member = writer.add_pickle("project.{}.pkl".format(save_id),
+                                       structure)
+
+    pool = project._pool
+    pool_data = pool._data
+    data_indexes = pool_data.keys()
+    pool_members = {}
+    copied_members = {}
+    n_changed = 0
+
+    for i, data_index in enumerate(data_indexes):
+
+        # Unchanged entries are already in the archive being appended to
+        if incremental and pool_data.is_saved(data_index):
+
+            _, pool_members[data_index] = pool_data.get_source_member(
+                                                                data_index)
+
+        else:
+
+            # Deduplicating pools know the digest of their data
+            if hasattr(pool, "get_digest"):
+                digest = pool.get_digest(data_index)
+            else:
+                digest = None
+
+            pool_members[data_index] = _add_pool_member(writer,
+                                                        pool_data,
+                                                        data_index,
+                                                        digest,
+                                                        copied_members)
+            n_changed += 1
+
+        if progress_callback is not None:
+            progress_callback(writer.get_bytes_written(),
+                              i + 1,
+                              len(data_indexes))
+
+    sim_titles = [sim.get_title() for sim in project._simulations]
+
+    manifest = {"version": ARCHIVE_VERSION,
+                "save": save_id,
+                "compression": writer.compression,
+                "scope": scope_member,
+                "strategy": strategy_member,
+                "project": project_member,
+                "simulations": sim_titles,
+                "pool": pool_members}
+
+    # The manifest is written last so that the save only takes effect once
+    # all of its members are complete
+    writer.add_bytes(MANIFEST_NAME, json.dumps(manifest))
+    writer.close()
+
+    return pool_members, n_changed
+
+
+def _add_pool_member(writer, pool_data, data_index, digest, copied_members):
+
+    source_member = None
+
+    if isinstance(pool_data, LazyPoolData):
+        source_member = pool_data.get_source_member(data_index)
+
+    if source_member is None:
+        return writer.add_data_pickle(pool_data[data_index], digest)
+
+    # Unchanged entries are copied from the source archive without
+    # reading them into memory. Members shared by several entries are only
+    # copied once.
+    source, source_name = source_member
+
+    if source.compression == writer.compression:
+
+        if source_name in copied_members: return copied_members[source_name]
+
+        if DIGEST_MEMBER_RE.match(source_name) is None:
+            member_name = "pool/{}.pkl{}".format(
+                                        data_index,
+                                        COMPRESSION_EXTS[writer.compression])
+        else:
+            member_name = source_name
+
+        if not writer.has_member(member_name):
+            source.copy_member(source_name, writer, member_name)
+
+        copied_members[source_name] = member_name
+
+        return member_name
+
+    if pool_data.is_loaded(data_index):
+        data = pool_data[data_index]
+    else:
+        data = source.read_pickle(source_name)
+
+    return writer.add_data_pickle(data, digest)
+
+
+def _replace_file(src_path, dst_path):
+
+    # os.rename does not overwrite on Windows
+    if not os.path.isfile(dst_path):
+
+        os.rename(src_path, dst_path)
+
+        return
+
+    backup_path = "{}.bak".format(dst_path)
+    if os.path.isfile(backup_path): os.remove(backup_path)
+
+    os.rename(dst_path, backup_path)
+    os.rename(src_path, dst_path)
+    os.remove(backup_path)
+
+    return
@@ -0,0 +1,141 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Headless execution of .dto projects.
+
+The GUI classes are not imported here, so projects are processed with the
+plain dtocean-core Core and strategies and no display is required.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import os
+
+from dtocean_core.menu import ModuleMenu, ThemeMenu
+from dtocean_core.extensions import StrategyManager
+
+from .archive import load_project_archive, save_project_archive
+from .cache import CachedCore, get_result_cache
+
+RUN_OPTIONS = ["current", "themes", "strategy"]
+
+
+class BatchStrategyManager(StrategyManager):
+
+    """Strategy manager which preserves the strategy state stored by the
+    GUI"""
+
+    def _get_dump_dict(self, strategy):
+
+        stg_dict = StrategyManager._get_dump_dict(self, strategy)
+        stg_dict["strategy_run"] = getattr(strategy, "strategy_run", None)
+
+        return stg_dict
+
+    def _set_load_dict(self, stg_dict):
+
+        new_strategy = StrategyManager._set_load_dict(self, stg_dict)
+        new_strategy.strategy_run = stg_dict.get("strategy_run")
+
+        return new_strategy
+
+
+def run_batch(load_path,
+              save_path=None,
+              run="current",
+              compression="gzip",
+              level=6):
+
+    '''Load a project, execute it without the GUI and save the result.
+
+    Args:
+      load_path (str): path to a .dto or .prj file
+      save_path (str, optional): path to the .dto file to save. Defaults to
+        load_path, with the extension changed to .dto if necessary.
+      run (str, optional): "current" to execute the current module, "themes"
+        to execute the assessment themes or "strategy" to execute the stored
+        strategy
+      compression (str, optional): compression type for the saved archive
+      level (int, optional): compression level
+
+    Returns:
+      str: the path of the saved project
+    '''
+
+    if run not in RUN_OPTIONS:
+
+        errStr = ("Argument run must be one of {}. Passed value was "
+                  "'{}'").format(", ".join(RUN_OPTIONS), run)
+        raise ValueError(errStr)
+
+    if save_path is None:
+        save_path = "{}.dto".format(os.path.splitext(load_path)[0])
+
+    core = CachedCore(get_result_cache())
+
+    msgStr = "Loading project from {}".format(load_path)
+    module_logger.info(msgStr)
+
+    project, scope, strategy = load_project_archive(load_path,
+                                                    core,
+                                                    BatchStrategyManager)
+
+    if run == "current":
+
+        module_menu = ModuleMenu()
+
+        if not module_menu.get_scheduled(core, project):
+            errStr = "No modules are scheduled for execution"
+            raise RuntimeError(errStr)
+
+        module_menu.execute_current(core, project)
+
+    elif run == "themes":
+
+        theme_menu = ThemeMenu()
+        theme_menu.execute_all(core, project)
+
+    elif run == "strategy":
+
+        if strategy is None:
+            errStr = "No strategy is stored in project {}".format(load_path)
+            raise RuntimeError(errStr)
+
+        if strategy.strategy_run is False:
+            errStr = "The stored strategy has already been executed"
+            raise RuntimeError(errStr)
+
+        strategy.execute(core, project)
+
+        # As in the GUI, the strategy must be reselected to rerun it unless
+        # it allows reruns
+        strategy.strategy_run = strategy.allow_rerun
+
+    msgStr = "Saving project to {}".format(save_path)
+    module_logger.info(msgStr)
+
+    save_project_archive(save_path,
+                         project,
+                         scope,
+                         strategy,
+                         BatchStrategyManager,
+                         compression,
+                         level)
+
+    return save_path
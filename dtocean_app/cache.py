@@ -0,0 +1,392 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Persistent cache of module results.
+
+Module outputs are stored on disk, keyed by the SHA-1 digest of the module
+interface class, the version of the distribution providing it and the values
+of all of its declared inputs, including optional and masked inputs. When a module is connected again with the same inputs,
+in this or a later session, the stored outputs are reused rather than
+executing the module. The least recently used results are deleted when the
+cache grows beyond its maximum size.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import os
+import sys
+import hashlib
+import tempfile
+import cPickle as pickle
+
+import pkg_resources
+from polite.paths import UserDataDirectory
+
+from dtocean_core import interfaces as core_interfaces
+from dtocean_core.core import Core
+
+from .configure import get_cache_options
+
+# Distribution versions, keyed by top level package name
+_dist_versions = {}
+
+
+class ResultCache(object):
+
+    '''Directory of pickled module outputs, keyed by input fingerprints.
+
+    Args:
+      dir_path (str): path to the cache directory, which is created if
+        necessary
+      max_size (int, optional): maximum size of the cache in bytes
+    '''
+
+    def __init__(self, dir_path, max_size=1024 ** 3):
+
+        self.dir_path = dir_path
+        self.max_size = max_size
+
+        if not os.path.isdir(dir_path): os.makedirs(dir_path)
+
+        return
+
+    def get_key(self, interface):
+
+        '''Get the cache key for a module interface from the values of all
+        of its declared inputs. None is returned if the inputs can not be
+        pickled.'''
+
+        interface_cls = type(interface)
+        version = get_module_version(interface_cls.__module__)
+
+        hasher = hashlib.sha1()
+        hasher.update(pickle.dumps((interface_cls.__module__,
+                                    interface_cls.__name__,
+                                    version), -1))
+
+        # Masked inputs are declared as MaskVariable objects
+        input_vars, optional_ids = interface.get_inputs(False)
+        input_ids = set(getattr(var, "variable_id", var)
+                                                    for var in input_vars)
+        input_ids.update(optional_ids)
+
+        try:
+
+            for input_id in sorted(input_ids):
+
+                value = interface.get_data(input_id)
+                hasher.update(pickle.dumps((input_id, value), -1))
+
+        except (pickle.PicklingError, TypeError) as e:
+
+            logStr = ("Inputs of interface {} can not be cached: "
+                      "{}").format(interface_cls.__name__, e)
+            module_logger.debug(logStr)
+
+            return None
+
+        return hasher.hexdigest()
+
+    def get(self, key):
+
+        '''Get the outputs stored for the given key, or None if there are
+        none'''
+
+        cache_path = self._get_path(key)
+
+        try:
+
+            with open(cache_path, "rb") as fstream:
+                outputs = pickle.load(fstream)
+
+        except (IOError, EOFError, pickle.UnpicklingError):
+
+            return None
+
+        # Mark the result as recently used
+        try:
+            os.utime(cache_path, None)
+        except OSError:
+            pass
+
+        return outputs
+
+    def put(self, key, outputs):
+
+        '''Store the outputs dictionary for the given key and evict old
+        results if the cache is too large'''
+
+        cache_path = self._get_path(key)
+
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.dir_path)
+
+        try:
+
+            with os.fdopen(fd, "wb") as fstream:
+                pickle.dump(outputs, fstream, -1)
+
+            # Results for the same key are identical, so keep the first
+            if os.path.isfile(cache_path):
+                os.remove(temp_path)
+            else:
+                os.rename(temp_path, cache_path)
+
+        except:
+
+            if os.path.isfile(temp_path): os.remove(temp_path)
+            raise
+
+        self.evict()
+
+        return
+
+    def get_size(self):
+
+        '''Get the total size of the stored results in bytes'''
+
+        return sum(size for _, size, _ in self._get_entries())
+
+    def evict(self):
+
+        '''Delete the least recently used results until the cache is no
+        larger than its maximum size'''
+
+        entries = self._get_entries()
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, cache_path in sorted(entries):
+
+            if total_size <= self.max_size: break
+
+            # Another process may be using the same cache
+            try:
+                os.remove(cache_path)
+            except OSError:
+                continue
+
+            total_size -= size
+
+        return
+
+    def clear(self):
+
+        '''Delete all stored results'''
+
+        for _, _, cache_path in self._get_entries():
+
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+
+        return
+
+    def _get_path(self, key):
+
+        return os.path.join(self.dir_path, "{}.pkl".format(key))
+
+    def _get_entries(self):
+
+        entries = []
+
+        for file_name in os.listdir(self.dir_path):
+
+            if not file_name.endswith(".pkl"): continue
+
+            cache_path = os.path.join(self.dir_path, file_name)
+
+            try:
+                stat = os.stat(cache_path)
+            except OSError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, cache_path))
+
+        return entries
+
+
+class CachedCore(Core):
+
+    '''Core which reuses cached module results. Used where the GUICore is
+    not available, such as in strategy worker processes and batch runs. If a
+    progress monitor is set, each module or theme execution is reported to
+    it, after checking for cancellation, and if a profiler is set each
+    execution is measured by it.
+
+    Args:
+      result_cache (ResultCache, optional): cache of module results. If None
+        modules are always executed.
+    '''
+
+    def __init__(self, result_cache=None):
+
+        super(CachedCore, self).__init__()
+        self.result_cache = result_cache
+        self.progress_monitor = None
+        self.profiler = None
+
+        return
+
+    def connect_interface(self, project, interface):
+
+        if isinstance(interface, core_interfaces.ModuleInterface):
+            kind = "module"
+        elif isinstance(interface, core_interfaces.ThemeInterface):
+            kind = "theme"
+        else:
+            return self._connect_interface(project, interface)
+
+        sim_title = project.get_simulation_title()
+        monitor = self.progress_monitor
+
+        if monitor is not None:
+            monitor.check_cancelled()
+            monitor.set_module(sim_title, interface.get_name())
+
+        if self.profiler is None:
+            return self._connect_interface(project, interface)
+
+        with self.profiler.measure(sim_title, interface.get_name(), kind):
+            interface = self._connect_interface(project, interface)
+
+        return interface
+
+    def _connect_interface(self, project, interface):
+
+        connect = super(CachedCore, self).connect_interface
+
+        if not is_cacheable(self.result_cache, interface):
+            return connect(project, interface)
+
+        return connect_cached(self.result_cache, connect, project, interface)
+
+
+def get_module_version(module_name):
+
+    '''Get the version of the installed distribution which provides the
+    given module. If several distributions provide its top level package the
+    versions of all of them are returned, and None is returned if there are
+    none.'''
+
+    package_name = module_name.split(".")[0]
+
+    if package_name in _dist_versions: return _dist_versions[package_name]
+
+    versions = []
+
+    for dist in pkg_resources.working_set:
+
+        if not dist.has_metadata("top_level.txt"): continue
+
+        top_level = dist.get_metadata_lines("top_level.txt")
+        if package_name not in top_level: continue
+
+        versions.append("{}=={}".format(dist.project_name, dist.version))
+
+    if versions:
+        version = ";".join(sorted(versions))
+    else:
+        package = sys.modules.get(package_name)
+        version = getattr(package, "__version__", None)
+
+    _dist_versions[package_name] = version
+
+    return version
+
+
+def get_result_cache():
+
+    '''Build the result cache described by the files.ini configuration
+    file, or return None if caching is disabled.'''
+
+    cache_options = get_cache_options()
+
+    if not cache_options["enabled"]: return None
+
+    cache_dir = UserDataDirectory("dtocean_app", "DTOcean", "cache")
+    max_size = int(cache_options["max_size"] * 1024 ** 2)
+
+    return ResultCache(cache_dir.get_path(), max_size)
+
+
+def is_cacheable(result_cache, interface):
+
+    '''Test if the results of the interface should be cached'''
+
+    if result_cache is None: return False
+
+    return isinstance(interface, core_interfaces.ModuleInterface)
+
+
+def connect_cached(result_cache, connect, project, interface):
+
+    '''Connect a module interface using the given connect function, unless
+    outputs for the same inputs are available in the cache.
+
+    Args:
+      result_cache (ResultCache): cache of module results
+      connect (function): function taking the project and interface, which
+        executes the interface and returns it
+      project (Project): the project being executed
+      interface (ModuleInterface): the interface, with its inputs set
+
+    Returns:
+      ModuleInterface: the interface, with its outputs set
+    '''
+
+    interface_name = interface.get_name()
+
+    # The key must be found before connecting, as modules may alter their
+    # input data
+    key = result_cache.get_key(interface)
+
+    if key is not None:
+
+        outputs = result_cache.get(key)
+
+        if outputs is not None:
+
+            for var_id, value in outputs.iteritems():
+                interface.put_data(var_id, value)
+
+            msgStr = "Using cached results for module {}".format(
+                                                            interface_name)
+            module_logger.info(msgStr)
+
+            return interface
+
+    interface = connect(project, interface)
+
+    if key is None: return interface
+
+    outputs = {var_id: interface.get_data(var_id)
+                                    for var_id in interface.get_outputs()}
+
+    try:
+
+        result_cache.put(key, outputs)
+
+    except (IOError, OSError, pickle.PicklingError, TypeError) as e:
+
+        logStr = "Results of module {} could not be cached: {}".format(
+                                                            interface_name,
+                                                            e)
+        module_logger.warning(logStr)
+
+    return interface
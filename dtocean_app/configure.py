@@ -19,7 +19,9 @@
 """
 
 # Helpers for configuration files
-from polite.paths import SiteDataDirectory, UserDataDirectory
+from polite.paths import (ObjDirectory,
+                          SiteDataDirectory,
+                          UserDataDirectory)
 from polite.configuration import ReadINI
 
 
@@ -49,3 +51,86 @@ def get_install_paths():
 
     return path_dict
 
+
+
+def get_save_options():
+    
+    """Get the compression type and level used for saving .dto files from the
+    files.ini configuration file. Defaults are used if the options are not
+    set."""
+    
+    save_options = {"compression": "gzip",
+                    "level": 6}
+    
+    files_config = _get_files_config()
+    
+    if "save" not in files_config: return save_options
+    
+    if "compression" in files_config["save"]:
+        save_options["compression"] = files_config["save"]["compression"]
+        
+    if "level" in files_config["save"]:
+        save_options["level"] = int(files_config["save"]["level"])
+    
+    return save_options
+
+
+def get_cache_options():
+    
+    """Get the options for the module result cache from the files.ini
+    configuration file. The maximum size is given in megabytes. Defaults are
+    used if the options are not set."""
+    
+    cache_options = {"enabled": False,
+                     "max_size": 1024}
+    
+    files_config = _get_files_config()
+    
+    if "cache" not in files_config: return cache_options
+    
+    if "enabled" in files_config["cache"]:
+        cache_options["enabled"] = files_config["cache"].as_bool("enabled")
+        
+    if "max_size" in files_config["cache"]:
+        cache_options["max_size"] = float(files_config["cache"]["max_size"])
+    
+    return cache_options
+
+
+def get_console_options():
+    
+    """Get the batch interval in milliseconds, maximum number of buffered
+    lines and maximum number of displayed lines of the log console from the
+    files.ini configuration file. Defaults are used if the options are not
+    set."""
+    
+    console_options = {"interval": 100,
+                       "max_buffer": 1000,
+                       "max_lines": 5000}
+    
+    files_config = _get_files_config()
+    
+    if "console" not in files_config: return console_options
+    
+    for key in console_options:
+        if key in files_config["console"]:
+            console_options[key] = int(files_config["console"][key])
+    
+    return console_options
+
+
+def _get_files_config():
+    
+    """Read the user's files.ini configuration file, or the default if it
+    does not exist"""
+    
+    userdir = UserDataDirectory("dtocean_app", "DTOcean", "config")
+    
+    if userdir.isfile("files.ini"):
+        configdir = userdir
+    else:
+        configdir = ObjDirectory("dtocean_app", "config")
+    
+    files_ini = ReadINI(configdir, "files.ini")
+    
+    return files_ini.get_config()
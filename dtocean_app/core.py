@@ -21,6 +21,8 @@ import warnings
 module_logger = logging.getLogger(__name__)
 
 import pickle
+import threading
+from collections import OrderedDict
 
 from PyQt4 import QtCore
 
@@ -41,7 +43,12 @@ from dtocean_core.core import (Core,
 #from dtocean_core.menu import ConnectorMenu
 
 from . import data as gui_data
+from .data import definitions as gui_definitions
 from . import interfaces as gui_interfaces
+from .cache import connect_cached, is_cacheable
+from .pool import DedupDataPool
+from .profiling import ExecutionProfiler
+from .results import ResultStore
 
 
 class WidgetInterface(MetaInterface):
@@ -109,6 +116,12 @@ class GUIProject(QtCore.QObject, Project):
         QtCore.QObject.__init__(self)
         Project.__init__(self, title)
         
+        # Store identical data once
+        self._pool = DedupDataPool()
+        
+        # Values for comparing simulations
+        self.result_store = ResultStore()
+        
         return
         
     def _set_active_index(self, index):
@@ -123,10 +136,38 @@ class GUIProject(QtCore.QObject, Project):
 
         index = super(GUIProject, self)._set_simulation(simulation, index)
         
+        # The simulation may replace another with the same title
+        self.result_store.remove_simulation(simulation.get_title())
+        
         self.sims_updated.emit(self)
         
         return index
         
+    def set_simulation_title(self, new_title, index=None, title=None):
+        
+        """Change the title of a simulation. The stored values of the
+        simulation are moved to the new title, so that they are not found
+        by a later simulation given the old title."""
+        
+        old_title = self.get_simulation_title(index=index, title=title)
+        
+        super(GUIProject, self).set_simulation_title(new_title, index, title)
+        
+        if old_title is not None and old_title != new_title:
+            self.result_store.rename_simulation(old_title, new_title)
+        
+        return
+        
+    def remove_simulation(self, index=None, title=None, active_index=None):
+        
+        simulation = super(GUIProject, self).remove_simulation(index,
+                                                               title,
+                                                               active_index)
+        
+        self.result_store.remove_simulation(simulation.get_title())
+        
+        return simulation
+        
     def _dump(self):
         
         new_project = Project(self.title)
@@ -141,7 +182,7 @@ class GUIProject(QtCore.QObject, Project):
     def _load(self, project):
         
         self.title = project.title
-        self._pool = project._pool
+        self._pool = DedupDataPool.from_pool(project._pool)
         self._simulations = project._simulations
         self._active_index = project._active_index
         self._db_cred = project._db_cred
@@ -156,7 +197,10 @@ class GUICore(QtCore.QObject, Core):
 
     # PyQt signals
     status_updated = QtCore.pyqtSignal()
+    status_changed = QtCore.pyqtSignal(object)
+    data_changed = QtCore.pyqtSignal(object)
     pipeline_reset = QtCore.pyqtSignal()
+    execution_profiled = QtCore.pyqtSignal(object)
     
     # Extend the sockets for widgets
     _ext_sockets = ("FileInputInterface",
@@ -181,6 +225,12 @@ class GUICore(QtCore.QObject, Core):
         QtCore.QObject.__init__(self)
         Core.__init__(self)
         self._input_parent = None
+        self.result_cache = None
+        self.profiler = ExecutionProfiler(self.execution_profiled.emit)
+        self.progress_monitor = None
+        self._data_versions = {}
+        self._data_generation = 0
+        self._data_lock = threading.Lock()
         
         return
 
@@ -242,29 +292,295 @@ class GUICore(QtCore.QObject, Core):
                                          force_scheduled,
                                          skip_missing)
         
+        _remove_results(project)
+        self._set_data_changed()
         self.pipeline_reset.emit()
         
         return
         
+    def add_datastate(self, project,
+                            level=None,
+                            identifiers=None,
+                            values=None,
+                            *args,
+                            **kwargs):
+        
+        """Record a new version of the data for the given identifiers"""
+        
+        super(GUICore, self).add_datastate(project,
+                                           level,
+                                           identifiers,
+                                           values,
+                                           *args,
+                                           **kwargs)
+        
+        _remove_results(project)
+        
+        # Level markers add no data
+        if identifiers is None: return
+        
+        self._set_data_changed(set(identifiers))
+        
+        return
+        
+    def mask_states(self, project, *args, **kwargs):
+        
+        """Masking states may change the value of any variable"""
+        
+        result = super(GUICore, self).mask_states(project, *args, **kwargs)
+        _remove_results(project, all_simulations=True)
+        self._set_data_changed()
+        
+        return result
+        
+    def unmask_states(self, project, *args, **kwargs):
+        
+        """Unmasking states may change the value of any variable"""
+        
+        result = super(GUICore, self).unmask_states(project, *args, **kwargs)
+        _remove_results(project, all_simulations=True)
+        self._set_data_changed()
+        
+        return result
+        
+    def register_level(self, project, level, interface_name):
+        
+        """A new level may change the values found at other levels"""
+        
+        super(GUICore, self).register_level(project, level, interface_name)
+        _remove_results(project)
+        
+        return
+        
+    def get_level_values(self, project,
+                               data_identity,
+                               levels=None,
+                               force_masks=None,
+                               sim_index=None,
+                               sim_title=None):
+        
+        """Use the project's result store for the values of a variable at
+        the given levels of a simulation, if available"""
+        
+        store = getattr(project, "result_store", None)
+        title = project.get_simulation_title(index=sim_index, title=sim_title)
+        
+        if store is None or title is None or levels is None:
+            return super(GUICore, self).get_level_values(project,
+                                                         data_identity,
+                                                         levels,
+                                                         force_masks,
+                                                         sim_index,
+                                                         sim_title)
+        
+        if force_masks is None:
+            level_key = (tuple(levels), None)
+        else:
+            level_key = (tuple(levels), tuple(force_masks))
+        
+        try:
+            
+            level_values = store.get(title, level_key, data_identity)
+        
+        except KeyError:
+            
+            level_values = super(GUICore, self).get_level_values(
+                                                            project,
+                                                            data_identity,
+                                                            levels,
+                                                            force_masks,
+                                                            sim_index,
+                                                            sim_title)
+            store.set(title, level_key, data_identity, level_values)
+        
+        return OrderedDict(level_values)
+        
+    def get_project_values(self, project,
+                                 data_identity,
+                                 level,
+                                 force_indexes=None,
+                                 allow_none=False):
+        
+        """Collect the value of a variable at a given level for all
+        simulations in the project, reading only those simulations without
+        values in the project's result store"""
+        
+        store = getattr(project, "result_store", None)
+        
+        if store is None:
+            return super(GUICore, self).get_project_values(project,
+                                                           data_identity,
+                                                           level,
+                                                           force_indexes,
+                                                           allow_none)
+        
+        if force_indexes is None:
+            sim_indexes = range(len(project))
+        else:
+            sim_indexes = force_indexes
+        
+        project_values = []
+        
+        for i in sim_indexes:
+            
+            sim_title = project.get_simulation_title(index=i)
+            
+            try:
+                
+                sim_value = store.get(sim_title, level, data_identity)
+            
+            except KeyError:
+                
+                sim_value = self.get_simulation_value(project,
+                                                      data_identity,
+                                                      level,
+                                                      i)
+                
+                if sim_title is not None:
+                    store.set(sim_title, level, data_identity, sim_value)
+            
+            if sim_value is None and not allow_none: continue
+            
+            project_values.append((sim_title, sim_value))
+        
+        if not project_values: project_values = None
+        
+        return project_values
+        
+    def get_simulation_value(self, project, data_identity, level, sim_index):
+        
+        """Read the value of a variable at a given level of one simulation,
+        bypassing the project's result store"""
+        
+        project_values = super(GUICore, self).get_project_values(
+                                                                project,
+                                                                data_identity,
+                                                                level,
+                                                                [sim_index],
+                                                                True)
+        [(_, sim_value)] = project_values
+        
+        return sim_value
+        
+    def get_data_version(self, identifier):
+        
+        """Get a version for the data of the given identifier, which changes
+        whenever its value may have changed"""
+        
+        with self._data_lock:
+            version = (self._data_generation,
+                       self._data_versions.get(identifier, 0))
+        
+        return version
+        
+    def _set_data_changed(self, var_ids=None):
+        
+        """Increment the data versions of the given variable ids, or of all
+        variables if var_ids is None, and emit the data_changed signal"""
+        
+        with self._data_lock:
+            
+            if var_ids is None:
+                self._data_generation += 1
+            else:
+                for var_id in var_ids:
+                    version = self._data_versions.get(var_id, 0)
+                    self._data_versions[var_id] = version + 1
+        
+        self.data_changed.emit(var_ids)
+        
+        return
+        
     def set_interface_status(self, project, simulation=None):
         
-        """Emit a signal on status update"""
+        """Emit signals on status update. The status_changed signal carries
+        the set of variable ids whose input or output status has changed in
+        any branch, or None if the changes are not known."""
+        
+        if simulation is None: simulation = project.get_simulation()
+        
+        old_inputs = getattr(simulation, "_hub_input_status", None)
+        old_outputs = getattr(simulation, "_hub_output_status", None)
                 
         super(GUICore, self).set_interface_status(project, simulation)
+        
+        input_changes = get_status_changes(
+                            old_inputs,
+                            getattr(simulation, "_hub_input_status", None))
+        output_changes = get_status_changes(
+                            old_outputs,
+                            getattr(simulation, "_hub_output_status", None))
+        
+        if input_changes is None or output_changes is None:
+            var_ids = None
+        else:
+            var_ids = input_changes | output_changes
+        
+        self.status_changed.emit(var_ids)
         self.status_updated.emit()
 
         return
         
     def connect_interface(self, project, interface):
         
-        """Add parent widget to widget interfaces"""
+        """Add parent widget to widget interfaces, reuse cached module
+        results and profile module and theme executions. If a strategy is
+        running, its progress is reported and StrategyCancelled is raised
+        before the next module or theme if it has been cancelled."""
         
         if (isinstance(interface, InputWidgetInterface) and
            self._input_parent is not None):
             
             interface.parent = self._input_parent
-            
-        interface = super(GUICore, self).connect_interface(project, interface)
+        
+        if isinstance(interface, core_interfaces.ModuleInterface):
+            kind = "module"
+        elif isinstance(interface, core_interfaces.ThemeInterface):
+            kind = "theme"
+        else:
+            return self._connect_interface(project, interface)
+        
+        sim_title = project.get_simulation_title()
+        monitor = self.progress_monitor
+        
+        if monitor is not None:
+            monitor.check_cancelled()
+            monitor.set_module(sim_title, interface.get_name())
+        
+        with self.profiler.measure(sim_title, interface.get_name(), kind):
+            interface = self._connect_interface(project, interface)
+        
+        return interface
+        
+    def prepare_interface(self, interface, var_id):
+        
+        """Shape the data of a loaded auto widget interface for the given
+        variable, so that only its widget is created when it is connected.
+        No widgets are created, so this can be called from a worker
+        thread."""
+        
+        if not isinstance(interface, (AutoInput, AutoOutput)):
+            return interface
+        
+        meta = self.get_metadata(var_id)
+        structure = getattr(gui_definitions, meta.structure, None)
+        
+        if structure is not None:
+            gui_definitions.prepare_auto_value(interface, structure)
+        
+        return interface
+    
+    def _connect_interface(self, project, interface):
+        
+        connect = super(GUICore, self).connect_interface
+        
+        if is_cacheable(self.result_cache, interface):
+            interface = connect_cached(self.result_cache,
+                                       connect,
+                                       project,
+                                       interface)
+        else:
+            interface = connect(project, interface)
         
         return interface
         
@@ -276,6 +592,54 @@ class GUICore(QtCore.QObject, Core):
         return socket
 
 
+def _remove_results(project, all_simulations=False):
+    
+    """Remove the stored values of the active simulation, or of all the
+    simulations, of a project with a result store"""
+    
+    store = getattr(project, "result_store", None)
+    if store is None: return
+    
+    if all_simulations:
+        store.clear()
+    else:
+        store.remove_simulation(project.get_simulation_title())
+    
+    return
+
+
+def get_status_changes(old_status, new_status):
+    
+    """Compare two simulation status records, stored as dictionaries of
+    status by variable id, within dictionaries of interface name, within
+    dictionaries of hub id.
+    
+    Returns:
+      set: ids of the variables whose status differs in any interface, or
+        None if either record is missing
+    """
+    
+    if old_status is None or new_status is None: return None
+    
+    var_ids = set()
+    
+    for hub_id in set(old_status) | set(new_status):
+        
+        old_hub = old_status.get(hub_id) or {}
+        new_hub = new_status.get(hub_id) or {}
+        
+        for interface_name in set(old_hub) | set(new_hub):
+            
+            old_vars = old_hub.get(interface_name) or {}
+            new_vars = new_hub.get(interface_name) or {}
+            
+            for var_id in set(old_vars) | set(new_vars):
+                if old_vars.get(var_id) != new_vars.get(var_id):
+                    var_ids.add(var_id)
+    
+    return var_ids
+
+
 #class HubMenu(ConnectorMenu):
 #    
 #    def __init__(self, hub_name):
@@ -16,6 +16,7 @@
 
 import numpy as np
 import pandas as pd
+from shapely.geometry import MultiPoint
 
 from dtocean_core.data.definitions import  (UnknownData,
                                             SeriesData,
@@ -108,10 +109,113 @@ from ..widgets.input import (ListSelect,
 from ..widgets.output import (LabelOutput,
                               TextOutput,
                               OutputDataTable)
+
+
+def get_coords_frame(coords, keys=None):
+    
+    """Build a DataFrame with columns x, y and z from a sequence of two or
+    three dimensional coordinates. The coordinates are converted to an array
+    in one step and the columns are taken as slices of it. Missing z values
+    are set to None. If keys are given they are added as the first column,
+    named "Key".
+    """
+    
+    n_coords = len(coords)
+    
+    try:
+        coords_array = np.asarray(coords, dtype=float)
+    except ValueError:
+        coords_array = None
+    
+    if n_coords == 0:
+        
+        x_vals = y_vals = z_vals = []
+    
+    elif (coords_array is not None and
+          coords_array.ndim == 2 and
+          coords_array.shape[1] in [2, 3]):
+        
+        x_vals = coords_array[:, 0]
+        y_vals = coords_array[:, 1]
+        
+        if coords_array.shape[1] == 3:
+            z_vals = coords_array[:, 2]
+        else:
+            z_vals = [None] * n_coords
+    
+    else:
+        
+        # Mixed two and three dimensional coordinates
+        xy_array = np.array([coord[:2] for coord in coords], dtype=float)
+        x_vals = xy_array[:, 0]
+        y_vals = xy_array[:, 1]
+        z_vals = [coord[2] if len(coord) == 3 else None for coord in coords]
+    
+    raw_dict = {"x": x_vals,
+                "y": y_vals,
+                "z": z_vals}
+    columns = ["x", "y", "z"]
+    
+    if keys is not None:
+        raw_dict["Key"] = list(keys)
+        columns.insert(0, "Key")
+    
+    coords_df = pd.DataFrame(raw_dict, columns=columns)
+    
+    return coords_df
+
+
+def get_point_coords(points):
+    
+    """Get the coordinates of a sequence of shapely points. The coordinates
+    of a MultiPoint are read as an array in one step, through its array
+    interface, while other sequences are read one point at a time into a
+    list of tuples."""
+    
+    if isinstance(points, MultiPoint): return np.asarray(points)
+    
+    return [point.coords[0] for point in points]
+
+
+def get_auto_value(interface, value_method):
+    
+    """Get the value to show in the widget of an auto interface. The value
+    shaped by prepare_auto_value is reused if it was made by value_method,
+    otherwise value_method is called on the interface."""
+    
+    prepared = getattr(interface, "_prepared_value", None)
+    
+    if prepared is not None and prepared[0] is value_method:
+        return prepared[1]
+    
+    return value_method(interface)
+
+
+def prepare_auto_value(interface, structure):
+    
+    """Shape the data of a loaded auto interface for its widget, using the
+    auto_input_value or auto_output_value method of the given structure, if
+    it has one. No widgets are created, so this can be called from a worker
+    thread."""
+    
+    value_name = "{}_value".format(interface.get_connect_name())
+    value_method = getattr(structure, value_name, None)
+    
+    if value_method is None: return
+    
+    interface._prepared_value = (value_method, value_method(interface))
+    
+    return
                                             
 
 class GUIStructure(object):
-    """Dummy class for plugin detection"""
+    """Dummy class for plugin detection.
+    
+    The auto_input and auto_output methods create widgets, so they must be
+    called from the GUI thread. Where the data must be shaped for the widget,
+    this is done by the auto_input_value and auto_output_value methods, which
+    can be called beforehand from a worker thread by prepare_auto_value.
+    """
 
 
 class UnknownData(GUIStructure, UnknownData):
@@ -121,10 +225,15 @@ class UnknownData(GUIStructure, UnknownData):
 class SeriesData(GUIStructure, SeriesData):
     """Overloading SeriesData class"""
     
+    @staticmethod
+    def auto_output_value(self):
+        
+        return self.data.result.to_frame()
+    
     @staticmethod
     def auto_output(self):
         
-        df = self.data.result.to_frame()
+        df = get_auto_value(self, SeriesData.auto_output_value)
         
         if self.meta.result.labels is None:
             labels = ["Data"]
@@ -149,6 +258,8 @@ class SeriesData(GUIStructure, SeriesData):
 class TimeSeries(GUIStructure, TimeSeries):
     """Overloading TimeSeries class"""
     
+    auto_output_value = staticmethod(SeriesData.auto_output_value)
+    
     @staticmethod
     def auto_input(self):
         
@@ -177,6 +288,8 @@ class TimeSeries(GUIStructure, TimeSeries):
 class TimeSeriesColumn(GUIStructure, TimeSeriesColumn):
     """Overloading TimeSeriesColumn class"""
     
+    auto_output_value = staticmethod(TimeSeries.auto_output_value)
+    
     @staticmethod
     def auto_input(self):
         
@@ -240,6 +353,15 @@ class TableDataColumn(GUIStructure, TableDataColumn):
         
 class IndexTable(GUIStructure, IndexTable):
     """Overloading IndexTable class"""
+    
+    @staticmethod
+    def auto_input_value(self):
+        
+        if self.data.result is None: return None
+        
+        return self.data.result.reset_index()
+    
+    auto_output_value = auto_input_value
 
     @staticmethod
     def auto_input(self):
@@ -250,11 +372,7 @@ class IndexTable(GUIStructure, IndexTable):
                                 self.meta.result.labels[0],
                                 self.meta.result.valid_values)
 
-        if self.data.result is not None:
-            df = self.data.result.reset_index()
-        else:
-            df = None
-        
+        df = get_auto_value(self, IndexTable.auto_input_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -268,11 +386,7 @@ class IndexTable(GUIStructure, IndexTable):
                                  self.meta.result.labels,
                                  self.meta.result.units)
         
-        if self.data.result is not None:
-            df = self.data.result.reset_index()
-        else:
-            df = None
-            
+        df = get_auto_value(self, IndexTable.auto_output_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -282,6 +396,9 @@ class IndexTable(GUIStructure, IndexTable):
 
 class IndexTableColumn(GUIStructure, IndexTableColumn):
     """Overloading IndexTableColumn class"""
+    
+    auto_input_value = staticmethod(IndexTable.auto_input_value)
+    auto_output_value = staticmethod(IndexTable.auto_output_value)
 
     @staticmethod
     def auto_input(self):
@@ -300,6 +417,9 @@ class IndexTableColumn(GUIStructure, IndexTableColumn):
 
 class LineTable(GUIStructure, LineTable):
     """Overloading LineTable class"""
+    
+    auto_input_value = staticmethod(IndexTable.auto_input_value)
+    auto_output_value = staticmethod(IndexTable.auto_output_value)
 
     @staticmethod
     def auto_input(self):
@@ -318,6 +438,9 @@ class LineTable(GUIStructure, LineTable):
 
 class LineTableColumn(GUIStructure, LineTableColumn):
     """Overloading LineTableColumn class"""
+    
+    auto_input_value = staticmethod(LineTable.auto_input_value)
+    auto_output_value = staticmethod(LineTable.auto_output_value)
 
     @staticmethod
     def auto_input(self):
@@ -336,6 +459,8 @@ class LineTableColumn(GUIStructure, LineTableColumn):
 
 class TimeTable(GUIStructure, TimeTable):
     """Overloading TimeTable class"""
+    
+    auto_input_value = staticmethod(IndexTable.auto_input_value)
 
     @staticmethod
     def auto_input(self):
@@ -343,13 +468,8 @@ class TimeTable(GUIStructure, TimeTable):
         widget = InputTimeTable(self.parent,
                                 self.meta.result.labels,
                                 self.meta.result.units)
-
-
-        if self.data.result is not None:
-            df = self.data.result.reset_index()
-        else:
-            df = None
         
+        df = get_auto_value(self, TimeTable.auto_input_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -371,6 +491,8 @@ class TimeTable(GUIStructure, TimeTable):
 
 class TimeTableColumn(GUIStructure, TimeTableColumn):
     """Overloading TimeTableColumn class"""
+    
+    auto_input_value = staticmethod(TimeTable.auto_input_value)
 
     @staticmethod
     def auto_input(self):
@@ -412,6 +534,9 @@ class TriStateTable(GUIStructure, TriStateTable):
     
 class TriStateIndexTable(GUIStructure, TriStateIndexTable):
     """Overloading TriStateIndexTable class"""
+    
+    auto_input_value = staticmethod(IndexTable.auto_input_value)
+    auto_output_value = staticmethod(IndexTable.auto_output_value)
 
     @staticmethod
     def auto_input(self):
@@ -421,12 +546,8 @@ class TriStateIndexTable(GUIStructure, TriStateIndexTable):
                                     self.meta.result.units,
                                     self.meta.result.labels[0],
                                     self.meta.result.valid_values)
-
-        if self.data.result is not None:
-            df = self.data.result.reset_index()
-        else:
-            df = None
         
+        df = get_auto_value(self, TriStateIndexTable.auto_input_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -465,21 +586,28 @@ class NumpyLine(GUIStructure, NumpyLine):
     """Overloading NumpyLine class"""
 
     @staticmethod
-    def auto_input(self):
+    def auto_input_value(self):
         
         vals = self.data.result
         
-        vals_df = None
-                    
-        if vals is not None:
+        if vals is None: return None
                     
-            val1 = vals[:,0]
-            val2 = vals[:,1]
+        val1 = vals[:,0]
+        val2 = vals[:,1]
                         
-            raw_dict = {"val1": val1,
-                        "val2": val2}
+        raw_dict = {"val1": val1,
+                    "val2": val2}
                         
-            vals_df = pd.DataFrame(raw_dict)
+        vals_df = pd.DataFrame(raw_dict)
+        
+        return vals_df
+    
+    auto_output_value = auto_input_value
+    
+    @staticmethod
+    def auto_input(self):
+        
+        vals_df = get_auto_value(self, NumpyLine.auto_input_value)
         
         widget = InputLineTable(self.parent,
                                 self.meta.result.units)
@@ -493,21 +621,7 @@ class NumpyLine(GUIStructure, NumpyLine):
     def auto_output(self):
 
         labels = ["val1", "val2"]        
-        vals = self.data.result
-                    
-        if vals is None:
-            
-            vals_df = None
-
-        else:
-                                
-            val1 = vals[:,0]
-            val2 = vals[:,1]
-                        
-            raw_dict = {"val1": val1,
-                        "val2": val2}
-                        
-            vals_df = pd.DataFrame(raw_dict)
+        vals_df = get_auto_value(self, NumpyLine.auto_output_value)
         
         widget = OutputDataTable(self.parent, labels)
         widget._set_value(vals_df)
@@ -532,6 +646,9 @@ class NumpyBar(GUIStructure, NumpyBar):
 class NumpyLineArray(GUIStructure, NumpyLineArray):
     """Overloading NumpyLineArray class"""
     
+    auto_input_value = staticmethod(NumpyLine.auto_input_value)
+    auto_output_value = staticmethod(NumpyLine.auto_output_value)
+    
     @staticmethod
     def auto_input(self):
         
@@ -550,6 +667,9 @@ class NumpyLineArray(GUIStructure, NumpyLineArray):
 class NumpyLineColumn(GUIStructure, NumpyLineColumn):
     """Overloading NumpyLineColumn class"""
     
+    auto_input_value = staticmethod(NumpyLine.auto_input_value)
+    auto_output_value = staticmethod(NumpyLine.auto_output_value)
+    
     @staticmethod
     def auto_input(self):
         
@@ -569,22 +689,45 @@ class Histogram(GUIStructure, Histogram):
     """Overloading Histogram class"""
 
     @staticmethod
-    def auto_input(self):
+    def auto_input_value(self):
         
         hist = self.data.result
         
-        hist_df = None
-                    
-        if hist is not None:
+        if hist is None: return None
                     
-            bins = hist['bins']
-            values = hist['values']
+        bins = hist['bins']
+        values = hist['values']
 
-            raw_dict = {"Bin Separators": bins,
-                        "Values": values + [None],
-                        }
+        raw_dict = {"Bin Separators": bins,
+                    "Values": values + [None],
+                    }
                         
-            hist_df = pd.DataFrame(raw_dict)
+        hist_df = pd.DataFrame(raw_dict)
+        
+        return hist_df
+    
+    @staticmethod
+    def auto_output_value(self):
+        
+        hist = self.data.result
+        
+        if hist is None: return None
+                    
+        bins = hist['bins']
+        values = hist['values']
+                        
+        raw_dict = {"bins": bins[1:],
+                    "values": values,
+                    }
+                        
+        hist_df = pd.DataFrame(raw_dict)
+        
+        return hist_df
+
+    @staticmethod
+    def auto_input(self):
+        
+        hist_df = get_auto_value(self, Histogram.auto_input_value)
         
         widget = InputHistogram(self.parent)
         widget._set_value(hist_df)
@@ -596,23 +739,7 @@ class Histogram(GUIStructure, Histogram):
     @staticmethod
     def auto_output(self):
         
-        hist = self.data.result
-        
-        if hist is None:
-
-            hist_df = None
-                    
-        else:
-                    
-            bins = hist['bins']
-            values = hist['values']
-
-                        
-            raw_dict = {"bins": bins[1:],
-                        "values": values,
-                        }
-                        
-            hist_df = pd.DataFrame(raw_dict)
+        hist_df = get_auto_value(self, Histogram.auto_output_value)
         
         widget = OutputDataTable(self.parent)
         widget._set_value(hist_df)
@@ -687,27 +814,20 @@ class CartesianList(GUIStructure, CartesianList):
     """Overloading CartesianList class"""
     
     @staticmethod
-    def auto_input(self):
+    def auto_input_value(self):
         
         coords = self.data.result
         
-        coords_df = None
-                    
-        if coords is not None:
-                    
-            x_vals = coords[:,0]
-            y_vals = coords[:,1]
+        if coords is None: return None
         
-            if coords.shape[1] == 3:
-                z_vals = coords[:,2]
-            else:
-                z_vals = [None] * len(x_vals)
-                
-            raw_dict = {"x": x_vals,
-                        "y": y_vals,
-                        "z": z_vals}
-                        
-            coords_df = pd.DataFrame(raw_dict)
+        return get_coords_frame(coords)
+    
+    auto_output_value = auto_input_value
+    
+    @staticmethod
+    def auto_input(self):
+        
+        coords_df = get_auto_value(self, CartesianList.auto_input_value)
         
         widget = InputPointTable(self.parent)
         widget._set_value(coords_df)
@@ -719,28 +839,10 @@ class CartesianList(GUIStructure, CartesianList):
     @staticmethod
     def auto_output(self):
         
-        coords = self.data.result
-        
-        coords_df = None
+        coords_df = get_auto_value(self, CartesianList.auto_output_value)
         labels = ["x", "y"]
             
-        if coords is not None:
-
-            x_vals = [x[0] for x in coords]
-            y_vals = [x[1] for x in coords]
-        
-            if len(coords) == 3:
-                z_vals = [x[2] for x in coords]
-            else:
-                z_vals = [None] * len(x_vals)
-                
-            raw_dict = {"x": x_vals,
-                        "y": y_vals,
-                        "z": z_vals}
-                        
-            coords_df = pd.DataFrame(raw_dict)
-            
-            labels.append("z")
+        if coords_df is not None: labels.append("z")
         
         widget = OutputDataTable(self.parent,
                                  labels)
@@ -754,6 +856,9 @@ class CartesianList(GUIStructure, CartesianList):
 class CartesianListColumn(GUIStructure, CartesianListColumn):
     """Overloading CartesianListColumn class"""
     
+    auto_input_value = staticmethod(CartesianList.auto_input_value)
+    auto_output_value = staticmethod(CartesianList.auto_output_value)
+    
     @staticmethod
     def auto_input(self):
         
@@ -899,6 +1004,16 @@ class DirectoryData(GUIStructure, DirectoryData):
 class SimpleList(GUIStructure, SimpleList):
     """Overloading SimpleList class"""
     
+    @staticmethod
+    def auto_output_value(self):
+        
+        if self.data.result is None: return None
+        
+        raw_dict = {"Value": self.data.result}
+        df = pd.DataFrame(raw_dict)
+        
+        return df
+    
     @staticmethod
     def auto_output(self):
         
@@ -913,12 +1028,7 @@ class SimpleList(GUIStructure, SimpleList):
                                  labels,
                                  units)
         
-        df = None
-        
-        if self.data.result is not None:
-            raw_dict = {"Value": self.data.result}
-            df = pd.DataFrame(raw_dict)
-        
+        df = get_auto_value(self, SimpleList.auto_output_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -929,6 +1039,21 @@ class SimpleList(GUIStructure, SimpleList):
 class SimpleDict(GUIStructure, SimpleDict):
     """Overloading SimpleDict class"""
     
+    @staticmethod
+    def auto_input_value(self):
+        
+        if self.data.result is None: return None
+        
+        var_dict = self.data.result
+        df_dict = {"Key": var_dict.keys(),
+                   "Value": var_dict.values()}
+        value = pd.DataFrame(df_dict)
+        value = value.sort_values(by="Key")
+        
+        return value
+    
+    auto_output_value = auto_input_value
+    
     @staticmethod
     def auto_input(self):
         
@@ -937,15 +1062,7 @@ class SimpleDict(GUIStructure, SimpleDict):
                                 self.meta.result.valid_values)
         
         val_types = [object, self.meta.result.types[0]]
-        
-        if self.data.result is not None:
-            var_dict = self.data.result
-            df_dict = {"Key": var_dict.keys(),
-                       "Value": var_dict.values()}
-            value = pd.DataFrame(df_dict)
-            value = value.sort_values(by="Key")
-        else:
-            value = None
+        value = get_auto_value(self, SimpleDict.auto_input_value)
         
         widget._set_value(value, dtypes=val_types)
         
@@ -967,14 +1084,7 @@ class SimpleDict(GUIStructure, SimpleDict):
                                  labels,
                                  units)
         
-        df = None
-        
-        if self.data.result is not None:
-            raw_dict = {"Key": self.data.result.keys(),
-                        "Value": self.data.result.values()}
-            df = pd.DataFrame(raw_dict)
-            df = df.sort_values(by="Key")
-        
+        df = get_auto_value(self, SimpleDict.auto_output_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -985,6 +1095,8 @@ class SimpleDict(GUIStructure, SimpleDict):
 class SimplePie(GUIStructure, SimplePie):
     """Overloading SimplePie class"""
     
+    auto_output_value = staticmethod(SimpleDict.auto_output_value)
+    
     @staticmethod
     def auto_output(self):
         
@@ -1050,6 +1162,8 @@ class DirectoryDataColumn(GUIStructure, DirectoryDataColumn):
 class SimpleListColumn(GUIStructure, SimpleListColumn):
     """Overloading SimpleListColumn class"""
     
+    auto_output_value = staticmethod(SimpleList.auto_output_value)
+    
     @staticmethod
     def auto_output(self):
         
@@ -1061,6 +1175,9 @@ class SimpleListColumn(GUIStructure, SimpleListColumn):
 class SimpleDictColumn(GUIStructure, SimpleDictColumn):
     """Overloading SimpleDictColumn class"""
     
+    auto_input_value = staticmethod(SimpleDict.auto_input_value)
+    auto_output_value = staticmethod(SimpleDict.auto_output_value)
+    
     @staticmethod
     def auto_input(self):
         
@@ -1104,6 +1221,19 @@ class DateTimeData(GUIStructure, DateTimeData):
 class DateTimeDict(GUIStructure, DateTimeDict):
     """Overloading DateTimeDict class"""
     
+    @staticmethod
+    def auto_output_value(self):
+        
+        if self.data.result is None: return None
+        
+        raw_dict = {"Key": self.data.result.keys(),
+                    "DateTime": self.data.result.values()}
+        df = pd.DataFrame(raw_dict)
+        df = df.sort_values(by="Key")
+        df = df[["Key", "DateTime"]]
+        
+        return df
+    
     @staticmethod
     def auto_output(self):
         
@@ -1112,15 +1242,7 @@ class DateTimeDict(GUIStructure, DateTimeDict):
         widget = OutputDataTable(self.parent,
                                  labels)
         
-        df = None
-        
-        if self.data.result is not None:
-            raw_dict = {"Key": self.data.result.keys(),
-                        "DateTime": self.data.result.values()}
-            df = pd.DataFrame(raw_dict)
-            df = df.sort_values(by="Key")
-            df = df[["Key", "DateTime"]]
-        
+        df = get_auto_value(self, DateTimeDict.auto_output_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -1175,33 +1297,18 @@ class PointList(GUIStructure, PointList):
     """Overloading PointList class"""
     
     @staticmethod
-    def auto_input(self):
+    def auto_input_value(self):
         
         points = self.data.result
         
-        point_df = None
-            
-        if points is not None:
+        if points is None: return None
         
-            coords = [x.coords[0] for x in points]
-            
-            x_vals = [x[0] for x in coords]
-            y_vals = [x[1] for x in coords]
-            
-            z_vals = []
-            
-            for x in coords:
-                
-                if len(x) == 3:
-                    z_vals.append(x[2])
-                else:
-                    z_vals.append(None)
-                
-            raw_dict = {"x": x_vals,
-                        "y": y_vals,
-                        "z": z_vals}
-                        
-            point_df = pd.DataFrame(raw_dict)
+        return get_coords_frame(get_point_coords(points))
+    
+    @staticmethod
+    def auto_input(self):
+        
+        point_df = get_auto_value(self, PointList.auto_input_value)
         
         widget = InputPointTable(self.parent)
         widget._set_value(point_df)
@@ -1215,35 +1322,26 @@ class PointDict(GUIStructure, PointDict):
     """Overloading PointDict class"""
     
     @staticmethod
-    def auto_input(self):
+    def auto_input_value(self):
         
         point_dict = self.data.result
         
-        point_df = None
-            
-        if point_dict is not None:
-        
-            coord_dict = {k: v.coords[0] for k, v in point_dict.items()}
-            
-            x_vals = [x[0] for x in coord_dict.values()]
-            y_vals = [x[1] for x in coord_dict.values()]
+        if point_dict is None: return None
             
-            z_vals = []
+        keys = point_dict.keys()
+        coords = get_point_coords(point_dict[k] for k in keys)
             
-            for x in coord_dict.values():
-                
-                if len(x) == 3:
-                    z_vals.append(x[2])
-                else:
-                    z_vals.append(None)
-                
-            raw_dict = {"Key": coord_dict.keys(),
-                        "x": x_vals,
-                        "y": y_vals,
-                        "z": z_vals}
-                        
-            point_df = pd.DataFrame(raw_dict)
-            point_df = point_df.sort_values(by="Key")
+        point_df = get_coords_frame(coords, keys)
+        point_df = point_df.sort_values(by="Key")
+        
+        return point_df
+    
+    auto_output_value = auto_input_value
+    
+    @staticmethod
+    def auto_input(self):
+        
+        point_df = get_auto_value(self, PointDict.auto_input_value)
         
         widget = InputPointDictTable(self.parent,
                                      self.meta.result.valid_values)
@@ -1263,25 +1361,7 @@ class PointDict(GUIStructure, PointDict):
         widget = OutputDataTable(self.parent,
                                  labels)
         
-        df = None
-        
-        if self.data.result is not None:
-            
-            point_array = np.array([np.array(el) for el in
-                                                  self.data.result.values()])
-
-            data = {"Key": self.data.result.keys(),
-                    "x": point_array[:, 0],
-                    "y": point_array[:, 1]}
-                              
-            if point_array.shape[1] == 3:
-                data["z"] = point_array[:, 2]
-            else:
-                data["z"] = [None] * len(self.data.result)
-        
-            df = pd.DataFrame(data)
-            df = df.sort_values(by="Key")
-        
+        df = get_auto_value(self, PointDict.auto_output_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -1315,29 +1395,22 @@ class PolygonData(GUIStructure, PolygonData):
     """Overloading PolygonData class"""
     
     @staticmethod
-    def auto_input(self):
+    def auto_input_value(self):
         
         polygon = self.data.result
         
-        poly_df = None
-            
-        if polygon is not None:
+        if polygon is None: return None
         
-            coords = list(polygon.exterior.coords)[:-1]
-            
-            x_vals = [x[0] for x in coords]
-            y_vals = [x[1] for x in coords]
+        coords = np.asarray(polygon.exterior.coords)[:-1]
         
-            if polygon.has_z:
-                z_vals = [x[2] for x in coords]
-            else:
-                z_vals = [None] * len(x_vals)
-                
-            raw_dict = {"x": x_vals,
-                        "y": y_vals,
-                        "z": z_vals}
-                        
-            poly_df = pd.DataFrame(raw_dict)
+        return get_coords_frame(coords)
+    
+    auto_output_value = auto_input_value
+    
+    @staticmethod
+    def auto_input(self):
+        
+        poly_df = get_auto_value(self, PolygonData.auto_input_value)
         
         widget = InputPointTable(self.parent)
         widget._set_value(poly_df)
@@ -1350,29 +1423,7 @@ class PolygonData(GUIStructure, PolygonData):
     def auto_output(self):
         
         labels = ["x", "y", "z"]
-        polygon = self.data.result
-        
-        if polygon is None:
-            
-            poly_df = None
-            
-        else: 
-        
-            coords = list(polygon.exterior.coords)[:-1]
-            
-            x_vals = [x[0] for x in coords]
-            y_vals = [x[1] for x in coords]
-        
-            if polygon.has_z:
-                z_vals = [x[2] for x in coords]
-            else:
-                z_vals = [None] * len(x_vals)
-                
-            raw_dict = {"x": x_vals,
-                        "y": y_vals,
-                        "z": z_vals}
-                        
-            poly_df = pd.DataFrame(raw_dict)
+        poly_df = get_auto_value(self, PolygonData.auto_output_value)
         
         widget = OutputDataTable(self.parent,
                                  labels)
@@ -1386,6 +1437,9 @@ class PolygonData(GUIStructure, PolygonData):
 class PolygonDataColumn(GUIStructure, PolygonDataColumn):
     """Overloading PolygonDataColumn class"""
     
+    auto_input_value = staticmethod(PolygonData.auto_input_value)
+    auto_output_value = staticmethod(PolygonData.auto_output_value)
+    
     @staticmethod
     def auto_input(self):
         
@@ -1444,6 +1498,15 @@ class Network(GUIStructure, Network):
 class EIADict(GUIStructure, EIADict):
     """Overloading EIADict class"""
     
+    @staticmethod
+    def auto_output_value(self):
+        
+        raw_dict = {"Key": self.data.result.keys(),
+                    "Value": self.data.result.values()}
+        df = pd.DataFrame(raw_dict)
+        
+        return df
+    
     @staticmethod
     def auto_output(self):
         
@@ -1458,10 +1521,7 @@ class EIADict(GUIStructure, EIADict):
                                  labels,
                                  units)
         
-        raw_dict = {"Key": self.data.result.keys(),
-                    "Value": self.data.result.values()}
-        df = pd.DataFrame(raw_dict)
-        
+        df = get_auto_value(self, EIADict.auto_output_value)
         widget._set_value(df)
         
         self.data.result = widget
@@ -1473,7 +1533,7 @@ class RecommendationDict(GUIStructure, RecommendationDict):
     """Overloading RecommendationDict class"""
 
     @staticmethod
-    def auto_output(self):
+    def auto_output_value(self):
         
         rec = self.data.result
 
@@ -1499,6 +1559,13 @@ class RecommendationDict(GUIStructure, RecommendationDict):
                 text = text + str(rec[key]['Generic Explanation']) + ', '
                 text = text + str(rec[key]['General Recommendation']) + ', '
                 text = text + str(rec[key]['Detailed Recommendation']) + '.\n\n'
+        
+        return text
+
+    @staticmethod
+    def auto_output(self):
+        
+        text = get_auto_value(self, RecommendationDict.auto_output_value)
 
         widget = TextOutput(self.parent)
         widget._set_value(text)
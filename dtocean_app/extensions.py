@@ -22,10 +22,12 @@ module_logger = logging.getLogger(__name__)
 from PyQt4 import QtGui, QtCore
 
 from dtocean_core.extensions import StrategyManager, ToolManager
+from dtocean_core.pipeline import Tree
 
 from . import strategies, tools
+from .results import export_results
 from .widgets.dialogs import ListFrameEditor, Message
-from .widgets.display import MPLWidget
+from .widgets.display import MPLWidget, PLOT_LOCK
 from .widgets.output import OutputDataTable
 
 
@@ -159,13 +161,14 @@ class GUIStrategyManager(ListFrameEditor, StrategyManager):
             strategy = shell.strategy
             sim_titles = None
         
-        fig_handle = super(GUIStrategyManager,
-                           self).get_level_values_plot(shell.core,
-                                                       shell.project,
-                                                       var_id,
-                                                       strategy,
-                                                       sim_titles,
-                                                       scope)
+        with PLOT_LOCK:
+            fig_handle = super(GUIStrategyManager,
+                               self).get_level_values_plot(shell.core,
+                                                           shell.project,
+                                                           var_id,
+                                                           strategy,
+                                                           sim_titles,
+                                                           scope)
         
         widget = MPLWidget(fig_handle, shell.core._input_parent)
         
@@ -212,19 +215,76 @@ class GUIStrategyManager(ListFrameEditor, StrategyManager):
         else:
             strategy = shell.strategy
     
-        fig_handle = super(GUIStrategyManager,
-                           self).get_comparison_values_plot(shell.core,
-                                                            shell.project,
-                                                            var_one_id,
-                                                            var_two_id,
-                                                            module,
-                                                            strategy,
-                                                            scope)
+        with PLOT_LOCK:
+            fig_handle = super(GUIStrategyManager,
+                               self).get_comparison_values_plot(shell.core,
+                                                                shell.project,
+                                                                var_one_id,
+                                                                var_two_id,
+                                                                module,
+                                                                strategy,
+                                                                scope)
         
         widget = MPLWidget(fig_handle, shell.core._input_parent)
         
         return widget
         
+    def get_export_outputs(self, shell, scope):
+        
+        """Get the (level, variable id) pairs of the outputs of the active
+        modules and themes in the given scope"""
+        
+        if scope not in ["global", "local"]:
+            
+            errStr = ("Argument 'scope' must have value 'global' or 'local', "
+                      "not {}").format(scope)
+            raise ValueError(errStr)
+        
+        active_modules = shell.module_menu.get_active(shell.core,
+                                                      shell.project)
+        active_themes = shell.theme_menu.get_active(shell.core,
+                                                    shell.project)
+        
+        tree = Tree()
+        outputs = []
+        
+        for interface_name in active_modules + active_themes:
+            
+            branch = tree.get_branch(shell.core,
+                                     shell.project,
+                                     interface_name)
+            level = "{} {} output".format(interface_name, scope).lower()
+            
+            for var_id in branch.get_outputs(shell.core, shell.project):
+                outputs.append((level, var_id))
+        
+        return outputs
+        
+    def export_results(self, shell,
+                             save_path,
+                             scope,
+                             ignore_strategy,
+                             progress_callback=None):
+        
+        """Export the outputs of the simulations of the project, or only
+        those of the strategy, to an HDF5 file"""
+        
+        if ignore_strategy or shell.strategy is None:
+            sim_titles = None
+        else:
+            sim_titles = shell.strategy.get_simulation_record()
+        
+        outputs = self.get_export_outputs(shell, scope)
+        
+        n_sims = export_results(shell.core,
+                                shell.project,
+                                save_path,
+                                outputs,
+                                sim_titles,
+                                progress_callback)
+        
+        return n_sims
+        
     @QtCore.pyqtSlot(object)
     def _update_configuration(self, item=None):
         
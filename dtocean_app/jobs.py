@@ -0,0 +1,324 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Queue of background jobs executed in QThreads.
+
+Each job wraps a thread with an error_detected signal, as used for the
+application's worker threads. Jobs start in order of priority and then
+submission, once the jobs they depend on have finished successfully. Jobs
+which use the same named resource, such as the open project, do not run at
+the same time, while jobs with independent resources run concurrently up to
+the maximum number of workers. A job is cancelled if one of its
+dependencies fails or is cancelled.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import time
+import itertools
+from collections import deque
+
+from PyQt4 import QtCore
+
+
+class Job(QtCore.QObject):
+
+    '''A unit of work for the JobQueue.
+
+    Args:
+      name (str): description of the job
+      thread (QtCore.QThread): thread which executes the job, with an
+        error_detected(object, object, object) signal
+      priority (int, optional): jobs with higher priority start first
+      depends_on (list, optional): jobs which must finish successfully
+        before this job starts
+      resources (tuple, optional): names of the resources used exclusively
+        by the job
+    '''
+
+    PENDING = "Pending"
+    RUNNING = "Running"
+    FINISHED = "Finished"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+
+    finished = QtCore.pyqtSignal(object)
+
+    def __init__(self, name,
+                       thread,
+                       priority=0,
+                       depends_on=None,
+                       resources=("project",)):
+
+        super(Job, self).__init__()
+
+        if depends_on is None: depends_on = []
+
+        self.name = name
+        self.thread = thread
+        self.priority = priority
+        self.depends_on = list(depends_on)
+        self.resources = tuple(resources)
+        self.state = self.PENDING
+        self.error = None
+        self.start_time = None
+        self.end_time = None
+        self._order = None
+
+        self.thread.error_detected.connect(self._set_error)
+
+        return
+
+    def is_done(self):
+
+        return self.state in (self.FINISHED, self.FAILED, self.CANCELLED)
+
+    def get_elapsed(self):
+
+        '''Get the run time of the job in seconds, or None if it has not
+        started'''
+
+        if self.start_time is None: return None
+
+        if self.end_time is None:
+            end_time = time.time()
+        else:
+            end_time = self.end_time
+
+        return end_time - self.start_time
+
+    @QtCore.pyqtSlot(object, object, object)
+    def _set_error(self, etype, evalue, etraceback):
+
+        self.error = (etype, evalue, etraceback)
+
+        return
+
+
+class JobQueue(QtCore.QObject):
+
+    '''Scheduler for Job objects.
+
+    Args:
+      max_workers (int, optional): maximum number of jobs running at the
+        same time. Defaults to the ideal thread count of the machine.
+      max_history (int, optional): number of completed jobs to remember
+    '''
+
+    job_added = QtCore.pyqtSignal(object)
+    job_started = QtCore.pyqtSignal(object)
+    job_finished = QtCore.pyqtSignal(object)
+    queue_empty = QtCore.pyqtSignal()
+
+    def __init__(self, max_workers=None, max_history=100):
+
+        super(JobQueue, self).__init__()
+
+        if max_workers is None:
+            max_workers = max(QtCore.QThread.idealThreadCount(), 1)
+
+        self.max_workers = max_workers
+        self._pending = []
+        self._running = []
+        self._history = deque(maxlen=max_history)
+        self._counter = itertools.count()
+
+        return
+
+    def submit(self, name,
+                     thread,
+                     priority=0,
+                     depends_on=None,
+                     resources=("project",)):
+
+        '''Add a job to the queue, starting it if possible. The arguments
+        are as for Job.
+
+        Returns:
+          Job: the new job
+        '''
+
+        job = Job(name, thread, priority, depends_on, resources)
+        job._order = next(self._counter)
+
+        self._pending.append(job)
+
+        msgStr = "Job '{}' queued".format(name)
+        module_logger.debug(msgStr)
+
+        self.job_added.emit(job)
+        self._schedule()
+
+        return job
+
+    def cancel(self, job):
+
+        '''Cancel a pending job. Running jobs are not affected.
+
+        Returns:
+          bool: True if the job was cancelled
+        '''
+
+        if job not in self._pending: return False
+
+        self._pending.remove(job)
+        self._set_done(job, Job.CANCELLED)
+        self._schedule()
+
+        return True
+
+    def get_jobs(self):
+
+        '''Get the completed, running and pending jobs, in that order'''
+
+        pending = sorted(self._pending, key=self._get_sort_key)
+
+        return list(self._history) + list(self._running) + pending
+
+    def get_pending(self):
+
+        return sorted(self._pending, key=self._get_sort_key)
+
+    def get_running(self):
+
+        return list(self._running)
+
+    def is_idle(self):
+
+        return not self._pending and not self._running
+
+    def clear_history(self):
+
+        self._history.clear()
+
+        return
+
+    def wait(self):
+
+        '''Block until the running jobs are complete'''
+
+        for job in list(self._running):
+            job.thread.wait()
+
+        return
+
+    def _schedule(self):
+
+        self._cancel_orphans()
+
+        held = set()
+
+        for job in self._running:
+            held.update(job.resources)
+
+        for job in sorted(self._pending, key=self._get_sort_key):
+
+            if len(self._running) >= self.max_workers: break
+
+            if any(dep.state != Job.FINISHED for dep in job.depends_on):
+                continue
+
+            if held.intersection(job.resources): continue
+
+            self._start(job)
+            held.update(job.resources)
+
+        if self.is_idle(): self.queue_empty.emit()
+
+        return
+
+    def _cancel_orphans(self):
+
+        # Cancel jobs whose dependencies can no longer succeed, including
+        # the dependents of those jobs
+        cancelled = True
+
+        while cancelled:
+
+            cancelled = False
+
+            for job in list(self._pending):
+
+                if not any(dep.state in (Job.FAILED, Job.CANCELLED)
+                                               for dep in job.depends_on):
+                    continue
+
+                self._pending.remove(job)
+                self._set_done(job, Job.CANCELLED)
+                cancelled = True
+
+        return
+
+    def _start(self, job):
+
+        self._pending.remove(job)
+        self._running.append(job)
+
+        job.state = Job.RUNNING
+        job.start_time = time.time()
+        job.thread.finished.connect(lambda: self._finish(job))
+        job.thread.start()
+
+        msgStr = "Job '{}' started".format(job.name)
+        module_logger.debug(msgStr)
+
+        self.job_started.emit(job)
+
+        return
+
+    def _finish(self, job):
+
+        if job not in self._running: return
+
+        # The thread may still be exiting when finished is received
+        job.thread.wait()
+        self._running.remove(job)
+
+        if job.error is None:
+            state = Job.FINISHED
+        else:
+            state = Job.FAILED
+
+        self._set_done(job, state)
+        self._schedule()
+
+        return
+
+    def _set_done(self, job, state):
+
+        job.state = state
+        job.end_time = time.time()
+
+        # Release the thread and the objects it references
+        job.thread = None
+
+        self._history.append(job)
+
+        msgStr = "Job '{}' {}".format(job.name, state.lower())
+        module_logger.debug(msgStr)
+
+        job.finished.emit(job)
+        self.job_finished.emit(job)
+
+        return
+
+    @staticmethod
+    def _get_sort_key(job):
+
+        return (-job.priority, job._order)
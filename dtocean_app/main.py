@@ -27,11 +27,8 @@ import logging
 module_logger = logging.getLogger(__name__)
 
 import os
+import re
 import sys
-import json
-import shutil
-import tarfile
-import tempfile
 import traceback
 import subprocess
 
@@ -40,14 +37,27 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from PyQt4 import QtGui, QtCore
 
+from polite.paths import UserDataDirectory
+
 from dtocean_core.menu import ProjectMenu, ModuleMenu, ThemeMenu, DataMenu
 from dtocean_core.pipeline import set_output_scope
 
-from .core import GUICore
+from .core import GUICore, GUIProject
+from .jobs import Job, JobQueue
+from .cache import get_result_cache
+from .archive import (get_project_snapshot,
+                      load_project_archive,
+                      save_project_archive,
+                      set_project_saved)
 from .help import HelpWidget
 from .menu import DBSelector
+from .configure import get_console_options, get_save_options
 from .simulation import SimulationDock
 from .extensions import GUIStrategyManager, GUIToolManager
+from .strategies.checkpoint import StrategyCheckpoint
+from .strategies.progress import (StrategyCancelled,
+                                  StrategyMonitor,
+                                  format_progress)
 from .pipeline import (PipeLine,
                        SectionItem,
                        HiddenHub,
@@ -58,6 +68,7 @@ from .pipeline import (PipeLine,
                        OutputVarItem)
 from .utils.process import which
 
+from .widgets.cache import WidgetCache
 from .widgets.central import (ContextArea,
                               DetailsWidget,
                               FileManagerWidget,
@@ -71,10 +82,19 @@ from .widgets.dialogs import (DataCheck,
                               ProgressBar,
                               About)
 from .widgets.display import (MPLWidget,
+                              PlaceholderWidget,
+                              PlotImageWidget,
+                              PLOT_LOCK,
+                              get_pixel_ratio,
+                              render_figure,
+                              set_current_figure,
+                              close_figure,
                               get_current_filetypes,
                               save_current_figure)
 from .widgets.docks import (ListDock,
-                            LogDock)
+                            JobDock,
+                            LogDock,
+                            ProfileDock)
 
 
 class ThreadReadRaw(QtCore.QThread):
@@ -109,6 +129,84 @@ class ThreadReadRaw(QtCore.QThread):
         return
       
 
+class ThreadLoadData(QtCore.QThread):
+    
+    """QThread for loading the data of a variable into its widget
+    interface"""
+    
+    error_detected =  QtCore.pyqtSignal(object, object, object)
+
+    def __init__(self, var_item, shell, interface):
+        
+        super(ThreadLoadData, self).__init__()
+        self.var_item = var_item
+        self.interface = None
+        self._shell = shell
+        self._interface = interface
+                
+        return
+    
+    def run(self):
+        
+        try:
+        
+            self.interface = self.var_item._load_data_interface(
+                                                        self._shell,
+                                                        self._interface)
+        
+        except: 
+            
+            etype, evalue, etraceback = sys.exc_info()
+            self.error_detected.emit(etype, evalue, etraceback)
+
+        return
+
+
+class ThreadPlot(QtCore.QThread):
+    
+    """QThread for drawing the plot of a variable into an image"""
+    
+    error_detected =  QtCore.pyqtSignal(object, object, object)
+
+    def __init__(self, var_item,
+                       shell,
+                       plot_name=None,
+                       size=None,
+                       pixel_ratio=1):
+        
+        super(ThreadPlot, self).__init__()
+        self.var_item = var_item
+        self.figure = None
+        self.image = None
+        self._shell = shell
+        self._plot_name = plot_name
+        self._size = size
+        self._pixel_ratio = pixel_ratio
+                
+        return
+    
+    def run(self):
+        
+        try:
+            
+            with PLOT_LOCK:
+        
+                self.figure = self.var_item._get_plot_figure(self._shell,
+                                                             self._plot_name)
+                
+                if self.figure is not None:
+                    self.image = render_figure(self.figure,
+                                               self._size,
+                                               self._pixel_ratio)
+        
+        except: 
+            
+            etype, evalue, etraceback = sys.exc_info()
+            self.error_detected.emit(etype, evalue, etraceback)
+
+        return
+
+
 class ThreadDataFlow(QtCore.QThread):
     
     """QThread for initiating the dataflow"""
@@ -228,17 +326,87 @@ class ThreadThemes(QtCore.QThread):
         
 class ThreadStrategy(QtCore.QThread):
     
-    """QThread for executing a strategy"""
+    """QThread for executing a strategy, reporting its progress and
+    allowing it to be cancelled through the monitor attribute"""
     
     taskFinished = QtCore.pyqtSignal()
+    progress_updated = QtCore.pyqtSignal(object)
     error_detected =  QtCore.pyqtSignal(object, object, object)
 
-    def __init__(self, strategy, core, project):
+    def __init__(self, strategy, core, project, checkpoint=None):
         
         super(ThreadStrategy, self).__init__()
         self._strategy = strategy
         self._core = core
         self._project = project
+        self._checkpoint = checkpoint
+        self.monitor = StrategyMonitor(self.progress_updated.emit)
+                
+        return
+    
+    def run(self):
+        
+        self._core.progress_monitor = self.monitor
+        
+        try:
+            
+            n_simulations = self._strategy.get_n_simulations(self._core,
+                                                             self._project)
+            self.monitor.start(n_simulations)
+            
+            if self._checkpoint is None:
+                
+                self._strategy.execute(self._core,
+                                       self._project)
+                
+            else:
+                
+                self._strategy.execute(self._core,
+                                       self._project,
+                                       checkpoint=self._checkpoint)
+                
+            self.taskFinished.emit()
+        
+        except StrategyCancelled as e:
+            
+            # Completed simulations are kept
+            module_logger.info(str(e))
+            self.taskFinished.emit()
+        
+        except: 
+            
+            etype, evalue, etraceback = sys.exc_info()
+            self.error_detected.emit(etype, evalue, etraceback)
+        
+        finally:
+            
+            self._core.progress_monitor = None
+
+        return
+
+        
+class ThreadSave(QtCore.QThread):
+    
+    """QThread for saving a snapshot of a project"""
+    
+    taskFinished = QtCore.pyqtSignal()
+    progress_updated = QtCore.pyqtSignal(object, int, int)
+    error_detected =  QtCore.pyqtSignal(object, object, object)
+
+    def __init__(self, save_path,
+                       snapshot,
+                       scope,
+                       strategy,
+                       incremental,
+                       save_options):
+        
+        super(ThreadSave, self).__init__()
+        self._save_path = save_path
+        self._snapshot = snapshot
+        self._scope = scope
+        self._strategy = strategy
+        self._incremental = incremental
+        self._save_options = save_options
                 
         return
     
@@ -246,8 +414,15 @@ class ThreadStrategy(QtCore.QThread):
         
         try:
             
-            self._strategy.execute(self._core,
-                                   self._project)
+            save_project_archive(self._save_path,
+                                 self._snapshot,
+                                 self._scope,
+                                 self._strategy,
+                                 GUIStrategyManager,
+                                 incremental=self._incremental,
+                                 progress_callback=self.progress_updated.emit,
+                                 **self._save_options)
+                
             self.taskFinished.emit()
         
         except: 
@@ -291,16 +466,66 @@ class ThreadTool(QtCore.QThread):
         return
 
 
+class ThreadExport(QtCore.QThread):
+    
+    """QThread for exporting the results of the simulations of a project,
+    reporting the number of simulations written so far"""
+    
+    taskFinished = QtCore.pyqtSignal()
+    progress_updated = QtCore.pyqtSignal(int, int)
+    error_detected =  QtCore.pyqtSignal(object, object, object)
+
+    def __init__(self, strategy_manager,
+                       shell,
+                       save_path,
+                       scope,
+                       ignore_strategy):
+        
+        super(ThreadExport, self).__init__()
+        self._strategy_manager = strategy_manager
+        self._shell = shell
+        self._save_path = save_path
+        self._scope = scope
+        self._ignore_strategy = ignore_strategy
+                
+        return
+    
+    def run(self):
+        
+        try:
+            
+            self._strategy_manager.export_results(
+                                self._shell,
+                                self._save_path,
+                                self._scope,
+                                self._ignore_strategy,
+                                progress_callback=self.progress_updated.emit)
+                
+            self.taskFinished.emit()
+        
+        except: 
+            
+            etype, evalue, etraceback = sys.exc_info()
+            self.error_detected.emit(etype, evalue, etraceback)
+
+        return
+
+
 class Shell(QtCore.QObject):
     
     # Signals
     project_activated = QtCore.pyqtSignal()
     project_title_change = QtCore.pyqtSignal(str)
     project_saved = QtCore.pyqtSignal()
+    save_progress = QtCore.pyqtSignal(object, int, int)
+    save_error = QtCore.pyqtSignal(object, object, object)
+    save_finished = QtCore.pyqtSignal()
     project_closed = QtCore.pyqtSignal()
     modules_activated = QtCore.pyqtSignal()
     themes_activated = QtCore.pyqtSignal()
     update_pipeline = QtCore.pyqtSignal(object)
+    update_pipeline_status = QtCore.pyqtSignal(object, object)
+    update_data = QtCore.pyqtSignal(object)
     update_scope = QtCore.pyqtSignal(str)
     update_widgets = QtCore.pyqtSignal()
     reset_widgets = QtCore.pyqtSignal()
@@ -326,7 +551,8 @@ class Shell(QtCore.QObject):
         self.project = None
         self.project_path = None
         self.strategy = None
-        self._active_thread = None
+        self.jobs = JobQueue()
+        self._save_thread = None
         self._current_scope = None
         
         self.core = self._init_core()
@@ -338,24 +564,25 @@ class Shell(QtCore.QObject):
         # Strategy execution flag change
         self.strategy_executed.connect(self.set_strategy_run)
         
-        # Clear active thread after execution
-        self.dataflow_active.connect(self._clear_active_thread)
-        self.module_executed.connect(self._clear_active_thread)
-        self.themes_executed.connect(self._clear_active_thread)
-        self.strategy_executed.connect(self._clear_active_thread)
-        
         return
     
     def _init_core(self):
         
         core = GUICore()
+        core.result_cache = get_result_cache()
         
-        # Relay status updated signal
+        # Relay status updated signals
+        core.status_changed.connect(
+            lambda var_ids: self.update_pipeline_status.emit(self, var_ids))
         core.status_updated.connect(
             lambda: self.update_pipeline.emit(self))
         core.status_updated.connect(
             lambda: self.reset_widgets.emit())
         
+        # Relay changes to the data of variables
+        core.data_changed.connect(
+            lambda var_ids: self.update_data.emit(var_ids))
+        
         # Relay pipeline reset signal
         core.pipeline_reset.connect(
             lambda: self.update_run_action.emit())
@@ -450,12 +677,18 @@ class Shell(QtCore.QObject):
         self.project_activated.emit()
         
         # Relay active simulation change
+        self.project.active_index_changed.connect(
+            lambda: self.update_pipeline_status.emit(self, None))
         self.project.active_index_changed.connect(
             lambda: self.update_pipeline.emit(self))
         self.project.active_index_changed.connect(
             lambda: self.reset_widgets.emit())
         self.project.active_index_changed.connect(
             lambda: self.update_run_action.emit())
+        
+        # Simulations may be replaced under the same title
+        self.project.sims_updated.connect(
+            lambda: self.update_data.emit(None))
             
         self._current_scope = "global"
         
@@ -468,59 +701,18 @@ class Shell(QtCore.QObject):
     def open_project(self, file_path):
         
         load_path = str(file_path)
-        dto_dir_path = None
-        prj_file_path = None
-        sco_file_path = None
-        stg_file_path = None
         
-        # Check the extension
-        if os.path.splitext(load_path)[1] == ".dto":
-            
-            dto_dir_path = tempfile.mkdtemp()
-                                    
-            tar = tarfile.open(load_path)
-            tar.extractall(dto_dir_path)
-            
-            prj_file_path = os.path.join(dto_dir_path, "project.prj")
-            sco_file_path = os.path.join(dto_dir_path, "scope.json")
-            stg_file_path = os.path.join(dto_dir_path, "strategy.pkl")
-            
-            if not os.path.isfile(stg_file_path): stg_file_path = None
-            
-        elif os.path.splitext(load_path)[1] == ".prj":
-            
-            prj_file_path = load_path
-            
-        else:
-            
-            errStr = ("The file path must be a file with either .dto or "
-                      ".prj extension")
-            raise ValueError(errStr)
-            
-        # Load up the project
-        load_project = self.core.load_project(prj_file_path)
+        (core_project,
+         self._current_scope,
+         self.strategy) = load_project_archive(load_path,
+                                               self.core,
+                                               GUIStrategyManager,
+                                               lazy=True)
+        
+        load_project = GUIProject("temp")
+        load_project._load(core_project)
 
         self.project = load_project
-        
-        # Load up the scope if one was found
-        if sco_file_path is not None:        
-        
-            with open(sco_file_path, 'rb') as json_file:
-                self._current_scope = json.load(json_file)
-                
-        else:
-            
-            self._current_scope = "global"
-            
-        # Load up the strategy if one was found
-        if stg_file_path is not None:
-            
-            strategy_manager = GUIStrategyManager() 
-            self.strategy = strategy_manager.load_strategy(stg_file_path)
-            
-        else:
-            
-            self.strategy = None
             
         # Record the path after a successful load
         self.project_path = load_path
@@ -528,23 +720,34 @@ class Shell(QtCore.QObject):
         self.project_title_change.emit(load_project.title)
         
         # Relay active simulation change
+        self.project.active_index_changed.connect(
+            lambda: self.update_pipeline_status.emit(self, None))
         self.project.active_index_changed.connect(
             lambda: self.update_pipeline.emit(self))
         self.project.active_index_changed.connect(
             lambda: self.reset_widgets.emit())
         self.project.active_index_changed.connect(
             lambda: self.update_run_action.emit())
+        
+        # Simulations may be replaced under the same title
+        self.project.sims_updated.connect(
+            lambda: self.update_data.emit(None))
             
         # Update the scope widget
         self.update_scope.emit(self._current_scope)
-            
-        # Delete temp directory
-        if dto_dir_path is not None: shutil.rmtree(dto_dir_path)
         
         return
         
     @QtCore.pyqtSlot(str)
-    def save_project(self, file_path=None):
+    def save_project(self, file_path=None, compact=False):
+        
+        """Save the project in a background thread. A snapshot of the
+        project is taken first, so that it can continue to be used while
+        saving. Only the data which has changed since the last save to the
+        same file is written, unless compact is True, in which case the
+        whole project is rewritten. The project_saved signal is emitted on
+        success and the save_finished signal is always emitted when the
+        thread stops. Errors are relayed by the save_error signal."""
         
         if file_path is None:
             save_path = self.project_path
@@ -556,60 +759,72 @@ class Shell(QtCore.QObject):
             errStr = "A file path must be provided in order to save a project"
             raise ValueError(errStr)
             
-        # Check the extension
-        if os.path.splitext(save_path)[1] != ".dto":
-        
-            errStr = "The file path must be a file with .dto extension"
-            raise ValueError(errStr)
+        if self._save_thread is not None:
             
-        dto_dir_path = tempfile.mkdtemp()
+            errStr = "The project is already being saved"
+            raise RuntimeError(errStr)
             
-        # Dump the project
-        prj_file_path = os.path.join(dto_dir_path, "project.prj")
-        self.core.dump_project(self.project, prj_file_path)
+        project = self.project
+        snapshot = get_project_snapshot(project._dump())
         
-        # Dump the output scope
-        sco_file_path = os.path.join(dto_dir_path, "scope.json")
+        self._save_thread = ThreadSave(save_path,
+                                       snapshot,
+                                       self._current_scope,
+                                       self.strategy,
+                                       not compact,
+                                       get_save_options())
         
-        with open(sco_file_path, 'wb') as json_file:
-            json.dump(self._current_scope, json_file)        
+        self._save_thread.progress_updated.connect(self.save_progress)
+        self._save_thread.error_detected.connect(self.save_error)
+        self._save_thread.taskFinished.connect(
+                    lambda: self._finish_save(project, save_path, snapshot))
+        self._save_thread.finished.connect(self._clear_save_thread)
+        self._save_thread.finished.connect(self.save_finished)
+                                        
+        self._save_thread.start()
         
-        # Set the standard archive contents
-        arch_files = [prj_file_path, sco_file_path]
-        arch_paths = ["project.prj", "scope.json"]
+        return
         
-        # Dump the strategy (if there is one)
-        if self.strategy is not None:
+    def wait_for_save(self):
         
-            strategy_manager = GUIStrategyManager() 
-            stg_file_path = os.path.join(dto_dir_path, "strategy.pkl")
-            strategy_manager.dump_strategy(self.strategy, stg_file_path)
-            
-            arch_files.append(stg_file_path)
-            arch_paths.append("strategy.pkl")
-            
-        # Now tar the files together
-        dto_file_name = os.path.split(save_path)[1]
-        tar_file_name = "{}.tar".format(dto_file_name)
-    
-        archive = tarfile.open(tar_file_name, "w")
+        if self._save_thread is None: return
+        
+        self._save_thread.wait()
+        
+        return
         
-        for arch_file, arch_path in zip(arch_files, arch_paths):
-            archive.add(arch_file, arcname=arch_path)
+    def _finish_save(self, project, save_path, snapshot):
         
-        archive.close()
+        # The saved project may have been closed or replaced before the
+        # queued signal was delivered
+        if self.project is not project: return
         
-        shutil.move(tar_file_name, save_path)
-        shutil.rmtree(dto_dir_path)
+        set_project_saved(project, snapshot)
         
         self.project_path = save_path
         self.project_saved.emit()
         
         return
         
+    @QtCore.pyqtSlot()
+    def _clear_save_thread(self):
+        
+        if self._save_thread is None: return
+        
+        self._save_thread.wait()
+        self._save_thread = None
+        
+        return
+        
     @QtCore.pyqtSlot()
     def close_project(self):
         
+        self.wait_for_save()
+        
+        # Queued work refers to the closed project
+        for job in self.jobs.get_pending():
+            self.jobs.cancel(job)
+        
         self.project = None
         self.project_path = None
         self.strategy = None
@@ -619,6 +834,12 @@ class Shell(QtCore.QObject):
         self.database_updated.emit("None")
         self.update_pipeline.disconnect()
         
+        # Pipeline items may already have disconnected themselves
+        try:
+            self.update_pipeline_status.disconnect()
+        except TypeError:
+            pass
+        
         return
         
     @QtCore.pyqtSlot(str, str)
@@ -629,6 +850,9 @@ class Shell(QtCore.QObject):
         module_logger.debug(msg)
         
         self.project.set_simulation_title(new_title, title=old_title)
+        
+        # Widgets are stored by simulation title
+        self.update_data.emit(None)
                 
         return
         
@@ -745,17 +969,19 @@ class Shell(QtCore.QObject):
         return
     
     @QtCore.pyqtSlot(object)
-    def initiate_dataflow(self, pipeline):
+    def initiate_dataflow(self, pipeline, priority=0, depends_on=None):
         
-        self._active_thread = ThreadDataFlow(pipeline,
-                                             self)
+        """Queue the initiation of the dataflow. Returns the queued Job."""
         
-        self._active_thread.taskFinished.connect(
-                                        lambda: self.dataflow_active.emit())
-                                        
-        self._active_thread.start()
+        thread = ThreadDataFlow(pipeline, self)
+        thread.taskFinished.connect(lambda: self.dataflow_active.emit())
         
-        return
+        job = self.jobs.submit("Initiate Dataflow",
+                               thread,
+                               priority,
+                               depends_on)
+        
+        return job
         
     @QtCore.pyqtSlot(object, str, str)
     def read_file(self, variable, interface_name, file_path):
@@ -779,47 +1005,136 @@ class Shell(QtCore.QObject):
         return
 
     @QtCore.pyqtSlot()
-    def execute_current(self):
+    def execute_current(self, priority=0, depends_on=None):
         
-        self._active_thread = ThreadCurrent(self.core,
-                                            self.project)
+        """Queue the execution of the current module. Returns the queued
+        Job."""
         
-        self._active_thread.taskFinished.connect(
-                                        lambda: self.module_executed.emit())
-                                        
-        self._active_thread.start()
+        thread = ThreadCurrent(self.core, self.project)
+        thread.taskFinished.connect(lambda: self.module_executed.emit())
         
-        return
+        job = self.jobs.submit("Execute Current Module",
+                               thread,
+                               priority,
+                               depends_on)
+        
+        return job
         
     @QtCore.pyqtSlot()
-    def execute_themes(self):
+    def execute_themes(self, priority=0, depends_on=None):
         
-        self._active_thread = ThreadThemes(self.core,
-                                           self.project)
+        """Queue the execution of the assessment themes. Returns the queued
+        Job."""
         
-        self._active_thread.taskFinished.connect(
-                                        lambda: self.themes_executed.emit())
-                                        
-        self._active_thread.start()
+        thread = ThreadThemes(self.core, self.project)
+        thread.taskFinished.connect(lambda: self.themes_executed.emit())
         
-        return
+        job = self.jobs.submit("Execute Themes",
+                               thread,
+                               priority,
+                               depends_on)
+        
+        return job
         
     @QtCore.pyqtSlot()
-    def execute_strategy(self):
+    def execute_strategy(self, resume=False, priority=0, depends_on=None):
         
-        if self.strategy is None: return
+        """Queue the execution of the strategy. Returns the queued Job, or
+        None if no strategy is set."""
         
-        self._active_thread = ThreadStrategy(self.strategy,
-                                             self.core,
-                                             self.project)
+        if self.strategy is None: return None
         
-        self._active_thread.taskFinished.connect(
-                                        lambda: self.strategy_executed.emit())
-                                        
-        self._active_thread.start()
+        checkpoint = self.get_strategy_checkpoint()
+        
+        # Start afresh unless resuming
+        if checkpoint is not None and not resume: checkpoint.clear()
+        
+        thread = ThreadStrategy(self.strategy,
+                                self.core,
+                                self.project,
+                                checkpoint)
+        thread.taskFinished.connect(lambda: self.strategy_executed.emit())
+        
+        job = self.jobs.submit("Execute Strategy",
+                               thread,
+                               priority,
+                               depends_on)
+        
+        return job
+        
+    def export_results(self, strategy_manager,
+                             save_path,
+                             scope,
+                             ignore_strategy,
+                             priority=0,
+                             depends_on=None):
+        
+        """Queue the export of the results of the simulations to an HDF5
+        file. The project is read when the job runs, so it waits for any
+        jobs which change the project. Returns the queued Job."""
+        
+        thread = ThreadExport(strategy_manager,
+                              self,
+                              save_path,
+                              scope,
+                              ignore_strategy)
+        
+        job = self.jobs.submit("Export Results",
+                               thread,
+                               priority,
+                               depends_on,
+                               resources=("project",))
+        
+        return job
+        
+    @QtCore.pyqtSlot()
+    def cancel_strategy(self):
+        
+        """Stop the running strategy after the current module"""
+        
+        for job in self.jobs.get_running():
+            
+            if not isinstance(job.thread, ThreadStrategy): continue
+            
+            job.thread.monitor.cancel()
         
         return
         
+    def get_strategy_checkpoint(self):
+        
+        """Get the checkpoint for the strategy of the current project. The
+        checkpoint is stored alongside the project file, if it has been
+        saved, otherwise in the user data directory."""
+        
+        if (self.project is None or
+            self.strategy is None or
+            not self.strategy.allow_checkpoint): return None
+        
+        if self.project_path is not None:
+            
+            root_path = os.path.splitext(self.project_path)[0]
+            checkpoint_path = "{}_checkpoint".format(root_path)
+            
+        else:
+            
+            userdir = UserDataDirectory("dtocean_app",
+                                        "DTOcean",
+                                        "checkpoints")
+            safe_title = re.sub(r'[^\w\-]', '_', self.project.title)
+            checkpoint_path = userdir.get_path(safe_title)
+        
+        checkpoint = StrategyCheckpoint(checkpoint_path)
+        
+        return checkpoint
+        
+    def can_resume_strategy(self):
+        
+        checkpoint = self.get_strategy_checkpoint()
+        
+        if checkpoint is None: return False
+        
+        return checkpoint.exists()
+        
     @QtCore.pyqtSlot()
     def set_strategy_run(self):
         
@@ -842,17 +1157,7 @@ class Shell(QtCore.QObject):
         
         return   
         
-    @QtCore.pyqtSlot()
-    def _clear_active_thread(self):
-        
-        if self._active_thread is None: return
-        
-        self._active_thread.wait()
-        self._active_thread = None
-        
-        return
-        
-    
+
 class DTOceanWindow(MainWindow):
 
     def __init__(self, shell, debug=False):
@@ -877,25 +1182,34 @@ class DTOceanWindow(MainWindow):
         self._strategy_manager = None
         self._help = None
         self._progress = None
+        self._save_progress = None
         self._about = None
         
         # Docks
         self._pipeline_dock = None
         self._simulation_dock = None
         self._system_dock = None
+        self._profile_dock = None
+        self._job_dock = None
         
         # Widget re-use
         self._last_tree_item = None
         self._last_data_item = None
         self._last_data_item_status = None
         self._last_plot_id = None
+        self._data_cache = WidgetCache(10, self._dispose_data_widget)
+        self._plot_cache = WidgetCache(5, self._dispose_plot_widget)
                 
         # Last used stack index
         self._last_stack_index = None
         
         # Threads
         self._thread_read_raw = None
+        self._thread_load_data = None
+        self._thread_plot = None
+        self._stale_load_threads = []
         self._thread_tool = None
+        self._export_job = None
         
         # Tools
         self._tool_manager = None
@@ -917,6 +1231,8 @@ class DTOceanWindow(MainWindow):
         self._init_pipeline_dock()
         self._init_simulation_dock()
         self._init_system_dock(debug)
+        self._init_profile_dock()
+        self._init_job_dock()
         
         # Initiate menus
         self._init_file_menu()
@@ -947,6 +1263,7 @@ class DTOceanWindow(MainWindow):
         shell.strategy_executed.connect(
             lambda: self.stackedWidget.setCurrentIndex(self._last_stack_index))
         shell.update_scope.connect(self._current_scope_ui_switch)
+        shell.update_data.connect(self._invalidate_widgets)
 
         # Collect all saved and unsaved signals        
         shell.project_title_change.connect(self._set_project_unsaved)
@@ -954,6 +1271,11 @@ class DTOceanWindow(MainWindow):
         shell.reset_widgets.connect(self._set_project_unsaved)
         shell.update_run_action.connect(self._set_project_unsaved)
         shell.project_saved.connect(self._set_project_saved)
+        
+        # Saving progress
+        shell.save_progress.connect(self._update_save_progress)
+        shell.save_error.connect(self._display_error)
+        shell.save_finished.connect(self._close_save_progress)
 
         return shell
         
@@ -1035,6 +1357,18 @@ class DTOceanWindow(MainWindow):
         self._progress = ProgressBar(self)
         self._progress.setModal(True)
         self._progress.force_quit.connect(self.close)
+        self._progress.cancel_requested.connect(self._shell.cancel_strategy)
+        
+        # Follow the jobs of the shell
+        self._shell.jobs.job_added.connect(self._connect_job)
+        self._shell.jobs.job_finished.connect(self._report_job)
+        self._shell.jobs.queue_empty.connect(self._close_progress)
+        
+        # Set up the non-blocking save progress bar
+        self._save_progress = QtGui.QProgressBar(self)
+        self._save_progress.setMaximumWidth(300)
+        self._save_progress.setVisible(False)
+        self.statusBar().addPermanentWidget(self._save_progress)
         
         # Set up the help dialog
         self._help = HelpWidget(self)
@@ -1125,12 +1459,42 @@ class DTOceanWindow(MainWindow):
         if disable_log: return
               
         # System dock
-        self._system_dock = LogDock(self)
+        self._system_dock = LogDock(self, **get_console_options())
         self._system_dock._close_filter._close_dock.connect(
                         lambda: self.actionSystem_Log.setEnabled(True))
         self.addDockWidget(QtCore.Qt.DockWidgetArea(8), self._system_dock)
 
         return
+    
+    def _init_profile_dock(self):
+        
+        # Profile dock
+        core = self._shell.core
+        
+        self._profile_dock = ProfileDock(self, core.profiler)
+        self._profile_dock._close_filter._close_dock.connect(
+                        lambda: self.actionShow_Profile.setEnabled(True))
+        core.execution_profiled.connect(self._profile_dock._add_record)
+        self.addDockWidget(QtCore.Qt.DockWidgetArea(8), self._profile_dock)
+        
+        if self._system_dock is not None:
+            self.tabifyDockWidget(self._system_dock, self._profile_dock)
+            self._system_dock.raise_()
+        
+        return
+    
+    def _init_job_dock(self):
+        
+        # Job queue dock
+        self._job_dock = JobDock(self, self._shell.jobs)
+        self._job_dock._close_filter._close_dock.connect(
+                        lambda: self.actionShow_Jobs.setEnabled(True))
+        self.addDockWidget(QtCore.Qt.DockWidgetArea(8), self._job_dock)
+        self.tabifyDockWidget(self._profile_dock, self._job_dock)
+        
+        if self._system_dock is not None: self._system_dock.raise_()
+        
+        return
         
     def _init_file_menu(self):
 
@@ -1138,6 +1502,7 @@ class DTOceanWindow(MainWindow):
         self.actionOpen.triggered.connect(self._open_project)
         self.actionSave.triggered.connect(self._save_project)
         self.actionSave_As.triggered.connect(self._saveas_project)
+        self.actionCompact_Project.triggered.connect(self._compact_project)
         self.actionProperties.triggered.connect(
                                             self._set_project_properties)
         self.actionClose.triggered.connect(self._close_project)
@@ -1155,6 +1520,8 @@ class DTOceanWindow(MainWindow):
         self.actionRun_Current.triggered.connect(self._execute_current)
         self.actionRun_Themes.triggered.connect(self._execute_themes)
         self.actionRun_Strategy.triggered.connect(self._execute_strategy)
+        self.actionResume_Strategy.triggered.connect(
+                                    lambda: self._execute_strategy(True))
                                                 
         return
                                                 
@@ -1193,6 +1560,14 @@ class DTOceanWindow(MainWindow):
             self.actionSystem_Log.triggered.connect(self._system_dock.show)
             self.actionSystem_Log.triggered.connect(
                             lambda: self.actionSystem_Log.setDisabled(True))
+        
+        self.actionShow_Profile.triggered.connect(self._profile_dock.show)
+        self.actionShow_Profile.triggered.connect(
+                        lambda: self.actionShow_Profile.setDisabled(True))
+        
+        self.actionShow_Jobs.triggered.connect(self._job_dock.show)
+        self.actionShow_Jobs.triggered.connect(
+                        lambda: self.actionShow_Jobs.setDisabled(True))
                             
         # Context Actions
         self.actionData.triggered.connect(
@@ -1300,6 +1675,7 @@ class DTOceanWindow(MainWindow):
         self.actionNew.setDisabled(True)
         self.actionSave.setDisabled(True)
         self.actionSave_As.setDisabled(True)
+        self.actionCompact_Project.setDisabled(True)
         self.actionComparison.setDisabled(True)
         
         # Enable Actions
@@ -1398,6 +1774,7 @@ class DTOceanWindow(MainWindow):
         # Disable Actions
         self.actionSave.setDisabled(True)
         self.actionSave_As.setDisabled(True)
+        self.actionCompact_Project.setDisabled(True)
         self.actionProperties.setDisabled(True)
         self.actionClose.setDisabled(True)
         self.actionData.setDisabled(True)
@@ -1413,6 +1790,7 @@ class DTOceanWindow(MainWindow):
         self.actionRun_Current.setDisabled(True)
         self.actionRun_Themes.setDisabled(True)
         self.actionRun_Strategy.setDisabled(True)
+        self.actionResume_Strategy.setDisabled(True)
         self.actionExport.setDisabled(True)
         self.actionImport.setDisabled(True)
 
@@ -1480,6 +1858,10 @@ class DTOceanWindow(MainWindow):
 
         # Update the central widget
         self.stackedWidget.setCurrentIndex(0)
+        self._cancel_data_load()
+        self._cancel_plot_load()
+        self._data_cache.clear()
+        self._plot_cache.clear()
         self._last_tree_item = None
         self._last_data_item = None
         self._last_data_item_status = None
@@ -1585,6 +1967,7 @@ class DTOceanWindow(MainWindow):
         # Enable Actions
         self.actionSave.setEnabled(True)
         self.actionSave_As.setEnabled(True)
+        self.actionCompact_Project.setEnabled(True)
         self._run_action_ui_switch()
         
         # Disable Actions
@@ -1628,6 +2011,7 @@ class DTOceanWindow(MainWindow):
                  not self._shell.strategy.strategy_run)):
             
             self.actionRun_Strategy.setDisabled(True)
+            self.actionResume_Strategy.setDisabled(True)
                     
             if modules_scheduled:
                 
@@ -1653,6 +2037,11 @@ class DTOceanWindow(MainWindow):
             else:
                 self.actionRun_Strategy.setDisabled(True)
                 
+            if modules_scheduled and self._shell.can_resume_strategy():
+                self.actionResume_Strategy.setEnabled(True)
+            else:
+                self.actionResume_Strategy.setDisabled(True)
+                
         # Set the pipeline title
         if not modules_completed and modules_scheduled:
             pipeline_msg = "Define simulation inputs..."
@@ -1947,31 +2336,128 @@ class DTOceanWindow(MainWindow):
                 self._last_data_item_status = var_item._status
                           
             return
-                                 
-        if self._data_context._bottom_contents is not None:
-            
-            # Wait for any file reading.
-            if self._thread_read_raw is not None:
-                self._thread_read_raw.wait()
-                self._thread_read_raw = None
-                                    
-            self._data_context._bottom_box.removeWidget(
-                                        self._data_context._bottom_contents)
-            self._data_context._bottom_contents.setParent(None)
-#            self._data_context._bottom_contents.deleteLater()
-            sip.delete(self._data_context._bottom_contents)
-            self._data_context._bottom_contents = None
+        
+        # A newer request replaces any which is still loading
+        self._cancel_data_load()
+        self._clear_data_widget()
         
         self._last_data_item = var_item
         self._last_data_item_status = var_item._status
-                    
-        widget = var_item._get_data_widget(self._shell)
+        
+        key = None
+        widget = None
+        
+        # Input widgets may hold edits which have not been submitted, so
+        # only read-only widgets are reused
+        if not isinstance(var_item, InputVarItem):
+            key = self._get_widget_key(var_item)
+            widget = self._data_cache.get(key)
+        
+        if widget is not None:
+            self._show_data_widget(var_item, widget)
+            return
+        
+        interface = var_item._get_data_interface(self._shell)
+        
+        if interface is None:
+            
+            widget = var_item._build_data_widget(self._shell, None)
+            self._add_data_widget(var_item, widget, key)
+            
+            return
+        
+        # Load the data in the background, showing a placeholder meanwhile
+        placeholder = PlaceholderWidget()
+        self._data_context._bottom_box.addWidget(placeholder)
+        self._data_context._bottom_contents = placeholder
+        
+        thread = ThreadLoadData(var_item, self._shell, interface)
+        thread.error_detected.connect(
+                        lambda *args: self._display_load_error(thread, *args))
+        thread.finished.connect(lambda: self._finish_data_load(thread, key))
+        
+        self._thread_load_data = thread
+        thread.start()
+                
+        return
+        
+    def _cancel_data_load(self):
+        
+        """Discard the result of any data widget which is still loading"""
+        
+        if self._thread_load_data is None: return
+        
+        # Keep the thread until it finishes
+        self._stale_load_threads.append(self._thread_load_data)
+        self._thread_load_data = None
+        
+        return
+        
+    def _display_load_error(self, thread, etype, evalue, etraceback):
+        
+        """Display an error from a data or plot load, unless the load was
+        cancelled or replaced, in which case it is dropped like its
+        result."""
+        
+        if (thread is not self._thread_load_data and
+            thread is not self._thread_plot): return
+        
+        self._display_error(etype, evalue, etraceback)
+        
+        return
+        
+    def _finish_data_load(self, thread, key=None):
+        
+        thread.wait()
+        
+        if thread in self._stale_load_threads:
+            self._stale_load_threads.remove(thread)
+            return
+        
+        if thread is not self._thread_load_data: return
+        
+        self._thread_load_data = None
+        
+        # Remove the placeholder if loading failed. The error has already
+        # been displayed.
+        if thread.interface is None:
+            self._clear_data_widget()
+            self._last_data_item = None
+            return
+        
+        widget = thread.var_item._build_data_widget(self._shell,
+                                                    thread.interface)
+        
+        self._clear_data_widget()
+        self._add_data_widget(thread.var_item, widget, key)
+        
+        return
+        
+    def _clear_data_widget(self):
+        
+        if self._data_context._bottom_contents is None: return
+            
+        # Wait for any file reading.
+        if self._thread_read_raw is not None:
+            self._thread_read_raw.wait()
+            self._thread_read_raw = None
+                                
+        widget = self._data_context._bottom_contents
+                                
+        self._data_context._bottom_box.removeWidget(widget)
+        widget.setParent(None)
+        self._data_context._bottom_contents = None
+        
+        # Cached widgets are kept for reuse
+        if not self._data_cache.has_widget(widget):
+#            widget.deleteLater()
+            sip.delete(widget)
+        
+        return
+        
+    def _add_data_widget(self, var_item, widget, key=None):
 
         if widget is None: return
-    
-        # Add the widget to the context
-        self._data_context._bottom_box.addWidget(widget)
-        self._data_context._bottom_contents = widget
         
         # Connect the widgets read and nullify events
         widget._get_read_event().connect(
@@ -1979,11 +2465,32 @@ class DTOceanWindow(MainWindow):
             
         widget._get_nullify_event().connect(
             lambda: self._read_raw(var_item._variable, None))
-            
-        if "unavailable" in var_item._status: widget.setDisabled(True)
+        
+        if key is not None: self._data_cache.put(key, widget)
+        
+        self._show_data_widget(var_item, widget)
                 
         return
         
+    def _show_data_widget(self, var_item, widget):
+    
+        # Add the widget to the context
+        self._data_context._bottom_box.addWidget(widget)
+        self._data_context._bottom_contents = widget
+        
+        widget.setDisabled("unavailable" in var_item._status)
+        
+        return
+        
+    def _dispose_data_widget(self, widget):
+        
+        # The displayed widget is deleted when it is replaced
+        if widget is self._data_context._bottom_contents: return
+        
+        sip.delete(widget)
+        
+        return
+        
     @QtCore.pyqtSlot(object, str)
     def _set_plot_widget(self, var_item,  plot_name="auto"):
         
@@ -1993,35 +2500,167 @@ class DTOceanWindow(MainWindow):
         
         if plot_name == "auto": plot_name = None
         
-        if self._plot_context._bottom_contents is not None:
-                        
-            self._plot_context._bottom_box.removeWidget(
-                                        self._plot_context._bottom_contents)
-            self._plot_context._bottom_contents.setParent(None)
+        # A newer request replaces any which is still drawing
+        self._cancel_plot_load()
+        self._clear_plot_widget()
+        
+        self._last_plot_id = var_item._id
+        
+        if not isinstance(var_item, (InputVarItem, OutputVarItem)): return
+        
+        key = self._get_widget_key(var_item, plot_name)
+        widget = self._plot_cache.get(key)
+        
+        if widget is not None:
+            self._show_plot_widget(var_item, widget)
+            return
+        
+        # Draw the plot in the background, showing a placeholder meanwhile
+        placeholder = PlaceholderWidget()
+        self._plot_context._bottom_box.addWidget(placeholder)
+        self._plot_context._bottom_contents = placeholder
+        
+        # Draw at the size of the plot area, if it is shown
+        plot_area = self._plot_context._bottom
+        area_size = plot_area.contentsRect().size()
+        
+        if area_size.isEmpty():
+            size = None
+        else:
+            size = (area_size.width(), area_size.height())
+        
+        thread = ThreadPlot(var_item,
+                            self._shell,
+                            plot_name,
+                            size,
+                            get_pixel_ratio(plot_area))
+        thread.error_detected.connect(
+                        lambda *args: self._display_load_error(thread, *args))
+        thread.finished.connect(lambda: self._finish_plot_load(thread, key))
+        
+        self._thread_plot = thread
+        thread.start()
+        
+        return
+        
+    def _cancel_plot_load(self):
+        
+        """Discard the result of any plot which is still drawing"""
+        
+        if self._thread_plot is None: return
+        
+        # Keep the thread until it finishes
+        self._stale_load_threads.append(self._thread_plot)
+        self._thread_plot = None
+        
+        return
+        
+    def _finish_plot_load(self, thread, key):
+        
+        thread.wait()
+        
+        if (thread in self._stale_load_threads or
+            thread is not self._thread_plot):
             
-            fignum = self._plot_context._bottom_contents.figure.number
-#            self._plot_context._bottom_contents.deleteLater()
-            sip.delete(self._plot_context._bottom_contents)
-            plt.close(fignum)
+            if thread in self._stale_load_threads:
+                self._stale_load_threads.remove(thread)
             
-            self._plot_context._bottom_contents = None
+            if thread.figure is not None: close_figure(thread.figure)
+            
+            return
         
-        self._last_plot_id = var_item._id
-                                        
-        widget = var_item._get_plot_widget(self._shell, plot_name)
+        self._thread_plot = None
+        self._clear_plot_widget()
         
-        if widget is None: return
+        if thread.image is None:
+            
+            if thread.figure is not None: close_figure(thread.figure)
+            
+            return
+        
+        widget = PlotImageWidget(thread.figure, thread.image)
+        self._plot_cache.put(key, widget)
+        self._show_plot_widget(thread.var_item, widget)
+        
+        return
+        
+    def _clear_plot_widget(self):
+        
+        if self._plot_context._bottom_contents is None: return
+            
+        widget = self._plot_context._bottom_contents
+                    
+        self._plot_context._bottom_box.removeWidget(widget)
+        widget.setParent(None)
+        self._plot_context._bottom_contents = None
+        
+        # Cached widgets are kept for reuse
+        if self._plot_cache.has_widget(widget): return
+        
+        if isinstance(widget, PlotImageWidget):
+            self._dispose_plot_widget(widget)
+        else:
+            sip.delete(widget)
+        
+        return
+        
+    def _show_plot_widget(self, var_item, widget):
     
         # Add the widget to the context
         self._plot_context._bottom_box.addWidget(widget)
         self._plot_context._bottom_contents = widget
         
-        # Draw the widget
-        widget.draw_idle()
-        
-        assert len(plt.get_fignums()) <= 2
+        # Save the displayed plot from the plot manager
+        set_current_figure(widget.figure)
             
-        if "unavailable" in var_item._status: widget.setDisabled(True)
+        widget.setDisabled("unavailable" in var_item._status)
+        
+        return
+        
+    def _dispose_plot_widget(self, widget):
+        
+        # The displayed widget is deleted when it is replaced
+        if widget is self._plot_context._bottom_contents: return
+        
+        figure = widget.figure
+        sip.delete(widget)
+        close_figure(figure)
+        
+        return
+        
+    def _check_figures(self):
+        
+        """Check that figures are not leaking. The cached plots, the
+        displayed plot, any plots being drawn and the comparison plot may be
+        open."""
+        
+        n_drawing = len(self._stale_load_threads)
+        if self._thread_plot is not None: n_drawing += 1
+        
+        max_figures = self._plot_cache.max_size + n_drawing + 2
+        
+        assert len(plt.get_fignums()) <= max_figures
+        
+        return
+        
+    def _get_widget_key(self, var_item, *args):
+        
+        """Key for the cached widgets of a variable, which changes with the
+        version of its data"""
+        
+        sim_title = self._shell.project.get_simulation_title()
+        version = self._shell.core.get_data_version(var_item._id)
+        
+        key = ((sim_title, var_item._id, type(var_item).__name__) +
+                                                        args + (version,))
+        
+        return key
+        
+    @QtCore.pyqtSlot(object)
+    def _invalidate_widgets(self, var_ids):
+        
+        self._data_cache.invalidate(var_ids)
+        self._plot_cache.invalidate(var_ids)
         
         return
     
@@ -2049,7 +2688,7 @@ class DTOceanWindow(MainWindow):
             if isinstance(self._comp_context._bottom_contents, MPLWidget):
                 fignum = self._comp_context._bottom_contents.figure.number
                 sip.delete(self._comp_context._bottom_contents)
-                plt.close(fignum)
+                close_figure(fignum)
             else:
                 sip.delete(self._comp_context._bottom_contents)
                 
@@ -2079,7 +2718,7 @@ class DTOceanWindow(MainWindow):
         # Draw the widget
         widget.draw_idle()
         
-        assert len(plt.get_fignums()) <= 2
+        self._check_figures()
         
         # Switch on save button
         self._sim_comparison.buttonBox.button(
@@ -2113,7 +2752,7 @@ class DTOceanWindow(MainWindow):
             if isinstance(self._comp_context._bottom_contents, MPLWidget):
                 fignum = self._comp_context._bottom_contents.figure.number
                 sip.delete(self._comp_context._bottom_contents)
-                plt.close(fignum)
+                close_figure(fignum)
             else:
                 sip.delete(self._comp_context._bottom_contents)
                 
@@ -2170,7 +2809,7 @@ class DTOceanWindow(MainWindow):
             if isinstance(self._comp_context._bottom_contents, MPLWidget):
                 fignum = self._comp_context._bottom_contents.figure.number
                 sip.delete(self._comp_context._bottom_contents)
-                plt.close(fignum)
+                close_figure(fignum)
             else:
                 sip.delete(self._comp_context._bottom_contents)
                 
@@ -2197,7 +2836,7 @@ class DTOceanWindow(MainWindow):
         # Draw the widget
         widget.draw_idle()
         
-        assert len(plt.get_fignums()) <= 2
+        self._check_figures()
         
         # Switch save buttons
         self._level_comparison.buttonBox.button(
@@ -2236,7 +2875,7 @@ class DTOceanWindow(MainWindow):
             if isinstance(self._comp_context._bottom_contents, MPLWidget):
                 fignum = self._comp_context._bottom_contents.figure.number
                 sip.delete(self._comp_context._bottom_contents)
-                plt.close(fignum)
+                close_figure(fignum)
             else:
                 sip.delete(self._comp_context._bottom_contents)
                 
@@ -2288,7 +2927,8 @@ class DTOceanWindow(MainWindow):
     @QtCore.pyqtSlot()    
     def _save_comparison_data(self):
         
-        extlist = ["comma-separated values (*.csv)"]
+        extlist = ["comma-separated values (*.csv)",
+                   "HDF5 file of all results (*.h5)"]
         extStr = ";;".join(extlist)
 
         fdialog_msg = "Save data"
@@ -2298,8 +2938,79 @@ class DTOceanWindow(MainWindow):
                                                       '.',
                                                       extStr)
         
+        if not save_path: return
+        
+        save_path = str(save_path)
+        _, ext = os.path.splitext(save_path)
+        
+        # HDF5 files receive the outputs of every simulation
+        if ext.lower() in [".h5", ".hdf5"]:
+            
+            comparison = self.sender()
+            ignore_strategy = (comparison is not None and
+                               comparison.strategyBox.isChecked())
+            
+            self._export_results(save_path, ignore_strategy)
+            
+            return
+        
         df = self._strategy_manager._last_df
-        df.to_csv(str(save_path), index=False)
+        df.to_csv(save_path, index=False)
+        
+        return
+        
+    def _export_results(self, save_path, ignore_strategy):
+        
+        if self._export_job is not None:
+            
+            errStr = "Results are already being exported"
+            raise RuntimeError(errStr)
+        
+        # Collect the current scope
+        if self._pipeline_dock.globalRadioButton.isChecked():
+            scope = "global"
+        elif self._pipeline_dock.localRadioButton.isChecked():
+            scope = "local"
+        else:
+            errStr = "Feck!"
+            raise SystemError(errStr)
+        
+        # The project is read while exporting, so the modal progress dialog
+        # prevents it being changed until the job queue is empty
+        self._progress.allow_close = False
+        self._progress.set_pulsing()
+        self._progress.set_message("Exporting results...")
+        
+        # Progress is connected when the job is added, in _connect_job
+        self._export_job = self._shell.export_results(self._strategy_manager,
+                                                      save_path,
+                                                      scope,
+                                                      ignore_strategy)
+        self._export_job.finished.connect(
+                            lambda job: self._finish_export(job, save_path))
+        
+        self._progress.show()
+        
+        return
+        
+    @QtCore.pyqtSlot(int, int)
+    def _update_export_progress(self, n_done, n_total):
+        
+        msg = "Exporting results... simulation {} of {}".format(n_done,
+                                                                n_total)
+        self._progress.set_progress(n_done, n_total)
+        self._progress.set_message(msg)
+        
+        return
+        
+    def _finish_export(self, job, save_path):
+        
+        self._export_job = None
+        
+        # Errors are reported with those of the other jobs
+        if job.state == Job.FINISHED:
+            msg = "Results exported to {}".format(save_path)
+            self.statusBar().showMessage(msg, 5000)
         
         return
         
@@ -2397,7 +3108,17 @@ class DTOceanWindow(MainWindow):
         if self._shell.project_path is None:
             self._saveas_project()
         else:
-            self._shell.save_project()
+            self._start_save()
+        
+        return
+        
+    @QtCore.pyqtSlot()
+    def _compact_project(self):
+        
+        if self._shell.project_path is None:
+            self._saveas_project()
+        else:
+            self._start_save(compact=True)
         
         return
         
@@ -2412,8 +3133,55 @@ class DTOceanWindow(MainWindow):
                                                       '.',
                                                       valid_exts)
         
-        if file_path:
-            self._shell.save_project(file_path)
+        if file_path: self._start_save(file_path)
+        
+        return
+        
+    def _start_save(self, file_path=None, compact=False):
+        
+        # Signals from the save thread are relayed by the shell, which
+        # connects them before the thread is started
+        self._shell.save_project(file_path, compact)
+        
+        # Prevent saving, closing or replacing the project until complete
+        self.actionNew.setDisabled(True)
+        self.actionOpen.setDisabled(True)
+        self.actionSave.setDisabled(True)
+        self.actionSave_As.setDisabled(True)
+        self.actionCompact_Project.setDisabled(True)
+        self.actionClose.setDisabled(True)
+        
+        self._save_progress.setRange(0, 0)
+        self._save_progress.setFormat("Saving...")
+        self._save_progress.setVisible(True)
+        
+        return
+        
+    @QtCore.pyqtSlot(object, int, int)
+    def _update_save_progress(self, n_bytes, n_entries, n_total):
+        
+        progress_str = "Saving... {:.1f} MB".format(n_bytes / 1048576.)
+        
+        self._save_progress.setRange(0, n_total)
+        self._save_progress.setValue(n_entries)
+        self._save_progress.setFormat(progress_str)
+        
+        return
+        
+    @QtCore.pyqtSlot()
+    def _close_save_progress(self):
+        
+        self._save_progress.setVisible(False)
+        self.actionOpen.setEnabled(True)
+        
+        if self._shell.project is None:
+            self.actionNew.setEnabled(True)
+            return
+        
+        self.actionSave.setEnabled(True)
+        self.actionSave_As.setEnabled(True)
+        self.actionCompact_Project.setEnabled(True)
+        self.actionClose.setEnabled(True)
         
         return
         
@@ -2635,7 +3403,7 @@ class DTOceanWindow(MainWindow):
         return
         
     @QtCore.pyqtSlot()
-    def _execute_strategy(self):
+    def _execute_strategy(self, resume=False):
         
         # Get the current module name
         scheduled_mods = self._shell.get_scheduled_modules()
@@ -2687,7 +3455,7 @@ class DTOceanWindow(MainWindow):
                          QtGui.QDialogButtonBox.Ok).clicked.disconnect()
         self._data_check.buttonBox.button(
                          QtGui.QDialogButtonBox.Ok).clicked.connect(
-                                             self._progress_strategy)
+                                    lambda: self._progress_strategy(resume))
         self._data_check.buttonBox.button(
                          QtGui.QDialogButtonBox.Ok).clicked.connect(
                                              self._data_check.accept)
@@ -2739,8 +3507,6 @@ class DTOceanWindow(MainWindow):
         self._progress.allow_close = False
         self._progress.set_pulsing()
         self._shell.initiate_dataflow(self._pipeline_dock)
-        self._shell._active_thread.error_detected.connect(self._display_error)
-        self._shell._active_thread.finished.connect(self._close_progress)
         self._progress.show()
         
         return
@@ -2751,8 +3517,6 @@ class DTOceanWindow(MainWindow):
         self._progress.allow_close = False
         self._progress.set_pulsing()
         self._shell.execute_current()
-        self._shell._active_thread.error_detected.connect(self._display_error)
-        self._shell._active_thread.finished.connect(self._close_progress)
         self._progress.show()
         
         return
@@ -2763,14 +3527,12 @@ class DTOceanWindow(MainWindow):
         self._progress.allow_close = False
         self._progress.set_pulsing()
         self._shell.execute_themes()
-        self._shell._active_thread.error_detected.connect(self._display_error)
-        self._shell._active_thread.finished.connect(self._close_progress)
         self._progress.show()
         
         return
         
     @QtCore.pyqtSlot()        
-    def _progress_strategy(self):
+    def _progress_strategy(self, resume=False):
         
         
         self._last_stack_index = self.stackedWidget.currentIndex()
@@ -2778,12 +3540,43 @@ class DTOceanWindow(MainWindow):
         
         self._progress.allow_close = False
         self._progress.set_pulsing()
-        self._shell.execute_strategy()
-        self._shell._active_thread.error_detected.connect(self._display_error)
-        self._shell._active_thread.finished.connect(self._close_progress)
+        self._progress.set_cancellable(True)
+        self._shell.execute_strategy(resume)
         self._progress.show()
         
         return
+    
+    @QtCore.pyqtSlot(object)
+    def _connect_job(self, job):
+        
+        # Connect before the job starts, so no progress is missed
+        if isinstance(job.thread, ThreadStrategy):
+            job.thread.progress_updated.connect(
+                                            self._update_strategy_progress)
+        elif isinstance(job.thread, ThreadExport):
+            job.thread.progress_updated.connect(
+                                            self._update_export_progress)
+        
+        return
+    
+    @QtCore.pyqtSlot(object)
+    def _report_job(self, job):
+        
+        if job.state == Job.FAILED:
+            self._display_error(*job.error)
+        
+        return
+    
+    @QtCore.pyqtSlot(object)
+    def _update_strategy_progress(self, state):
+        
+        if state["n_simulations"] is not None:
+            self._progress.set_progress(state["n_complete"],
+                                        state["n_simulations"])
+        
+        self._progress.set_message(format_progress(state))
+        
+        return
         
     @QtCore.pyqtSlot(str)        
     def _open_tool(self, tool_name):
@@ -2818,6 +3611,7 @@ class DTOceanWindow(MainWindow):
         
         self._progress.allow_close = True
         self._progress.close()
+        self._progress.reset()
         
         return
 
@@ -2853,6 +3647,10 @@ class DTOceanWindow(MainWindow):
                                           QtGui.QMessageBox.Yes,
                                           QtGui.QMessageBox.No)
         
+        # The project must not close while its results are exported
+        if (reply == QtGui.QMessageBox.Yes and
+            self._export_job is not None): self._export_job.thread.wait()
+        
         return reply
 
     def closeEvent(self, event):
@@ -2864,6 +3662,8 @@ class DTOceanWindow(MainWindow):
                                            QtGui.QMessageBox.No)
 
         if reply == QtGui.QMessageBox.Yes:
+            self._shell.wait_for_save()
+            if self._export_job is not None: self._export_job.thread.wait()
             event.accept()
         else:
             event.ignore()
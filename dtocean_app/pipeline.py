@@ -33,13 +33,11 @@ from PyQt4 import QtGui, QtCore
 from dtocean_core.pipeline import Tree
 
 from .widgets.docks import PipeLineDock
-from .widgets.display import MPLWidget
+from .widgets.display import MPLWidget, PLOT_LOCK
+from .widgets.decimate import decimate_figure
 from .widgets.dialogs import TestDataPicker
 from .widgets.input import CancelWidget
-from .utils.icons import (make_redicon_pixmap,
-                          make_greenicon_pixmap,
-                          make_blueicon_pixmap,
-                          make_buttoncancel_pixmap)
+from .utils.icons import get_status_icon
 
 class ThreadReadTest(QtCore.QThread):
     
@@ -84,14 +82,28 @@ class PipeLine(PipeLineDock):
         
         # Root branches
         self._branch_map = None
+        self._drawn_map = None
         self._items = []
         
+        # Branch items by title, in tree order
+        self._branch_items = []
+        self._branch_index = {}
+        
+        # Branch items by variable id and title, built when first needed
+        self._var_index = None
+        self._var_titles = None
+        
+        # Variable titles for the search box
+        self._search_model = QtGui.QStringListModel(self)
+        self._search_stale = True
+        
         # Test data picker
         self._test_data_picker = TestDataPicker(self)
         self._test_data_picker.setModal(True)
         self._active_thread = None
                 
         self._init_title()
+        self._init_search()
         
         return
         
@@ -100,9 +112,26 @@ class PipeLine(PipeLineDock):
         self.setWindowTitle("Pipeline")
         self.treeWidget.setSortingEnabled(False)
         self.treeWidget.headerItem().setText(0, "Waiting...")
+        
+        # Variable items are created when their branch is first expanded
+        self.treeWidget.itemExpanded.connect(self._populate_item)
 
         return
         
+    def _init_search(self):
+        
+        completer = QtGui.QCompleter(self)
+        completer.setModel(self._search_model)
+        completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        completer.activated[str].connect(self._jump_to_variable)
+        
+        self.searchLineEdit.setCompleter(completer)
+        self.searchLineEdit.textEdited.connect(self._update_search)
+        self.searchLineEdit.returnPressed.connect(
+            lambda: self._jump_to_variable(self.searchLineEdit.text()))
+        
+        return
+        
     def _set_branch_map(self, branch_map):
         
         self._branch_map = branch_map
@@ -117,6 +146,12 @@ class PipeLine(PipeLineDock):
         
     def _draw(self, shell):
         
+        # Update the existing items in place, unless the branch map or the
+        # available branches have changed
+        if (self._items and
+            self._drawn_map is self._branch_map and
+            all(item._update(shell) for item in self._items)): return
+        
         self._clear()
         
         for branch_dict in self._branch_map:
@@ -130,7 +165,28 @@ class PipeLine(PipeLineDock):
                               *args)
             new_item._activate(shell)
             self._items.append(new_item)
+        
+        self._drawn_map = self._branch_map
+        self._index_branches()
+            
+        return
+        
+    def _index_branches(self):
+        
+        for hub_item in self._items:
             
+            for item in hub_item._items:
+                
+                if not isinstance(item, (InputBranchItem, OutputBranchItem)):
+                    continue
+                
+                self._branch_items.append(item)
+                self._branch_index.setdefault(item._title, []).append(item)
+        
+        self._var_index = None
+        self._var_titles = None
+        self._search_stale = True
+        
         return
         
     def _expand(self, shell):
@@ -159,12 +215,93 @@ class PipeLine(PipeLineDock):
                 root.removeChild(widget)
             
         self._items = []
+        self._drawn_map = None
+        self._branch_items = []
+        self._branch_index = {}
+        self._var_index = None
+        self._var_titles = None
+        self._search_stale = True
 
         return
         
+    def _index_variables(self):
+        
+        """Index the branch items by the ids and titles of their variables,
+        using the branch declarations and the variable metadata rather than
+        creating the variable items"""
+        
+        if self._var_index is not None: return
+        
+        var_index = {}
+        var_titles = set()
+        
+        for branch_item in self._branch_items:
+            
+            shell = branch_item._shell
+            if shell is None: continue
+            
+            for var_id in branch_item._get_var_ids():
+                
+                title = shell.core.get_metadata(var_id).title
+                var_titles.add(title)
+                
+                for var_key in set([var_id, title]):
+                    var_index.setdefault(var_key, []).append(branch_item)
+        
+        self._var_index = var_index
+        self._var_titles = var_titles
+        
+        return
+        
+    def _get_branch_item(self, branch_title, item_class=None):
+        
+        """Get the first branch item with the given title and class"""
+        
+        for item in self._branch_index.get(branch_title, []):
+            if item_class is None or isinstance(item, item_class):
+                return item
+        
+        return None
+        
+    def _get_var_item(self, var_key, item_class=None, branch_title=None):
+        
+        """Get the first variable item with the given title or variable id
+        and class, optionally within the named branch"""
+        
+        # Only the branches declaring the variable are populated
+        self._index_variables()
+        branch_items = self._var_index.get(var_key, [])
+        
+        if branch_title is not None:
+            branch_items = [item for item in branch_items
+                                            if item._title == branch_title]
+        
+        for branch_item in branch_items:
+            
+            item = branch_item._get_var_item(var_key)
+            
+            if item is None: continue
+            if item_class is None or isinstance(item, item_class): return item
+        
+        return None
+        
     def _find_item(self, item_title, item_class=None, root_item=None):
         
+        # Use the indexes for branches and variables
+        if root_item is None and item_class is not None:
+            
+            if issubclass(item_class, (InputBranchItem, OutputBranchItem)):
+                return self._get_branch_item(item_title, item_class)
+            
+            if issubclass(item_class, VarItem):
+                return self._get_var_item(item_title, item_class)
+        
         if root_item is None: root_item = self
+        
+        # Variable items may not have been created yet
+        if (isinstance(root_item, (InputBranchItem, OutputBranchItem)) and
+            (item_class is None or issubclass(item_class, VarItem))):
+            root_item._populate()
 
         for item in root_item._items:
             
@@ -231,6 +368,71 @@ class PipeLine(PipeLineDock):
                              
         return
     
+    @QtCore.pyqtSlot(str)
+    def _update_search(self, text):
+        
+        """Collect the variable titles for the search box"""
+        
+        if not self._search_stale: return
+        
+        self._index_variables()
+        
+        self._search_model.setStringList(sorted(self._var_titles))
+        self._search_stale = False
+        
+        # Show the completions for the text entered so far
+        completer = self.searchLineEdit.completer()
+        completer.setCompletionPrefix(text)
+        completer.complete()
+        
+        return
+    
+    @QtCore.pyqtSlot(str)
+    def _jump_to_variable(self, var_key):
+        
+        """Select and show the first visible variable item with the given
+        title or id"""
+        
+        var_key = str(var_key).strip()
+        if not var_key: return
+        
+        self._index_variables()
+        
+        for branch_item in self._var_index.get(var_key, []):
+            
+            item = branch_item._get_var_item(var_key)
+            
+            if item is not None and not item.isHidden(): break
+            
+        else:
+            
+            msgStr = "Variable '{}' not found".format(var_key)
+            self.searchLineEdit.setToolTip(msgStr)
+            
+            return
+        
+        self.searchLineEdit.setToolTip("")
+        
+        parent = item.parent()
+        
+        while parent is not None:
+            parent.setExpanded(True)
+            parent = parent.parent()
+        
+        self.treeWidget.setCurrentItem(item)
+        self.treeWidget.scrollToItem(item)
+        self.treeWidget.itemClicked.emit(item, 0)
+        
+        return
+    
+    @QtCore.pyqtSlot(object)
+    def _populate_item(self, item):
+        
+        if isinstance(item, (InputBranchItem, OutputBranchItem)):
+            item._populate()
+        
+        return
+    
     @QtCore.pyqtSlot(object, object)
     def _read_test_data(self, shell, item):
         
@@ -260,6 +462,31 @@ class PipeLine(PipeLineDock):
         return
 
 
+def _disconnect_update(shell, slot):
+    
+    """Disconnect an item from the update_pipeline_status signal of the
+    shell"""
+    
+    if shell is None: return
+    
+    try:
+        shell.update_pipeline_status.disconnect(slot)
+    except TypeError:
+        pass
+    
+    return
+
+
+def _get_changed_items(items, var_ids):
+    
+    """Filter variable items by a set of changed variable ids. All the
+    items are returned if var_ids is None."""
+    
+    if var_ids is None: return items
+    
+    return [item for item in items if item._id in var_ids]
+
+
 class BaseItem(QtGui.QTreeWidgetItem):
     
     def __init__(self, parent,
@@ -285,6 +512,13 @@ class BaseItem(QtGui.QTreeWidgetItem):
             
         return
         
+    def _update(self, shell):
+        
+        """Update the item in place for the current state of the project.
+        Returns False if the item must be rebuilt instead."""
+        
+        return True
+        
     def _expand(self, shell):
         
         for item in self._items:
@@ -309,6 +543,18 @@ class BaseItem(QtGui.QTreeWidgetItem):
         
         return None
         
+    def _get_data_interface(self, shell):
+        
+        return None
+        
+    def _build_data_widget(self, shell, interface):
+        
+        return None
+        
+    def _get_plot_figure(self, shell, plot_name):
+        
+        return None
+        
     def _get_plot_widget(self, shell, plot_name):
         
         return None
@@ -348,17 +594,15 @@ class HubRoot(object):
         self._BranchCls = branch_cls
         self._active = active
         self._branch_order = branch_order
+        self._branch_names = None
         self._items = []
                 
         return
         
     def _activate(self, parent, shell, hub_branches):
-                                                                                                                  
-        if self._branch_order is None:
-            branch_order = hub_branches
-        else:
-            branch_order = [branch for branch in self._branch_order
-                                                    if branch in hub_branches]
+        
+        branch_order = self._get_branch_order(hub_branches)
+        self._branch_names = branch_order
                                                          
         for branch_name in branch_order:
             
@@ -380,6 +624,31 @@ class HubRoot(object):
             
         return
         
+    def _update(self, shell):
+        
+        hub_branches = self._tree.get_available_branches(shell.core,
+                                                         shell.project,
+                                                         [self._hub_name])
+        
+        if self._get_branch_order(hub_branches) != self._branch_names:
+            return False
+        
+        if not self._active: return True
+        
+        for item in self._items:
+            item._update(shell)
+        
+        return True
+        
+    def _get_branch_order(self, hub_branches):
+        
+        if self._branch_order is None: return list(hub_branches)
+        
+        branch_order = [branch for branch in self._branch_order
+                                                if branch in hub_branches]
+        
+        return branch_order
+        
         
 class HubItem(BaseItem, HubRoot):
     
@@ -413,6 +682,10 @@ class HubItem(BaseItem, HubRoot):
         
         return
         
+    def _update(self, shell):
+        
+        return HubRoot._update(self, shell)
+        
         
 class HiddenHub(HubRoot):
     
@@ -438,7 +711,9 @@ class HiddenHub(HubRoot):
                                                          shell.project,
                                                          [self._hub_name])
                                                          
-        if not hub_branches: return
+        if not hub_branches:
+            self._branch_names = []
+            return
         
         super(HiddenHub, self)._activate(self._parent, shell, hub_branches)
         
@@ -474,13 +749,37 @@ class InputBranchItem(BaseItem):
         self._branch = branch
         self._hub_title = hub_title
         self._ignore_str = ignore_str
+        self._shell = None
+        self._populated = False
+        self._title_index = {}
+        self._id_index = {}
         
         return
         
-    def _activate(self, shell, sort=True):
+    def _activate(self, shell):
         
         # Update status on variable updated events
-        shell.update_pipeline.connect(self._update_status)
+        shell.update_pipeline_status.connect(self._update_status)
+        
+        self._shell = shell
+        self.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+        
+        return
+        
+    def _update(self, shell):
+        
+        self._shell = shell
+        if self._populated: self._update_status(shell)
+        
+        return True
+        
+    def _populate(self, sort=True):
+        
+        """Create the variable items, if not done already"""
+        
+        if self._populated or self._shell is None: return
+        
+        shell = self._shell
         
         input_status = self._branch.get_input_status(shell.core,
                                                      shell.project)
@@ -511,6 +810,12 @@ class InputBranchItem(BaseItem):
                                     metadata.title)
 
             self._items.append(new_item)
+            self._title_index.setdefault(new_item._title, new_item)
+            self._id_index[new_item._id] = new_item
+        
+        self._populated = True
+        self.setChildIndicatorPolicy(
+                QtGui.QTreeWidgetItem.DontShowIndicatorWhenChildless)
             
         return
                 
@@ -520,17 +825,61 @@ class InputBranchItem(BaseItem):
                                                      shell.project)
                                                      
         if not set(input_status.values()) == set(["unavailable"]):
+            self._populate()
             self.setExpanded(True)
         
         return
+        
+    def _clear(self):
+        
+        super(InputBranchItem, self)._clear()
+        _disconnect_update(self._shell, self._update_status)
+        
+        self._populated = False
+        self._title_index = {}
+        self._id_index = {}
+        
+        return
+        
+    def _get_var_item(self, var_key):
+        
+        """Get the variable item with the given title or variable id"""
+        
+        self._populate()
+        
+        if var_key in self._title_index: return self._title_index[var_key]
+        
+        return self._id_index.get(var_key)
+    
+    def _get_var_ids(self):
+        
+        """Get the ids of the variables of the branch, without creating
+        their items"""
+        
+        if self._shell is None: return []
+        
+        input_declaration = self._branch.get_inputs(self._shell.core,
+                                                    self._shell.project)
+        
+        return [var_id for var_id in input_declaration
+                                        if self._ignore_str not in var_id]
 
-    @QtCore.pyqtSlot(object)
-    def _update_status(self, shell):
+    @QtCore.pyqtSlot(object, object)
+    def _update_status(self, shell, var_ids=None):
+        
+        """Update the status of the variable items with the given ids, or
+        of all items if var_ids is None"""
+        
+        # Branches which have not been expanded have no items to update
+        if not self._populated: return
+        
+        items = _get_changed_items(self._items, var_ids)
+        if not items: return
         
         input_status = self._branch.get_input_status(shell.core,
                                                      shell.project)
         
-        for item in self._items:
+        for item in items:
             
             status = input_status[item._variable._id]
             item._update_status(status)
@@ -546,6 +895,8 @@ class InputBranchItem(BaseItem):
         required = set(required)
         
         if not required: return None
+        
+        self._populate()
 
         # Locate the items providing the required variables and pick up the
         # names:
@@ -610,13 +961,37 @@ class OutputBranchItem(BaseItem):
         self._branch = branch
         self._hub_title = hub_title
         self._ignore_str = ignore_str
+        self._shell = None
+        self._populated = False
+        self._title_index = {}
+        self._id_index = {}
         
         return
         
-    def _activate(self, shell, sort=True):
+    def _activate(self, shell):
         
         # Update status on variable updated events
-        shell.update_pipeline.connect(self._update_status)
+        shell.update_pipeline_status.connect(self._update_status)
+        
+        self._shell = shell
+        self.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+        
+        return
+        
+    def _update(self, shell):
+        
+        self._shell = shell
+        if self._populated: self._update_status(shell)
+        
+        return True
+        
+    def _populate(self, sort=True):
+        
+        """Create the variable items, if not done already"""
+        
+        if self._populated or self._shell is None: return
+        
+        shell = self._shell
         
         output_status = self._branch.get_output_status(shell.core,
                                                        shell.project)
@@ -648,6 +1023,12 @@ class OutputBranchItem(BaseItem):
                                      metadata.title)
 
             self._items.append(new_item)
+            self._title_index.setdefault(new_item._title, new_item)
+            self._id_index[new_item._id] = new_item
+        
+        self._populated = True
+        self.setChildIndicatorPolicy(
+                QtGui.QTreeWidgetItem.DontShowIndicatorWhenChildless)
             
         return
         
@@ -657,15 +1038,60 @@ class OutputBranchItem(BaseItem):
                                                        shell.project)
                                                      
         if not set(output_status.values()) == set(["unavailable"]):
+            self._populate()
             self.setExpanded(True)
         
         return
-            
-    def _update_status(self, shell):
+        
+    def _clear(self):
+        
+        super(OutputBranchItem, self)._clear()
+        _disconnect_update(self._shell, self._update_status)
+        
+        self._populated = False
+        self._title_index = {}
+        self._id_index = {}
+        
+        return
+        
+    def _get_var_item(self, var_key):
+        
+        """Get the variable item with the given title or variable id"""
+        
+        self._populate()
+        
+        if var_key in self._title_index: return self._title_index[var_key]
+        
+        return self._id_index.get(var_key)
+    
+    def _get_var_ids(self):
+        
+        """Get the ids of the variables of the branch, without creating
+        their items"""
+        
+        if self._shell is None: return []
+        
+        output_declaration = self._branch.get_outputs(self._shell.core,
+                                                      self._shell.project)
+        
+        return [var_id for var_id in output_declaration
+                                        if self._ignore_str not in var_id]
+    
+    @QtCore.pyqtSlot(object, object)
+    def _update_status(self, shell, var_ids=None):
+        
+        """Update the status of the variable items with the given ids, or
+        of all items if var_ids is None"""
+        
+        # Branches which have not been expanded have no items to update
+        if not self._populated: return
+        
+        items = _get_changed_items(self._items, var_ids)
+        if not items: return
 
         output_status = self._branch.get_output_status(shell.core,
                                                        shell.project)
-        for item in self._items:
+        for item in items:
             
             status = output_status[item._variable._id]
             item._update_status(status)
@@ -702,40 +1128,28 @@ class VarItem(BaseItem):
         
     def _set_icon_red(self):
 
-        self._icon = QtGui.QIcon()
-        self._icon.addPixmap(make_redicon_pixmap(),
-                       QtGui.QIcon.Normal,
-                       QtGui.QIcon.Off)
+        self._icon = get_status_icon("required")
         self.setIcon(0, self._icon)
 
         return
 
     def _set_icon_green(self):
 
-        self._icon = QtGui.QIcon()
-        self._icon.addPixmap(make_greenicon_pixmap(),
-                       QtGui.QIcon.Normal,
-                       QtGui.QIcon.Off)
+        self._icon = get_status_icon("satisfied")
         self.setIcon(0, self._icon)
 
         return
 
     def _set_icon_blue(self):
 
-        self._icon = QtGui.QIcon()
-        self._icon.addPixmap(make_blueicon_pixmap(),
-                       QtGui.QIcon.Normal,
-                       QtGui.QIcon.Off)
+        self._icon = get_status_icon("optional")
         self.setIcon(0, self._icon)
 
         return
 
     def _set_icon_cancel(self):
 
-        self._icon = QtGui.QIcon()
-        self._icon.addPixmap(make_buttoncancel_pixmap(),
-                       QtGui.QIcon.Normal,
-                       QtGui.QIcon.Off)
+        self._icon = get_status_icon("unavailable")
         self.setIcon(0, self._icon)
 
         return
@@ -764,7 +1178,23 @@ class VarItem(BaseItem):
 
         return
         
-    def _get_data_widget(self, shell, interface):
+    def _get_data_widget(self, shell):
+        
+        interface = self._get_data_interface(shell)
+        interface = self._load_data_interface(shell, interface)
+        widget = self._build_data_widget(shell, interface)
+        
+        return widget
+        
+    def _get_data_interface(self, shell):
+        
+        return None
+        
+    def _load_data_interface(self, shell, interface):
+        
+        """Read the variable's data into the widget interface and shape it
+        for the widget. No widgets are created, so this can be called from a
+        worker thread."""
         
         if interface is None: return None
         
@@ -775,12 +1205,29 @@ class VarItem(BaseItem):
             raise ValueError(errStr)
         
         interface = shell.core.load_interface(shell.project, interface)
+        interface = shell.core.prepare_interface(interface,
+                                                 self._variable._id)
+
+        return interface
+        
+    def _build_data_widget(self, shell, interface):
+        
+        """Connect a loaded widget interface to create the data widget. Only
+        the widget is built here, the data having been shaped when it was
+        loaded. This must be called from the GUI thread."""
+        
+        if interface is None: return None
+        
         interface = shell.core.connect_interface(shell.project, interface)
         widget = interface.get_data(self._variable._id)
 
         return widget
                     
-    def _get_plot_widget(self, shell, plot_name=None):
+    def _get_plot_figure(self, shell, plot_name=None):
+        
+        """Create the figure of the named plot, or the automatic plot if
+        plot_name is None. No widgets are created, so this can be called
+        from a worker thread while holding PLOT_LOCK."""
                 
         interface = self._variable._get_receiving_interface(shell.core, 
                                                             shell.project,
@@ -796,9 +1243,21 @@ class VarItem(BaseItem):
                                         shell.project,
                                         interface)
         
-        if interface.fig_handle is None: return None
+        figure = interface.fig_handle
         
-        widget = MPLWidget(interface.fig_handle, shell.core._input_parent)
+        # Draw long time series and lines at screen resolution
+        if figure is not None: decimate_figure(figure)
+        
+        return figure
+                    
+    def _get_plot_widget(self, shell, plot_name=None):
+        
+        with PLOT_LOCK:
+            figure = self._get_plot_figure(shell, plot_name)
+        
+        if figure is None: return None
+        
+        widget = MPLWidget(figure, shell.core._input_parent)
         
         return widget
 
@@ -821,7 +1280,7 @@ class InputVarItem(VarItem):
 
         return
         
-    def _get_data_widget(self, shell):
+    def _get_data_interface(self, shell):
         
         interface = self._variable._find_providing_interface(
                                                    shell.core,
@@ -834,8 +1293,13 @@ class InputVarItem(VarItem):
                                                        shell.core,
                                                        "AutoInput",
                                                        allow_missing=True)
-                                                   
-        widget = super(InputVarItem, self)._get_data_widget(shell, interface)
+
+        return interface
+        
+    def _build_data_widget(self, shell, interface):
+        
+        widget = super(InputVarItem, self)._build_data_widget(shell,
+                                                              interface)
         
         # Provide the cancel widget if no other can be found
         if widget is None: widget = CancelWidget()
@@ -854,7 +1318,7 @@ class OutputVarItem(VarItem):
 
         return
         
-    def _get_data_widget(self, shell):
+    def _get_data_interface(self, shell):
         
         interface = self._variable._find_providing_interface(
                                                    shell.core,
@@ -867,8 +1331,6 @@ class OutputVarItem(VarItem):
                                                        shell.core,
                                                        "AutoOutput",
                                                        allow_missing=True)
-                                                   
-        widget = super(OutputVarItem, self)._get_data_widget(shell, interface)
 
-        return widget
+        return interface
 
@@ -0,0 +1,183 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Data pool which stores identical data only once.
+
+Data added to the pool is identified by the SHA-1 digest of its pickled
+form. When the same data is added again, for instance by a cloned or
+imported simulation, the index of the existing data is returned and shared
+through the link counts of the pool, rather than storing another copy.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import copy
+import hashlib
+import cPickle as pickle
+
+from aneris.entity.data import DataPool
+
+
+def get_digest(obj):
+
+    '''Get the SHA-1 hex digest of the pickled object'''
+
+    return hashlib.sha1(pickle.dumps(obj, -1)).hexdigest()
+
+
+class DedupDataPool(DataPool):
+
+    '''DataPool which stores data with identical content once. The pool is
+    pickled as a plain DataPool, so that saved projects can be read without
+    the GUI.'''
+
+    def __init__(self):
+
+        DataPool.__init__(self)
+
+        self._digests = {}
+        self._index_digests = {}
+
+        return
+
+    @classmethod
+    def from_pool(cls, pool):
+
+        '''Create a new pool from the contents of a DataPool. The digests of
+        the existing data are only known if the pool data can provide
+        them, as they are not calculated here.'''
+
+        if isinstance(pool, cls): return pool
+
+        new_pool = cls()
+        new_pool._data_indexes = pool._data_indexes
+        new_pool._data = pool._data
+        new_pool._links = pool._links
+
+        if hasattr(pool._data, "get_digests"):
+
+            for data_index, digest in pool._data.get_digests().iteritems():
+                new_pool._set_digest(data_index, digest)
+
+        return new_pool
+
+    def get_digest(self, data_index):
+
+        '''Get the digest of the data at data_index, or None if unknown'''
+
+        return self._index_digests.get(data_index)
+
+    def add(self, data, data_index=None, links=0):
+
+        if data_index is not None:
+
+            data_index = DataPool.add(self, data, data_index, links)
+            self._remove_digest(data_index)
+
+            return data_index
+
+        digest = get_digest(data)
+        existing_index = self._digests.get(digest)
+
+        if existing_index is not None:
+
+            self._links[existing_index] += links
+
+            logStr = ("Data with digest {} already stored with index "
+                      "{}").format(digest, existing_index)
+            module_logger.debug(logStr)
+
+            return existing_index
+
+        data_index = DataPool.add(self, data, links=links)
+        self._set_digest(data_index, digest)
+
+        return data_index
+
+    def copy(self, data_index):
+
+        # Copies must have their own index
+        copy_data = copy.deepcopy(self._data[data_index])
+        copy_index = DataPool.add(self, copy_data)
+
+        return copy_index
+
+    def replace(self, data_index, data):
+
+        DataPool.replace(self, data_index, data)
+        self._remove_digest(data_index)
+
+        return
+
+    def pop(self, data_index):
+
+        data = DataPool.pop(self, data_index)
+        self._remove_digest(data_index)
+
+        return data
+
+    def _set_digest(self, data_index, digest):
+
+        self._index_digests[data_index] = digest
+        if digest not in self._digests: self._digests[digest] = data_index
+
+        return
+
+    def _remove_digest(self, data_index):
+
+        digest = self._index_digests.pop(data_index, None)
+        if digest is None: return
+
+        if self._digests.get(digest) != data_index: return
+
+        del self._digests[digest]
+
+        # Another index may hold the same data
+        for other_index, other_digest in self._index_digests.iteritems():
+
+            if other_digest == digest:
+                self._digests[digest] = other_index
+                break
+
+        return
+
+    def __copy__(self):
+
+        new_pool = DedupDataPool()
+        new_pool.__dict__.update(self.__dict__)
+
+        return new_pool
+
+    def __deepcopy__(self, memo):
+
+        new_pool = DedupDataPool()
+        memo[id(self)] = new_pool
+
+        for key, value in self.__dict__.iteritems():
+            setattr(new_pool, key, copy.deepcopy(value, memo))
+
+        return new_pool
+
+    def __reduce__(self):
+
+        state = {"_data_indexes": self._data_indexes,
+                 "_data": self._data,
+                 "_links": self._links}
+
+        return (DataPool, (), state)
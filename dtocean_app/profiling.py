@@ -0,0 +1,206 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Timing and memory measurements of module and theme executions.
+
+Each execution is recorded with its wall time, the CPU time used by the
+whole process and the peak resident set size (RSS) of the process while it
+ran. The peak RSS is sampled with psutil in a background thread. The process
+CPU time includes any other threads which ran at the same time, such as the
+GUI thread. Executions in strategy worker processes are measured in the
+worker, which runs a single simulation at a time, and their records are
+passed to the profiler of the parent process.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import os
+import csv
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+import psutil
+
+RECORD_FIELDS = ["simulation",
+                 "name",
+                 "kind",
+                 "start_time",
+                 "wall_time",
+                 "process_cpu_time",
+                 "peak_rss"]
+
+
+def get_process_cpu_time():
+
+    '''Get the user and system CPU time used by all the threads of the
+    process, in seconds'''
+
+    process_times = os.times()
+
+    return process_times[0] + process_times[1]
+
+
+class PeakMemoryMonitor(threading.Thread):
+
+    '''Thread which samples the RSS of the process until stopped, recording
+    the largest value.
+
+    Args:
+      interval (float, optional): time between samples in seconds
+    '''
+
+    def __init__(self, interval=0.1):
+
+        super(PeakMemoryMonitor, self).__init__()
+        self.daemon = True
+        self.peak_rss = None
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._process = psutil.Process(os.getpid())
+
+        return
+
+    def run(self):
+
+        while True:
+
+            self._sample()
+            if self._stop_event.wait(self._interval): break
+
+        return
+
+    def stop(self):
+
+        '''Stop sampling and return the peak RSS in bytes'''
+
+        self._stop_event.set()
+        self.join()
+        self._sample()
+
+        return self.peak_rss
+
+    def _sample(self):
+
+        rss = self._process.memory_info().rss
+        if self.peak_rss is None or rss > self.peak_rss: self.peak_rss = rss
+
+        return
+
+
+class ExecutionProfiler(object):
+
+    '''Collection of execution records, which can be exported to CSV or
+    JSON.
+
+    Args:
+      callback (function, optional): function called with each new record
+    '''
+
+    def __init__(self, callback=None):
+
+        self.callback = callback
+        self._records = []
+        self._lock = threading.Lock()
+
+        return
+
+    @contextmanager
+    def measure(self, sim_title, name, kind):
+
+        '''Context manager which records the execution of the enclosed
+        block'''
+
+        monitor = PeakMemoryMonitor()
+        monitor.start()
+
+        start_time = time.time()
+        start_cpu = get_process_cpu_time()
+
+        try:
+
+            yield
+
+        finally:
+
+            wall_time = time.time() - start_time
+            cpu_time = get_process_cpu_time() - start_cpu
+            peak_rss = monitor.stop()
+
+            record = {"simulation": sim_title,
+                      "name": name,
+                      "kind": kind,
+                      "start_time": start_time,
+                      "wall_time": wall_time,
+                      "process_cpu_time": cpu_time,
+                      "peak_rss": peak_rss}
+
+            self.add_record(record)
+
+    def add_record(self, record):
+
+        with self._lock:
+            self._records.append(record)
+
+        logStr = ("Executed {} {} in {:.2f} seconds (process CPU {:.2f} "
+                  "seconds)").format(record["kind"],
+                                     record["name"],
+                                     record["wall_time"],
+                                     record["process_cpu_time"])
+        module_logger.debug(logStr)
+
+        if self.callback is not None: self.callback(record)
+
+        return
+
+    def get_records(self):
+
+        with self._lock:
+            records = list(self._records)
+
+        return records
+
+    def clear(self):
+
+        with self._lock:
+            self._records = []
+
+        return
+
+    def to_csv(self, file_path):
+
+        '''Write the records to a CSV file'''
+
+        with open(file_path, "wb") as fstream:
+
+            writer = csv.DictWriter(fstream, RECORD_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.get_records())
+
+        return
+
+    def to_json(self, file_path):
+
+        '''Write the records to a JSON file'''
+
+        with open(file_path, "w") as fstream:
+            json.dump(self.get_records(), fstream, indent=2)
+
+        return
@@ -0,0 +1,400 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Results of the simulations of a project.
+
+The ResultStore is an in-memory store of the values of variables in each
+simulation. Values are held in one column per variable, indexed by
+simulation title and level, so comparing a variable across many simulations
+needs no access to the simulations themselves. The store is filled as values
+are read and the entries of a simulation are removed whenever its data
+changes, so only the simulations which have changed are read again.
+
+export_results writes the scalar and tabular outputs of many simulations to
+a single HDF5 file. The tables are written one simulation at a time, so the
+results of all the simulations are never held in memory together.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import tables
+except ImportError:
+    tables = None
+
+SCALAR_TYPES = ["int", "float", "bool", "str"]
+TABLE_STRUCTURES = ["SeriesData",
+                    "TimeSeries",
+                    "TimeSeriesColumn",
+                    "TableData",
+                    "TableDataColumn",
+                    "IndexTable",
+                    "IndexTableColumn",
+                    "LineTable",
+                    "LineTableColumn",
+                    "TimeTable",
+                    "TimeTableColumn",
+                    "TriStateTable",
+                    "TriStateIndexTable"]
+STRING_SIZE = 128
+
+
+class ResultStore(object):
+
+    '''Values of variables, stored by variable id, simulation title and
+    level. The level can be any hashable key describing where in the
+    simulation the value was found.'''
+
+    def __init__(self):
+
+        self._columns = {}
+        self._lock = threading.Lock()
+
+        return
+
+    def get(self, sim_title, level, var_id):
+
+        '''Get a stored value, raising KeyError if it is not stored'''
+
+        with self._lock:
+            value = self._columns[var_id][(sim_title, level)]
+
+        return value
+
+    def set(self, sim_title, level, var_id, value):
+
+        with self._lock:
+            column = self._columns.setdefault(var_id, {})
+            column[(sim_title, level)] = value
+
+        return
+
+    def remove_simulation(self, sim_title):
+
+        '''Remove all the values of the given simulation'''
+
+        with self._lock:
+
+            for column in self._columns.values():
+
+                keys = [key for key in column if key[0] == sim_title]
+
+                for key in keys:
+                    del column[key]
+
+        return
+
+    def rename_simulation(self, old_title, new_title):
+
+        '''Move the values of a simulation to its new title, replacing any
+        values stored under the new title'''
+
+        with self._lock:
+
+            for column in self._columns.values():
+
+                keys = [key for key in column if key[0] == new_title]
+
+                for key in keys:
+                    del column[key]
+
+                keys = [key for key in column if key[0] == old_title]
+
+                for key in keys:
+                    column[(new_title, key[1])] = column.pop(key)
+
+        return
+
+    def clear(self):
+
+        with self._lock:
+            self._columns = {}
+
+        return
+
+
+def export_results(core, project,
+                         save_path,
+                         outputs,
+                         sim_titles=None,
+                         progress_callback=None):
+
+    """Write the scalar and tabular outputs of the simulations of a project
+    to an HDF5 file. The file contains the following tables:
+
+      simulations: one row per simulation, with the simulation index and
+        title followed by a column for each scalar output
+      variables: the key, level, title, units and structure of each output
+      tables/<key>: the rows of a tabular output for every simulation,
+        prefixed with the simulation index and title
+
+    Args:
+      outputs (list): (level, variable id) pairs of the outputs to write
+      sim_titles (list, optional): titles of the simulations to write, in
+        order. Defaults to all simulations.
+      progress_callback (function, optional): called with the number of
+        simulations written and the total after each simulation
+
+    Returns:
+      int: the number of simulations written
+    """
+
+    if tables is None:
+        errStr = "Exporting results requires the tables package"
+        raise ImportError(errStr)
+
+    if sim_titles is None:
+        sim_indexes = range(len(project))
+    else:
+        sim_indexes = project.get_simulation_indexes(sim_titles,
+                                                     raise_if_missing=False)
+        sim_indexes = [x for x in sim_indexes if x is not None]
+
+    scalars = OrderedDict()
+    table_keys = OrderedDict()
+
+    for level, var_id in outputs:
+
+        metadata = core.get_metadata(var_id)
+
+        if _is_scalar(metadata):
+            scalars[var_id] = level
+        elif _is_table(metadata):
+            table_keys[var_id] = (level, "tables/" + _get_key(var_id))
+
+    sim_rows = []
+    string_sizes = {}
+    n_sims = len(sim_indexes)
+
+    store = pd.HDFStore(save_path, mode="w", complevel=5, complib="zlib")
+
+    try:
+
+        for i, sim_index in enumerate(sim_indexes):
+
+            sim_title = project.get_simulation_title(index=sim_index)
+            if sim_title is None: sim_title = ""
+
+            sim_row = OrderedDict([("sim_index", sim_index),
+                                   ("sim_title", sim_title)])
+
+            for var_id, level in scalars.items():
+
+                # Scalars are small, so they can come from the result store
+                [(_, value)] = core.get_project_values(project,
+                                                       var_id,
+                                                       level,
+                                                       [sim_index],
+                                                       True)
+                sim_row[var_id] = value
+
+            sim_rows.append(sim_row)
+
+            for var_id, (level, key) in table_keys.items():
+
+                value = core.get_simulation_value(project,
+                                                  var_id,
+                                                  level,
+                                                  sim_index)
+
+                if value is None: continue
+
+                frame = _get_table_frame(value, sim_index, sim_title)
+                _append_table(store, key, frame, string_sizes)
+
+            if progress_callback is not None: progress_callback(i + 1, n_sims)
+
+        sim_frame = _get_sim_frame(core, sim_rows, scalars.keys())
+        store.put("simulations",
+                  sim_frame,
+                  format="table",
+                  min_itemsize={"values": STRING_SIZE})
+
+        var_frame = _get_var_frame(core, scalars, table_keys)
+        store.put("variables", var_frame, format="table")
+
+    finally:
+
+        store.close()
+
+    return n_sims
+
+
+def _is_scalar(metadata):
+
+    if "SimpleData" not in metadata.structure: return False
+    if metadata.types is None: return False
+
+    return any(x in metadata.types for x in SCALAR_TYPES)
+
+
+def _is_table(metadata):
+
+    return metadata.structure in TABLE_STRUCTURES
+
+
+def _get_key(var_id):
+
+    return var_id.replace(".", "_")
+
+
+def _get_table_frame(value, sim_index, sim_title):
+
+    if isinstance(value, pd.Series):
+
+        name = value.name
+        if name is None: name = "value"
+
+        value = value.to_frame(name=name)
+
+    frame = value.reset_index()
+    frame.columns = [str(x) for x in frame.columns]
+
+    frame.insert(0, "sim_title", sim_title)
+    frame.insert(0, "sim_index", sim_index)
+
+    return frame
+
+
+def _get_string_size(frame):
+
+    '''Get the length of the longest string in the columns of frame'''
+
+    size = 0
+
+    for column in frame.columns:
+
+        if frame[column].dtype != object: continue
+
+        lengths = [len(x) for x in frame[column] if isinstance(x, basestring)]
+        if lengths: size = max(size, max(lengths))
+
+    return size
+
+
+def _append_table(store, key, frame, string_sizes):
+
+    '''Append frame to the table at key. The string columns of a table share
+    a size, which is set when the table is first written and recorded in
+    string_sizes. If frame holds longer strings the table is written again
+    with a larger size.'''
+
+    size = max(_get_string_size(frame), STRING_SIZE)
+    stored_size = string_sizes.get(key)
+
+    # Tables with columns or types which differ from those already written
+    # can not be appended, but this should not stop the export
+    try:
+
+        if stored_size is not None and size > stored_size:
+            size = max(size, 2 * stored_size)
+            _resize_table(store, key, size)
+            string_sizes[key] = size
+        elif stored_size is not None:
+            size = stored_size
+
+        store.append(key,
+                     frame,
+                     index=False,
+                     min_itemsize={"values": size})
+
+        string_sizes[key] = size
+
+    except (TypeError, ValueError) as e:
+
+        sim_title = frame["sim_title"].iloc[0] if len(frame) else None
+        logMsg = ("Table '{}' of simulation '{}' could not be "
+                  "exported: {}").format(key, sim_title, e)
+        module_logger.warning(logMsg)
+
+    return
+
+
+def _resize_table(store, key, string_size):
+
+    '''Write the table at key again, with string columns of the given
+    size'''
+
+    frame = store.select(key)
+    store.remove(key)
+    store.append(key,
+                 frame,
+                 index=False,
+                 min_itemsize={"values": string_size})
+
+    return
+
+
+def _get_sim_frame(core, sim_rows, var_ids):
+
+    columns = ["sim_index", "sim_title"] + list(var_ids)
+    sim_frame = pd.DataFrame(sim_rows, columns=columns)
+
+    for var_id in var_ids:
+
+        metadata = core.get_metadata(var_id)
+
+        if "str" in metadata.types:
+            values = sim_frame[var_id]
+            sim_frame[var_id] = values.where(pd.notnull(values), np.nan)
+        else:
+            sim_frame[var_id] = pd.to_numeric(sim_frame[var_id],
+                                              errors="coerce")
+
+    return sim_frame
+
+
+def _get_var_frame(core, scalars, table_keys):
+
+    var_rows = []
+
+    for var_id, level in scalars.items():
+        var_rows.append(_get_var_row(core, var_id, level, "simulations"))
+
+    for var_id, (level, key) in table_keys.items():
+        var_rows.append(_get_var_row(core, var_id, level, key))
+
+    columns = ["var_id", "level", "key", "title", "units", "structure"]
+
+    return pd.DataFrame(var_rows, columns=columns)
+
+
+def _get_var_row(core, var_id, level, key):
+
+    metadata = core.get_metadata(var_id)
+
+    if metadata.units:
+        units = metadata.units[0]
+    else:
+        units = ""
+
+    var_row = {"var_id": var_id,
+               "level": level,
+               "key": key,
+               "title": metadata.title or "",
+               "units": units,
+               "structure": metadata.structure}
+
+    return var_row
@@ -37,6 +37,21 @@ class GUIStrategy(object):
         """Can the strategy be rerun after first execution"""
         
         return NotImplementedError
+    
+    @property
+    def allow_checkpoint(self):
+        
+        """Is the strategy configured to record completed simulations in a
+        checkpoint and resume from it"""
+        
+        return False
+    
+    def get_n_simulations(self, core, project):
+        
+        """Get the number of simulations the strategy will execute, or None
+        if it is not known in advance"""
+        
+        return None
 
     @abc.abstractmethod
     def get_widget(self):
@@ -54,6 +54,10 @@ class GUIBasicStrategy(GUIStrategy, BasicStrategy):
 
         return 1
     
+    def get_n_simulations(self, core, project):
+        
+        return 1
+    
     def get_widget(self, parent, shell):
         
         widget = BasicWidget(parent, "No Configuration Required")
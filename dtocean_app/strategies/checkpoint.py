@@ -0,0 +1,174 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+On-disk checkpoints of the simulations completed during a strategy run.
+
+A checkpoint directory holds the pickled list of simulation cases, one dumped
+project per completed simulation and a JSON manifest recording which cases
+have finished. The manifest is rewritten atomically after each simulation so
+that an interrupted run can be resumed from the last completed case.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import os
+import json
+import shutil
+import pickle
+
+
+class StrategyCheckpoint(object):
+
+    '''Record of the simulation cases of a strategy run and the ones that
+    have been completed.
+
+    Args:
+      dir_path (str): path to the checkpoint directory
+    '''
+
+    manifest_name = "manifest.json"
+    cases_name = "cases.pkl"
+
+    def __init__(self, dir_path):
+
+        self.dir_path = dir_path
+
+        return
+
+    def exists(self):
+
+        '''Is there a checkpoint which can be resumed'''
+
+        manifest_path = os.path.join(self.dir_path, self.manifest_name)
+        cases_path = os.path.join(self.dir_path, self.cases_name)
+
+        result = ((os.path.isfile(manifest_path) or
+                   os.path.isfile(manifest_path + ".tmp")) and
+                  os.path.isfile(cases_path))
+
+        return result
+
+    def start(self, cases):
+
+        '''Create a new checkpoint for the given simulation cases, removing
+        any existing checkpoint.
+
+        Args:
+          cases (list): (sim_title, var_values) tuples
+        '''
+
+        self.clear()
+        os.makedirs(self.dir_path)
+
+        cases_path = os.path.join(self.dir_path, self.cases_name)
+
+        with open(cases_path, "wb") as fstream:
+            pickle.dump(cases, fstream, -1)
+
+        manifest = {"titles": [x[0] for x in cases],
+                    "completed": {}}
+        self._write_manifest(manifest)
+
+        msgStr = "Created strategy checkpoint at {}".format(self.dir_path)
+        module_logger.info(msgStr)
+
+        return
+
+    def get_cases(self):
+
+        '''Get the simulation cases stored in the checkpoint'''
+
+        cases_path = os.path.join(self.dir_path, self.cases_name)
+
+        with open(cases_path, "rb") as fstream:
+            cases = pickle.load(fstream)
+
+        return cases
+
+    def get_completed(self):
+
+        '''Get a dictionary of completed simulation titles and the paths to
+        their dumped projects'''
+
+        manifest = self._read_manifest()
+        completed = {}
+
+        for sim_title, file_name in manifest["completed"].iteritems():
+
+            result_path = os.path.join(self.dir_path, file_name)
+
+            # Ignore records whose files have gone missing
+            if not os.path.isfile(result_path): continue
+
+            completed[sim_title] = result_path
+
+        return completed
+
+    def get_result_path(self, case_index):
+
+        '''Get the path for dumping the project of the given case'''
+
+        file_name = "simulation_{}.prj".format(case_index)
+        result_path = os.path.join(self.dir_path, file_name)
+
+        return result_path
+
+    def set_completed(self, sim_title, result_path):
+
+        '''Record that the given simulation has completed'''
+
+        manifest = self._read_manifest()
+        manifest["completed"][sim_title] = os.path.basename(result_path)
+        self._write_manifest(manifest)
+
+        return
+
+    def clear(self):
+
+        '''Delete the checkpoint directory'''
+
+        if os.path.isdir(self.dir_path): shutil.rmtree(self.dir_path)
+
+        return
+
+    def _read_manifest(self):
+
+        manifest_path = os.path.join(self.dir_path, self.manifest_name)
+
+        # Recover from an interrupted write
+        if not os.path.isfile(manifest_path): manifest_path += ".tmp"
+
+        with open(manifest_path, "r") as fstream:
+            manifest = json.load(fstream)
+
+        return manifest
+
+    def _write_manifest(self, manifest):
+
+        manifest_path = os.path.join(self.dir_path, self.manifest_name)
+        temp_path = manifest_path + ".tmp"
+
+        with open(temp_path, "w") as fstream:
+            json.dump(manifest, fstream)
+
+        # os.rename does not overwrite on Windows
+        if os.path.isfile(manifest_path): os.remove(manifest_path)
+        os.rename(temp_path, manifest_path)
+
+        return
@@ -28,6 +28,7 @@ from aneris.utilities.misc import OrderedSet
 from dtocean_core.pipeline import Tree
 
 from . import GUIStrategy, StrategyWidget, PyQtABCMeta
+from .parallel import ParallelExecutor
 from ..utils.display import is_high_dpi
 
 if is_high_dpi():
@@ -66,6 +67,134 @@ class GUIMultiSensitivity(GUIStrategy, MultiSensitivity):
         '''
 
         return 3
+        
+    def configure(self, inputs_df,
+                        subspacing_ratio,
+                        n_processes=1,
+                        checkpoint=False):
+        
+        """Configure the strategy. If n_processes is greater than one the
+        simulations are executed in a pool of worker processes. If
+        checkpoint is True, completed simulations are recorded so that an
+        interrupted run can be resumed."""
+        
+        MultiSensitivity.configure(self, inputs_df, subspacing_ratio)
+        
+        self._config["n_processes"] = n_processes
+        self._config["checkpoint"] = checkpoint
+        
+        return
+        
+    @property
+    def allow_checkpoint(self):
+        
+        if self._config is None: return False
+        
+        return bool(self._config.get("checkpoint", False))
+    
+    def get_n_simulations(self, core, project):
+        
+        if self._config is None: return None
+        
+        # Count the selections without building the cases
+        inputs_df = self._config["inputs_df"]
+        subsp_ratio = self._get_subsp_ratio()
+        
+        return MultiSensitivity.count_selections(inputs_df, subsp_ratio)
+        
+    def execute(self, core, project, checkpoint=None):
+        
+        """Execute the strategy. If a checkpoint is given, each completed
+        simulation is recorded in it and, if the checkpoint already exists,
+        its cases are resumed."""
+        
+        n_processes = 1
+        
+        if self._config is not None:
+            n_processes = self._config.get("n_processes", 1)
+            
+        if n_processes is None: n_processes = 1
+            
+        if checkpoint is None and n_processes < 2:
+            
+            MultiSensitivity.execute(self, core, project)
+            
+            return
+        
+        # The random subspace selection must be reused when resuming
+        if checkpoint is not None and checkpoint.exists():
+            
+            cases = checkpoint.get_cases()
+            
+        else:
+            
+            cases = self._get_cases(core, project)
+            if checkpoint is not None: checkpoint.start(cases)
+        
+        executor = ParallelExecutor(n_processes)
+        sim_titles = executor.execute(core, project, cases, checkpoint)
+        
+        if not sim_titles: return
+        
+        sim_frames = []
+        
+        for sim_title, var_values in cases:
+            
+            if sim_title not in sim_titles: continue
+            
+            self.add_simulation_title(sim_title)
+            
+            sim_df = pd.DataFrame(var_values,
+                                  columns=["Module", "Variable", "Values"])
+            sim_frames.append(sim_df)
+            
+        self.sim_details = pd.concat(sim_frames, keys=sim_titles)
+        
+        return
+        
+    def _get_subsp_ratio(self):
+        
+        subsp_ratio = self._config["subsp_ratio"]
+        
+        if subsp_ratio is None or subsp_ratio > 1:
+            subsp_ratio = 1.
+        elif subsp_ratio < 0:
+            subsp_ratio = 0.
+        
+        return subsp_ratio
+        
+    def _get_cases(self, core, project):
+        
+        """Build the (title, variable values) records for each simulation"""
+        
+        inputs_df = self._config["inputs_df"]
+        subsp_ratio = self._get_subsp_ratio()
+            
+        sorted_df = self._get_sorted_inputs(core, project, inputs_df)
+        selections = self._get_selections(sorted_df, subsp_ratio)
+        
+        sorted_df = sorted_df.reset_index()
+        
+        cases = []
+        
+        for i, selection_case in enumerate(selections):
+            
+            sim_df = sorted_df.copy()
+            sim_title = "Simulation {}".format(i)
+            sim_df["Values"] = selection_case
+            
+            var_values = []
+            
+            for _, row in sim_df.iterrows():
+                
+                var_record = (str(row["Module"]),
+                              row["Variable"],
+                              row["Values"])
+                var_values.append(var_record)
+            
+            cases.append((sim_title, var_values))
+            
+        return cases
     
     def get_widget(self, parent, shell):
         
@@ -324,9 +453,13 @@ class MultiSensitivityWidget(QtGui.QWidget,
         df['Values'] = df['Values'].apply(lambda x: self.string2types(x))
         
         subsp_ratio = self.subsetSpinBox.value() / 100.
+        n_processes = self.processSpinBox.value()
+        checkpoint = self.checkpointBox.isChecked()
                         
         conf_dict = {"inputs_df": df,
-                     "subspacing_ratio": subsp_ratio
+                     "subspacing_ratio": subsp_ratio,
+                     "n_processes": n_processes,
+                     "checkpoint": checkpoint
                      }
                      
         nsims = MultiSensitivity.count_selections(df, subsp_ratio)
@@ -342,6 +475,8 @@ class MultiSensitivityWidget(QtGui.QWidget,
         
         df = config_dict["inputs_df"]
         subsp_ratio = config_dict["subsp_ratio"]
+        n_processes = config_dict.get("n_processes", 1)
+        checkpoint = config_dict.get("checkpoint", False)
         nsims = MultiSensitivity.count_selections(df, subsp_ratio)        
         
         df['Variable'] = df['Variable'].apply(lambda x: self._get_var_title(x))
@@ -349,6 +484,8 @@ class MultiSensitivityWidget(QtGui.QWidget,
         
         self.tableView.model().array_df = df
         self.subsetSpinBox.setValue(subsp_ratio * 100.)
+        self.processSpinBox.setValue(n_processes)
+        self.checkpointBox.setChecked(checkpoint)
         
         info_str = self._sim_info_str.format(nsims)
         self.infoLabel.setText(info_str)
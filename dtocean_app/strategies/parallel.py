@@ -0,0 +1,591 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Execution of independent strategy simulations in a pool of worker processes.
+
+Each worker builds its own Core and loads a copy of the base project from
+disk, sets the variables for its simulation case, runs the basic strategy and
+dumps the result. The parent process then imports each finished simulation
+back into its own project, in the order the cases were given.
+
+The workers put the start of each module or theme execution, and its
+profile record once complete, on a queue. The parent reads the queue while
+it waits for results and passes the events to the progress monitor and
+profiler of its core. Cancellation is passed to the workers through a shared
+event, and each worker stops before its next module.
+
+When a single process is requested, the cases are run one after another in
+clones of the active simulation, using the caller's core and project. If a
+checkpoint is given, each completed simulation is also dumped to it.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import os
+import shutil
+import tempfile
+import traceback
+import multiprocessing
+from Queue import Empty
+
+from dtocean_core.pipeline import Tree
+from dtocean_core.strategies.basic import BasicStrategy
+
+from .progress import StrategyCancelled
+from ..archive import load_project_data
+from ..cache import CachedCore
+from ..core import GUIProject
+from ..profiling import ExecutionProfiler
+
+# Seconds between reading worker events while waiting for a result
+EVENT_INTERVAL = 0.1
+
+# Core instance held by each worker process
+_worker_core = None
+
+
+class WorkerMonitor(object):
+
+    '''Progress reporter for the core of a worker process. The start of
+    each module or theme execution and its profile record are put on a
+    queue read by the parent process and cancellation is read from an event
+    set by the parent.
+
+    Args:
+      events (Queue): queue of (kind, args) tuples
+      cancel_event (Event): event set when the strategy is cancelled
+    '''
+
+    def __init__(self, events, cancel_event):
+
+        self._events = events
+        self._cancel_event = cancel_event
+
+        return
+
+    def set_module(self, sim_title, module_name):
+
+        self._events.put(("module", (sim_title, module_name)))
+
+        return
+
+    def add_record(self, record):
+
+        self._events.put(("profile", record))
+
+        return
+
+    def is_cancelled(self):
+
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+
+        '''Raise StrategyCancelled if cancellation has been requested'''
+
+        if not self.is_cancelled(): return
+
+        errStr = "Strategy cancelled"
+        raise StrategyCancelled(errStr)
+
+
+def init_worker(result_cache=None, events=None, cancel_event=None):
+
+    '''Build a single Core for the lifetime of a worker process, which
+    reuses module results from result_cache if given. If an events queue
+    and cancel event are given, the progress and profile records of the
+    worker are reported through them.'''
+
+    global _worker_core
+
+    _worker_core = CachedCore(result_cache)
+
+    if events is not None:
+        monitor = WorkerMonitor(events, cancel_event)
+        _worker_core.progress_monitor = monitor
+        _worker_core.profiler = ExecutionProfiler(monitor.add_record)
+
+    return
+
+
+def run_case(project_path, result_path, sim_title, var_values, core=None):
+
+    '''Execute a single simulation case in a worker process, or through the
+    given core.
+
+    Args:
+      project_path (str): path to the dumped base project
+      result_path (str): path to dump the executed project to
+      sim_title (str): title of the new simulation
+      var_values (list): (module name, variable id, value) records to set
+        before execution
+      core (Core, optional): core to execute the case with. Defaults to the
+        core of the worker process.
+
+    Returns:
+      tuple: (sim_title, result_path, error string or None). The result path
+        and error string are both None if the case was cancelled.
+    '''
+
+    if core is None: core = _worker_core
+    if core is None: core = CachedCore()
+
+    try:
+
+        project = core.load_project(project_path)
+        project.set_simulation_title(sim_title)
+
+        set_case_values(core, project, var_values)
+
+        basic = BasicStrategy()
+        basic.execute(core, project)
+
+        core.dump_project(project, result_path)
+
+    except StrategyCancelled:
+
+        return sim_title, None, None
+
+    except (KeyboardInterrupt, SystemExit):
+
+        raise
+
+    except:
+
+        return sim_title, None, traceback.format_exc()
+
+    return sim_title, result_path, None
+
+
+def set_case_values(core, project, var_values):
+
+    '''Set the (module name, variable id, value) records of a simulation
+    case in the active simulation of project'''
+
+    tree = Tree()
+
+    for module_name, var_id, value in var_values:
+
+        branch = tree.get_branch(core, project, module_name)
+        new_var = branch.get_input_variable(core, project, var_id)
+
+        if new_var is None:
+
+            errStr = ("Variable {} is not an input to module "
+                      "{}").format(var_id, module_name)
+            raise ValueError(errStr)
+
+        new_var.set_raw_interface(core, value)
+        new_var.read(core, project)
+
+    return
+
+
+def _run_case_args(args):
+
+    return run_case(*args)
+
+
+class ParallelExecutor(object):
+
+    '''Run a list of simulation cases using a pool of worker processes and
+    merge the completed simulations into the parent project. If a single
+    process is requested the cases are run sequentially in this process,
+    through the given core.
+
+    Args:
+      n_processes (int, optional): number of worker processes. Defaults to
+        the number of CPUs.
+    '''
+
+    def __init__(self, n_processes=None):
+
+        if n_processes is None: n_processes = multiprocessing.cpu_count()
+
+        if n_processes < 1:
+            errStr = "Number of processes must be greater than zero"
+            raise ValueError(errStr)
+
+        self._n_processes = n_processes
+
+        return
+
+    def execute(self, core, project, cases, checkpoint=None):
+
+        '''Execute the given cases and import the successful simulations into
+        project. The simulation which was active when this method was called
+        is not altered.
+
+        If a checkpoint is given, each completed simulation is recorded in it
+        and cases already completed in the checkpoint are imported without
+        being executed again. The checkpoint is removed once every case has
+        completed.
+
+        Args:
+          core (GUICore)
+          project (GUIProject)
+          cases (list): (sim_title, var_values) tuples, where var_values is a
+            list of (module name, variable id, value) records
+          checkpoint (StrategyCheckpoint, optional)
+
+        Returns:
+          list: titles of the imported simulations, in case order
+        '''
+
+        if not cases: return []
+
+        if project.get_active_index() is None:
+            errStr = "Project has not been activated."
+            raise RuntimeError(errStr)
+
+        if checkpoint is None:
+            completed = {}
+        else:
+            completed = checkpoint.get_completed()
+
+        if completed:
+
+            msgStr = ("Resuming strategy with {} of {} simulations "
+                      "complete").format(len(completed), len(cases))
+            module_logger.info(msgStr)
+
+        if self._n_processes < 2:
+
+            sim_titles = self._run_sequential(core,
+                                              project,
+                                              cases,
+                                              completed,
+                                              checkpoint)
+
+            if checkpoint is not None and len(sim_titles) == len(cases):
+                checkpoint.clear()
+
+            return sim_titles
+
+        # Dumped projects must not refer to the project's archive, which
+        # may be replaced by a later save
+        load_project_data(project)
+
+        work_dir = tempfile.mkdtemp()
+
+        try:
+
+            base_path = os.path.join(work_dir, "base.prj")
+            core.dump_project(project, base_path)
+
+            tasks = []
+
+            for i, (sim_title, var_values) in enumerate(cases):
+
+                if sim_title in completed: continue
+
+                if checkpoint is None:
+                    result_path = os.path.join(work_dir,
+                                               "simulation_{}.prj".format(i))
+                else:
+                    result_path = checkpoint.get_result_path(i)
+
+                tasks.append((base_path, result_path, sim_title, var_values))
+
+            sim_titles = self._run_tasks(core,
+                                         project,
+                                         cases,
+                                         tasks,
+                                         completed,
+                                         checkpoint)
+
+        finally:
+
+            shutil.rmtree(work_dir)
+
+        if checkpoint is not None and len(sim_titles) == len(cases):
+            checkpoint.clear()
+
+        return sim_titles
+
+    def _run_tasks(self, core, project, cases, tasks, completed, checkpoint):
+
+        n_processes = min(self._n_processes, len(tasks))
+        result_cache = getattr(core, "result_cache", None)
+        monitor = getattr(core, "progress_monitor", None)
+        profiler = getattr(core, "profiler", None)
+        cancelled = False
+        manager = None
+        pool = None
+
+        if n_processes > 1:
+
+            msgStr = ("Executing {} simulations using {} worker "
+                      "processes").format(len(tasks), n_processes)
+            module_logger.info(msgStr)
+
+            # Manager queues do not block the workers from exiting
+            manager = multiprocessing.Manager()
+            events = manager.Queue()
+            cancel_event = manager.Event()
+
+            pool = multiprocessing.Pool(n_processes,
+                                        init_worker,
+                                        (result_cache,
+                                         events,
+                                         cancel_event))
+            results = pool.imap(_run_case_args, tasks)
+
+        else:
+
+            # Run any remaining case through the caller's core, so that the
+            # worker core of this process is not replaced
+            results = (run_case(*x, core=core) for x in tasks)
+
+        sim_titles = []
+
+        if monitor is not None:
+            n_completed = sum(1 for x, _ in cases if x in completed)
+            monitor.start(len(cases), n_completed)
+
+        try:
+
+            # Walk the cases in order, taking completed simulations from the
+            # checkpoint and the rest from the results
+            for sim_title, _ in cases:
+
+                if sim_title in completed:
+
+                    result_path = completed[sim_title]
+                    error_str = None
+
+                else:
+
+                    # Stop between simulations if cancelled, keeping those
+                    # already merged
+                    if monitor is not None and monitor.is_cancelled():
+                        cancelled = True
+                        break
+
+                    if pool is None:
+                        _, result_path, error_str = next(results)
+                    else:
+                        _, result_path, error_str = self._wait_result(
+                                                                results,
+                                                                events,
+                                                                cancel_event,
+                                                                monitor,
+                                                                profiler)
+
+                    if result_path is None and error_str is None:
+                        cancelled = True
+                        break
+
+                    if monitor is not None:
+                        monitor.set_simulation_complete(sim_title)
+
+                if result_path is None:
+
+                    msgStr = ("Simulation '{}' failed with "
+                              "error:\n{}").format(sim_title, error_str)
+                    module_logger.error(msgStr)
+
+                    continue
+
+                if checkpoint is not None and sim_title not in completed:
+                    checkpoint.set_completed(sim_title, result_path)
+
+                self._merge_result(core, project, result_path, sim_title)
+                sim_titles.append(sim_title)
+
+            # Cancelled workers stop before their next module
+            if pool is not None and cancelled: cancel_event.set()
+            if pool is not None: pool.close()
+
+        except:
+
+            if pool is not None: pool.terminate()
+            raise
+
+        finally:
+
+            if pool is not None: pool.join()
+
+            if manager is not None:
+                _relay_events(events, monitor, profiler)
+                manager.shutdown()
+
+        if cancelled:
+
+            msgStr = ("Strategy cancelled with {} of {} simulations "
+                      "complete").format(len(sim_titles), len(cases))
+            module_logger.info(msgStr)
+
+        return sim_titles
+
+    def _wait_result(self, results,
+                           events,
+                           cancel_event,
+                           monitor,
+                           profiler):
+
+        '''Wait for the next result of the pool, passing the events of the
+        workers to the monitor and profiler and any cancellation to the
+        workers'''
+
+        while True:
+
+            _relay_events(events, monitor, profiler)
+
+            if monitor is not None and monitor.is_cancelled():
+                cancel_event.set()
+
+            try:
+                return results.next(EVENT_INTERVAL)
+            except multiprocessing.TimeoutError:
+                pass
+
+    def _run_sequential(self, core, project, cases, completed, checkpoint):
+
+        base_index = project.get_active_index()
+        monitor = getattr(core, "progress_monitor", None)
+        cancelled = False
+        sim_titles = []
+
+        if checkpoint is not None: load_project_data(project)
+
+        if monitor is not None:
+            n_completed = sum(1 for x, _ in cases if x in completed)
+            monitor.start(len(cases), n_completed)
+
+        for i, (sim_title, var_values) in enumerate(cases):
+
+            if sim_title in completed:
+
+                self._merge_result(core,
+                                   project,
+                                   completed[sim_title],
+                                   sim_title)
+                sim_titles.append(sim_title)
+
+                continue
+
+            msgStr = 'Executing simulation "{}"'.format(sim_title)
+            module_logger.info(msgStr)
+
+            core.clone_simulation(project,
+                                  title=sim_title,
+                                  sim_index=base_index)
+
+            try:
+
+                set_case_values(core, project, var_values)
+
+                basic = BasicStrategy()
+                basic.execute(core, project)
+
+            except StrategyCancelled:
+
+                # The unfinished simulation is run again on resume
+                core.remove_simulation(project,
+                                       sim_title=sim_title,
+                                       active_index=base_index)
+                cancelled = True
+
+                break
+
+            except (KeyboardInterrupt, SystemExit):
+
+                raise
+
+            except:
+
+                msgStr = ("Simulation '{}' failed with "
+                          "error:\n{}").format(sim_title,
+                                               traceback.format_exc())
+                module_logger.error(msgStr)
+
+                core.remove_simulation(project,
+                                       sim_title=sim_title,
+                                       active_index=base_index)
+
+                continue
+
+            project.set_active_index(index=base_index)
+
+            if checkpoint is not None:
+
+                result_path = checkpoint.get_result_path(i)
+                _dump_simulation(core, project, sim_title, result_path)
+                checkpoint.set_completed(sim_title, result_path)
+
+            sim_titles.append(sim_title)
+
+            msgStr = "Simulation '{}' complete".format(sim_title)
+            module_logger.info(msgStr)
+
+        if cancelled:
+
+            msgStr = ("Strategy cancelled with {} of {} simulations "
+                      "complete").format(len(sim_titles), len(cases))
+            module_logger.info(msgStr)
+
+        return sim_titles
+
+    def _merge_result(self, core, project, result_path, sim_title):
+
+        result_project = core.load_project(result_path)
+        core.import_simulation(result_project,
+                               project,
+                               sim_title,
+                               src_sim_title=sim_title)
+
+        msgStr = "Simulation '{}' complete".format(sim_title)
+        module_logger.info(msgStr)
+
+        return
+
+
+def _relay_events(events, monitor, profiler):
+
+    '''Pass the module events put on the queue by worker processes to the
+    monitor and their profile records to the profiler'''
+
+    while True:
+
+        try:
+            kind, args = events.get_nowait()
+        except Empty:
+            break
+
+        if kind == "module" and monitor is not None:
+            monitor.set_worker_module(*args)
+        elif kind == "profile" and profiler is not None:
+            profiler.add_record(args)
+
+    return
+
+
+def _dump_simulation(core, project, sim_title, dump_path):
+
+    '''Dump a project holding only the given simulation of project'''
+
+    result_project = GUIProject(sim_title)
+    core.import_simulation(project,
+                           result_project,
+                           sim_title,
+                           src_sim_title=sim_title)
+    core.dump_project(result_project, dump_path)
+
+    return
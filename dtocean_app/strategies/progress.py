@@ -0,0 +1,229 @@
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Progress reporting and cancellation of strategy runs.
+
+A StrategyMonitor is attached to the core while a strategy executes. The
+core reports each module or theme it connects and checks for cancellation
+before doing so, so a cancelled run stops once the current module has
+finished. Modules executed in worker processes are reported by the parent
+process as the workers start them, and simulations are counted as they are
+merged into the project.
+"""
+
+# Set up logging
+import logging
+
+module_logger = logging.getLogger(__name__)
+
+import time
+import threading
+
+
+class StrategyCancelled(KeyboardInterrupt):
+
+    '''Raised when a strategy is cancelled by the user. Strategies which
+    skip errors in their simulations still pass on KeyboardInterrupt, so the
+    cancellation is not mistaken for a failed simulation.'''
+
+    pass
+
+
+class StrategyMonitor(object):
+
+    '''Progress and cancellation state shared by a running strategy and the
+    GUI.
+
+    Args:
+      callback (function, optional): function called with the state
+        dictionary, as returned by get_state, whenever progress is made
+    '''
+
+    def __init__(self, callback=None):
+
+        self.callback = callback
+        self._cancel_event = threading.Event()
+        self._n_simulations = None
+        self._n_previous = 0
+        self._n_complete = 0
+        self._sim_title = None
+        self._module_name = None
+        self._start_time = None
+
+        return
+
+    def start(self, n_simulations=None, n_complete=0):
+
+        '''Start counting simulations.
+
+        Args:
+          n_simulations (int, optional): total number of simulations, if
+            known
+          n_complete (int, optional): number of simulations completed by an
+            earlier run, which are excluded from the time estimate
+        '''
+
+        self._n_simulations = n_simulations
+        self._n_previous = n_complete
+        self._n_complete = n_complete
+        self._sim_title = None
+        self._module_name = None
+        self._start_time = time.time()
+
+        self._notify()
+
+        return
+
+    def set_module(self, sim_title, module_name):
+
+        '''Record the start of a module or theme execution. A change of
+        simulation title marks the completion of the previous simulation.'''
+
+        if self._sim_title is not None and sim_title != self._sim_title:
+            self._n_complete += 1
+
+        self._sim_title = sim_title
+        self._module_name = module_name
+
+        self._notify()
+
+        return
+
+    def set_worker_module(self, sim_title, module_name):
+
+        '''Record the start of a module or theme execution in a worker
+        process. Workers run several simulations at once, so completions are
+        only counted by set_simulation_complete.'''
+
+        self._sim_title = sim_title
+        self._module_name = module_name
+
+        self._notify()
+
+        return
+
+    def set_simulation_complete(self, sim_title):
+
+        '''Record the completion of a simulation executed elsewhere'''
+
+        self._n_complete += 1
+        self._sim_title = sim_title
+        self._module_name = None
+
+        self._notify()
+
+        return
+
+    def get_eta(self):
+
+        '''Estimate the remaining time in seconds from the average time of
+        the simulations completed so far, or None if no estimate is
+        possible'''
+
+        if self._n_simulations is None or self._start_time is None:
+            return None
+
+        n_run = self._n_complete - self._n_previous
+        if n_run < 1: return None
+
+        n_remaining = max(self._n_simulations - self._n_complete, 0)
+        elapsed = time.time() - self._start_time
+
+        return elapsed / n_run * n_remaining
+
+    def get_state(self):
+
+        state = {"n_simulations": self._n_simulations,
+                 "n_complete": self._n_complete,
+                 "simulation": self._sim_title,
+                 "module": self._module_name,
+                 "eta": self.get_eta(),
+                 "cancelled": self.is_cancelled()}
+
+        return state
+
+    def cancel(self):
+
+        '''Request that the strategy stops after the current module'''
+
+        self._cancel_event.set()
+
+        module_logger.info("Strategy cancellation requested")
+
+        return
+
+    def is_cancelled(self):
+
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+
+        '''Raise StrategyCancelled if cancellation has been requested'''
+
+        if not self.is_cancelled(): return
+
+        errStr = "Strategy cancelled with {} simulations complete".format(
+                                                            self._n_complete)
+        raise StrategyCancelled(errStr)
+
+    def _notify(self):
+
+        if self.callback is None: return
+
+        self.callback(self.get_state())
+
+        return
+
+
+def format_progress(state):
+
+    '''Describe a StrategyMonitor state in text'''
+
+    n_simulations = state["n_simulations"]
+    n_complete = state["n_complete"]
+
+    if state["cancelled"]:
+
+        lines = ["Cancelling after the current module..."]
+
+    elif n_simulations is None:
+
+        lines = ["{} simulations complete".format(n_complete)]
+
+    elif state["module"] is None:
+
+        lines = ["{} of {} simulations complete".format(n_complete,
+                                                        n_simulations)]
+
+    else:
+
+        sim_number = min(n_complete + 1, n_simulations)
+        lines = ["Simulation {} of {}: {}".format(sim_number,
+                                                  n_simulations,
+                                                  state["simulation"]),
+                 "Executing {}".format(state["module"])]
+
+    if state["eta"] is not None:
+
+        minutes, seconds = divmod(int(round(state["eta"])), 60)
+        hours, minutes = divmod(minutes, 60)
+
+        lines.append("Estimated time remaining: {:d}:{:02d}:{:02d}".format(
+                                                                    hours,
+                                                                    minutes,
+                                                                    seconds))
+
+    return "\n".join(lines)
@@ -27,6 +27,7 @@ from aneris.utilities.misc import OrderedSet
 from dtocean_core.pipeline import Tree
 
 from . import GUIStrategy, StrategyWidget, PyQtABCMeta
+from .parallel import ParallelExecutor
 from ..utils.display import is_high_dpi
 
 if is_high_dpi():
@@ -65,6 +66,108 @@ class GUIUnitSensitivity(GUIStrategy, UnitSensitivity):
         '''
 
         return 2
+        
+    def configure(self, module_name,
+                        variable_name,
+                        variable_values,
+                        n_processes=1,
+                        checkpoint=False):
+        
+        """Configure the strategy. If n_processes is greater than one the
+        simulations are executed in a pool of worker processes. If
+        checkpoint is True, completed simulations are recorded so that an
+        interrupted run can be resumed."""
+        
+        UnitSensitivity.configure(self, module_name,
+                                        variable_name,
+                                        variable_values)
+        
+        self._config["n_processes"] = n_processes
+        self._config["checkpoint"] = checkpoint
+        
+        return
+        
+    @property
+    def allow_checkpoint(self):
+        
+        if self._config is None: return False
+        
+        return bool(self._config.get("checkpoint", False))
+    
+    def get_n_simulations(self, core, project):
+        
+        if self._config is None: return None
+        
+        return len(self._config["var_values"])
+        
+    def execute(self, core, project, checkpoint=None):
+        
+        """Execute the strategy. If a checkpoint is given, each completed
+        simulation is recorded in it and, if the checkpoint already exists,
+        its cases are resumed."""
+        
+        n_processes = 1
+        
+        if self._config is not None:
+            n_processes = self._config.get("n_processes", 1)
+            
+        if n_processes is None: n_processes = 1
+            
+        if checkpoint is None and n_processes < 2:
+            
+            UnitSensitivity.execute(self, core, project)
+            
+            return
+            
+        if checkpoint is not None and checkpoint.exists():
+            
+            cases = checkpoint.get_cases()
+            
+        else:
+            
+            cases = self._get_cases(core, project)
+            if checkpoint is not None: checkpoint.start(cases)
+        
+        executor = ParallelExecutor(n_processes)
+        sim_titles = executor.execute(core, project, cases, checkpoint)
+        
+        for sim_title in sim_titles:
+            self.add_simulation_title(sim_title)
+        
+        return
+        
+    def _get_cases(self, core, project):
+        
+        """Build the (title, variable values) records for each simulation"""
+        
+        module_name = self._config["module_name"]
+        variable_name = self._config["var_name"]
+        variable_values = self._config["var_values"]
+        
+        if module_name not in self._module_menu.get_active(core, project):
+            errStr = "Module {} has not been activated".format(module_name)
+            raise ValueError(errStr)
+            
+        unit_meta = core.get_metadata(variable_name)
+        
+        sim_titles = []
+        cases = []
+        
+        for unit_value in variable_values:
+            
+            new_title = self._get_title_str(unit_meta, unit_value)
+            
+            # Deal with identical titles
+            if new_title in sim_titles:
+                n_reps = sum((x.count(new_title) for x in sim_titles))
+                new_title = "{} [repeat {}]".format(new_title, n_reps)
+                
+            sim_titles.append(new_title)
+            
+            var_values = [(module_name, variable_name, unit_value)]
+            cases.append((new_title, var_values))
+            
+        return cases
     
     def get_widget(self, parent, shell):
         
@@ -221,10 +324,14 @@ class UnitSensitivityWidget(QtGui.QWidget,
         var_id = self._var_ids[var_name]
 
         var_values = self.string2types(str(self.lineEdit.text()))
+        n_processes = self.processSpinBox.value()
+        checkpoint = self.checkpointBox.isChecked()
                 
         conf_dict = {"module_name": mod_name,
                      "variable_name": var_id,
-                     "variable_values": var_values
+                     "variable_values": var_values,
+                     "n_processes": n_processes,
+                     "checkpoint": checkpoint
                      }
                 
         return conf_dict
@@ -236,6 +343,8 @@ class UnitSensitivityWidget(QtGui.QWidget,
         mod_name = config_dict["module_name"]
         var_id = config_dict["var_name"]
         var_values = config_dict["var_values"]
+        n_processes = config_dict.get("n_processes", 1)
+        checkpoint = config_dict.get("checkpoint", False)
 
         sane_var_values = [str(x) for x in var_values]
         var_values_str = ", ".join(sane_var_values)
@@ -263,6 +372,8 @@ class UnitSensitivityWidget(QtGui.QWidget,
             raise ValueError(errStr)
             
         self.lineEdit.setText(var_values_str)
+        self.processSpinBox.setValue(n_processes)
+        self.checkpointBox.setChecked(checkpoint)
         
         return
         
@@ -23,7 +23,7 @@ from dtocean_core.tools.constraints import ConstraintsTool, get_constraints
 from dtocean_electrical.output import plot_devices
 
 from . import GUITool
-from ..widgets.display import MPLWidget
+from ..widgets.display import MPLWidget, PLOT_LOCK
 
 
 class GUIConstraintsTool(GUITool, ConstraintsTool):
@@ -59,16 +59,17 @@ class GUIConstraintsTool(GUITool, ConstraintsTool):
         if self._elec is None or self._constrained_lines is None:
             return None
         
-        fig = plot_devices(self._elec.grid,
-                           self._constrained_lines,
-                           self._elec.array_data.layout,
-                           self._elec.array_data.landing_point,
-                           self._elec.array_data.device_footprint,
-                           [],
-                           [],
-                           [],
-                           []
-                           )
+        with PLOT_LOCK:
+            fig = plot_devices(self._elec.grid,
+                               self._constrained_lines,
+                               self._elec.array_data.layout,
+                               self._elec.array_data.landing_point,
+                               self._elec.array_data.device_footprint,
+                               [],
+                               [],
+                               [],
+                               []
+                               )
         widget = MPLWidget(fig, self.parent)
         
         return widget
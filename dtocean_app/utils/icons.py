@@ -59,3 +59,29 @@ def make_buttoncancel_pixmap():
 
     return pixmap
 
+_status_pixmaps = {"required": make_redicon_pixmap,
+                   "satisfied": make_greenicon_pixmap,
+                   "optional": make_blueicon_pixmap,
+                   "unavailable": make_buttoncancel_pixmap}
+_status_icons = {}
+
+def get_status_icon(status):
+
+    """Get the icon for a variable status, which is one of "required",
+    "satisfied", "optional" or "unavailable". Each icon is decoded once, at
+    the resolution chosen for the display, and shared by all callers."""
+
+    if status in _status_icons: return _status_icons[status]
+
+    if status not in _status_pixmaps:
+        errStr = "No icon is available for status '{}'".format(status)
+        raise KeyError(errStr)
+
+    icon = QtGui.QIcon()
+    icon.addPixmap(_status_pixmaps[status](),
+                   QtGui.QIcon.Normal,
+                   QtGui.QIcon.Off)
+
+    _status_icons[status] = icon
+
+    return icon
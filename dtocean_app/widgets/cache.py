@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cache of constructed data and plot widgets.
+
+Widgets are keyed by tuples starting with the simulation title and the
+variable id, followed by anything else which identifies the widget, such as
+the version of the variable's data. The least recently used widgets are
+disposed of once the cache is full.
+"""
+
+from collections import OrderedDict
+
+
+class WidgetCache(object):
+
+    '''Least recently used cache of widgets.
+
+    Args:
+      max_size (int, optional): maximum number of widgets to keep
+      dispose (function, optional): function called with each widget which
+        leaves the cache
+    '''
+
+    def __init__(self, max_size=10, dispose=None):
+
+        self.max_size = max_size
+        self._dispose = dispose
+        self._widgets = OrderedDict()
+
+        return
+
+    def get(self, key):
+
+        '''Get the widget for the given key, or None if it is not cached'''
+
+        if key not in self._widgets: return None
+
+        widget = self._widgets.pop(key)
+        self._widgets[key] = widget
+
+        return widget
+
+    def put(self, key, widget):
+
+        if key in self._widgets:
+
+            old_widget = self._widgets.pop(key)
+            if old_widget is not widget: self._discard(old_widget)
+
+        self._widgets[key] = widget
+
+        while len(self._widgets) > self.max_size:
+            _, old_widget = self._widgets.popitem(last=False)
+            self._discard(old_widget)
+
+        return
+
+    def has_widget(self, widget):
+
+        return any(widget is x for x in self._widgets.values())
+
+    def invalidate(self, var_ids=None):
+
+        '''Dispose of the widgets of the given variable ids, or all widgets
+        if var_ids is None'''
+
+        if var_ids is None:
+            keys = self._widgets.keys()
+        else:
+            keys = [key for key in self._widgets if key[1] in var_ids]
+
+        for key in keys:
+            self._discard(self._widgets.pop(key))
+
+        return
+
+    def clear(self):
+
+        self.invalidate()
+
+        return
+
+    def __len__(self):
+
+        return len(self._widgets)
+
+    def _discard(self, widget):
+
+        if self._dispose is not None: self._dispose(widget)
+
+        return
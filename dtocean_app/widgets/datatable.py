@@ -35,6 +35,8 @@ from dtocean_qt.views.CustomDelegates import createDelegate
 from dtocean_qt.views.DataTableView import DragTable
 from dtocean_qt.views._ui import icons_rc
 
+from .tablemodel import ArrayTableModel
+
 try:
     _fromUtf8 = QtCore.QString.fromUtf8
 except AttributeError:
@@ -193,8 +195,15 @@ class DataTableWidget(QtGui.QWidget):
                                        QtGui.QSizePolicy.Expanding)
         self.tableView.setSizePolicy(sizePolicy)
         
+        # Row filter for read only models
+        self.filterLineEdit = QtGui.QLineEdit(self)
+        self.filterLineEdit.setPlaceholderText(self.tr(u'Filter rows...'))
+        self.filterLineEdit.textChanged.connect(self.setFilter)
+        self.filterLineEdit.setVisible(False)
+        
         self.gridLayout.addWidget(self.buttonFrame, 0, 0, 1, 1)
-        self.gridLayout.addWidget(self.tableView, 1, 0, 1, 1)
+        self.gridLayout.addWidget(self.filterLineEdit, 1, 0, 1, 1)
+        self.gridLayout.addWidget(self.tableView, 2, 0, 1, 1)
         
         return
 
@@ -221,6 +230,10 @@ class DataTableWidget(QtGui.QWidget):
         """
         
         model = self.tableView.model()
+        
+        # Large tables are shown read only until editing starts
+        if enabled and isinstance(model, ArrayTableModel):
+            model = self._set_editable_model(model)
 
         if model is not None:
             model.enableEditing(enabled)
@@ -234,6 +247,22 @@ class DataTableWidget(QtGui.QWidget):
                 
         return
 
+    @Slot(str)
+    def setFilter(self, text):
+        """Show only the rows containing the given text, if the model is
+        read only.
+
+        This method is also a slot.
+
+        """
+        
+        model = self.tableView.model()
+        
+        if isinstance(model, ArrayTableModel):
+            model.set_filter(text)
+            
+        return
+
     @Slot()
     def uncheckButton(self):
         """Removes the checked stated of all buttons in this widget.
@@ -376,6 +405,7 @@ class DataTableWidget(QtGui.QWidget):
         if isinstance(model, DataFrameModel):
             self.enableEditing(False)
             self.uncheckButton()
+            self._set_filter_visible(False)
             
             selectionModel = self.tableView.selectionModel()
             self.tableView.setModel(model)
@@ -383,6 +413,15 @@ class DataTableWidget(QtGui.QWidget):
             model.dataChanged.connect(self.updateDelegates)
             del selectionModel
             
+        elif isinstance(model, ArrayTableModel):
+            self.enableEditing(False)
+            self.uncheckButton()
+            self._set_filter_visible(True)
+            
+            selectionModel = self.tableView.selectionModel()
+            self.tableView.setModel(model)
+            del selectionModel
+            
     def setModel(self, model):
         """Sets the model for the enclosed TableView in this widget.
 
@@ -438,5 +477,33 @@ class DataTableWidget(QtGui.QWidget):
     def selectionModel(self):
         """return the table views selectionModel"""
         return self.view().selectionModel()
+        
+    def _set_filter_visible(self, visible):
+        
+        self.filterLineEdit.blockSignals(True)
+        self.filterLineEdit.clear()
+        self.filterLineEdit.blockSignals(False)
+        self.filterLineEdit.setVisible(visible)
+        
+        return
+        
+    def _set_editable_model(self, model):
+        """Replace a read only model with a DataFrameModel holding the same
+        DataFrame, so that it can be edited.
+
+        """
+        
+        editable_model = DataFrameModel()
+        self._set_filter_visible(False)
+        
+        selectionModel = self.tableView.selectionModel()
+        self.tableView.setModel(editable_model)
+        editable_model.dtypeChanged.connect(self.updateDelegate)
+        editable_model.dataChanged.connect(self.updateDelegates)
+        del selectionModel
+        
+        editable_model.setDataFrame(model.dataFrame())
+        
+        return editable_model
 
 
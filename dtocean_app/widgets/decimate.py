@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Level of detail for line plots with many samples.
+
+A line with many more samples than its axes have pixel columns is drawn
+with only the first, last, minimum and maximum samples of each column. This
+gives the same picture, but the cost of drawing depends on the width of the
+axes rather than on the number of samples. The full data is kept, and the
+samples drawn are chosen again when the axes are zoomed, panned or resized.
+"""
+
+import numpy as np
+
+MIN_SAMPLES = 10000
+
+
+class LineDecimator(object):
+
+    '''Keeps the full data of a Line2D and sets the samples it draws for the
+    current view of its axes.
+
+    Args:
+      line (matplotlib.lines.Line2D): line with x values in ascending order
+    '''
+
+    def __init__(self, line):
+
+        self.line = line
+        self._x_orig = line.get_xdata(orig=True)
+        self._y_orig = line.get_ydata(orig=True)
+        self._x = np.array(line.get_xydata()[:, 0])
+        self._y = np.array(line.get_xydata()[:, 1])
+        self._n_bins = None
+        self._xlim = None
+
+        return
+
+    def update(self):
+
+        '''Set the samples drawn by the line, if the view or width of its
+        axes has changed'''
+
+        axes = self.line.axes
+        if axes is None: return
+
+        xlim = tuple(sorted(axes.get_xlim()))
+        n_bins = max(int(np.ceil(axes.get_window_extent().width)), 1)
+
+        if xlim == self._xlim and n_bins == self._n_bins: return
+
+        self._xlim = xlim
+        self._n_bins = n_bins
+
+        idx = get_envelope_indices(self._x, self._y, xlim[0], xlim[1], n_bins)
+
+        self.line.set_data(_take(self._x_orig, idx),
+                           _take(self._y_orig, idx))
+
+        return
+
+    def get_n_samples(self):
+
+        return len(self._x)
+
+
+def get_envelope_indices(x, y, x_min, x_max, n_bins):
+
+    '''Get the indices of the samples needed to draw a line with n_bins
+    pixel columns between x_min and x_max. These are the first, last,
+    minimum and maximum samples in each column, and the samples either side
+    of the view, so the line continues to its edges.
+
+    Args:
+      x (numpy.ndarray): x values in ascending order
+      y (numpy.ndarray): y values
+      x_min (float): left edge of the view
+      x_max (float): right edge of the view
+      n_bins (int): number of pixel columns
+
+    Returns:
+      numpy.ndarray: sample indices in ascending order
+    '''
+
+    start = max(np.searchsorted(x, x_min, "left") - 1, 0)
+    stop = min(np.searchsorted(x, x_max, "right") + 1, len(x))
+
+    n_samples = stop - start
+
+    if n_samples <= 4 * n_bins or x_max <= x_min:
+        return np.arange(start, stop)
+
+    x_view = x[start:stop]
+    y_view = y[start:stop]
+
+    bins = np.floor((x_view - x_min) / (x_max - x_min) * n_bins)
+    bins = np.clip(bins, -1, n_bins).astype(int)
+
+    # The bins ascend with x, so each occupies a contiguous block
+    firsts = np.r_[0, np.flatnonzero(np.diff(bins)) + 1]
+    lasts = np.r_[firsts[1:], n_samples] - 1
+
+    # Missing values are never chosen as a minimum or maximum, unless the
+    # whole column is missing
+    y_low = np.where(np.isnan(y_view), np.inf, y_view)
+    y_high = np.where(np.isnan(y_view), -np.inf, y_view)
+
+    mins = np.lexsort((y_low, bins))[firsts]
+    maxs = np.lexsort((y_high, bins))[lasts]
+
+    idx = np.unique(np.concatenate([firsts, lasts, mins, maxs]))
+
+    return idx + start
+
+
+def decimate_figure(figure, min_samples=MIN_SAMPLES):
+
+    '''Add level of detail to the lines of a figure which have at least
+    min_samples samples, ascending x values and no markers. The samples
+    drawn are updated when the x limits of their axes change.
+
+    Returns:
+      list: the LineDecimator objects added
+    '''
+
+    decimators = []
+
+    for axes in figure.axes:
+
+        lines = [line for line in axes.get_lines()
+                                        if _is_decimatable(line, min_samples)]
+
+        if not lines: continue
+
+        axes_decimators = [LineDecimator(line) for line in lines]
+
+        # The decimators are kept alive by their lines
+        for line, decimator in zip(lines, axes_decimators):
+            line._decimator = decimator
+
+        axes.callbacks.connect("xlim_changed", _update_axes)
+        _update_axes(axes)
+
+        decimators.extend(axes_decimators)
+
+    return decimators
+
+
+def update_figure(figure):
+
+    '''Update the lines of a figure after it has been resized'''
+
+    for axes in figure.axes:
+        _update_axes(axes)
+
+    return
+
+
+def _update_axes(axes):
+
+    for line in axes.get_lines():
+
+        decimator = getattr(line, "_decimator", None)
+        if decimator is not None: decimator.update()
+
+    return
+
+
+def _is_decimatable(line, min_samples):
+
+    if getattr(line, "_decimator", None) is not None: return False
+    if line.get_marker() not in (None, "", " ", "None"): return False
+
+    x = line.get_xydata()[:, 0]
+
+    if len(x) < min_samples: return False
+
+    return bool(np.all(np.diff(x) >= 0))
+
+
+def _take(values, idx):
+
+    if not hasattr(values, "take"): values = np.asarray(values)
+
+    return values.take(idx)
@@ -545,6 +545,7 @@ class ListFrameEditor(QtGui.QDialog, Ui_ListFrameEditor):
 class ProgressBar(QtGui.QDialog, Ui_ProgressBar):
     
     force_quit = QtCore.pyqtSignal()
+    cancel_requested = QtCore.pyqtSignal()
     
     def __init__(self, parent=None, allow_close=False):
         
@@ -552,6 +553,10 @@ class ProgressBar(QtGui.QDialog, Ui_ProgressBar):
         self.setupUi(self)
         
         self.allow_close = allow_close
+        self._default_message = self.label.text()
+        
+        self.cancelButton.clicked.connect(self._request_cancel)
+        self.cancelButton.setVisible(False)
                 
         return
         
@@ -561,6 +566,42 @@ class ProgressBar(QtGui.QDialog, Ui_ProgressBar):
         
         return
         
+    def set_progress(self, value, maximum):
+        
+        self.progressBar.setRange(0, maximum)
+        self.progressBar.setValue(value)
+        
+        return
+        
+    def set_message(self, message):
+        
+        self.label.setText(message)
+        
+        return
+        
+    def set_cancellable(self, cancellable):
+        
+        self.cancelButton.setEnabled(True)
+        self.cancelButton.setVisible(cancellable)
+        
+        return
+        
+    def reset(self):
+        
+        self.set_message(self._default_message)
+        self.set_cancellable(False)
+        self.set_pulsing()
+        
+        return
+        
+    @QtCore.pyqtSlot()
+    def _request_cancel(self):
+        
+        self.cancelButton.setDisabled(True)
+        self.cancel_requested.emit()
+        
+        return
+        
     def closeEvent(self, event):
         
         if self.allow_close:
@@ -24,13 +24,25 @@ Created on Thu Apr 23 12:51:14 2015
 from __future__ import unicode_literals
 
 import os
+import threading
 
+import numpy as np
 from PyQt4 import QtGui, QtCore
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_qt4agg import (
-                                        FigureCanvasQTAgg as FigureCanvas)
+                                        FigureCanvasQTAgg as FigureCanvas,
+                                        NavigationToolbar2QT)
 import matplotlib.pyplot as plt
 plt.style.use('ggplot')
 
+from .decimate import update_figure
+
+# Serialises the use of pyplot's global state, such as the current figure
+PLOT_LOCK = threading.RLock()
+
+# Delay, in milliseconds, before a resized plot image is drawn again
+RENDER_DELAY = 250
+
 module_path = os.path.realpath(__file__)
 test_image_path = os.path.join(module_path, '..', 'test_images')
 
@@ -137,9 +149,235 @@ class MPLWidget(FigureCanvas):
                                    QtGui.QSizePolicy.Expanding)
         FigureCanvas.updateGeometry(self)
 
+        # Choose the samples of decimated lines for the new width
+        self.mpl_connect("resize_event",
+                         lambda event: update_figure(self.figure))
+
+        return
+
+
+class PlotImageWidget(QtGui.QWidget):
+
+    """Rendered image of a figure, which is replaced by an interactive canvas
+    when the user asks to zoom or pan"""
+
+    def __init__(self, figure, image, parent=None):
+
+        super(PlotImageWidget, self).__init__(parent)
+        self.figure = figure
+        self._image = image
+        self._image_label = None
+        self._interact_button = None
+        self._canvas = None
+        self._render_timer = None
+
+        self._init_ui()
+
+        return
+
+    def _init_ui(self):
+
+        self._image_label = ImageLabel(self)
+        self._image_label._pixmap = QtGui.QPixmap.fromImage(self._image)
+        self._image_label.setSizePolicy(QtGui.QSizePolicy.Ignored,
+                                        QtGui.QSizePolicy.Ignored)
+
+        self._interact_button = QtGui.QPushButton("Zoom / Pan", self)
+        self._interact_button.clicked.connect(self._set_interactive)
+
+        button_layout = QtGui.QHBoxLayout()
+        button_layout.addStretch(1)
+        button_layout.addWidget(self._interact_button)
+
+        layout = QtGui.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._image_label)
+        layout.addLayout(button_layout)
+
+        self.setSizePolicy(QtGui.QSizePolicy.Expanding,
+                           QtGui.QSizePolicy.Expanding)
+
+        # Draw the image again once resizing pauses
+        self._render_timer = QtCore.QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(RENDER_DELAY)
+        self._render_timer.timeout.connect(self._render)
+
+        return
+
+    def is_interactive(self):
+
+        return self._canvas is not None
+
+    def resizeEvent(self, event):
+
+        super(PlotImageWidget, self).resizeEvent(event)
+        if self._image_label is not None: self._render_timer.start()
+
+        return
+
+    @QtCore.pyqtSlot()
+    def _render(self):
+
+        """Draw the figure at the size and pixel ratio of the image label"""
+
+        if self._image_label is None: return
+
+        size = self._image_label.size()
+        if size.width() < 1 or size.height() < 1: return
+
+        pixel_ratio = get_pixel_ratio(self)
+        target_size = (int(size.width() * pixel_ratio),
+                       int(size.height() * pixel_ratio))
+
+        if (self._image is not None and
+            (self._image.width(), self._image.height()) == target_size):
+            return
+
+        # Try again later if a plot is being drawn in the background
+        if not PLOT_LOCK.acquire(False):
+            self._render_timer.start()
+            return
+
+        try:
+            self._image = render_figure(self.figure,
+                                        (size.width(), size.height()),
+                                        pixel_ratio)
+        finally:
+            PLOT_LOCK.release()
+
+        self._image_label._pixmap = QtGui.QPixmap.fromImage(self._image)
+        self._image_label.update()
+
+        return
+
+    @QtCore.pyqtSlot()
+    def _set_interactive(self):
+
+        if self._canvas is not None: return
+
+        layout = self.layout()
+
+        # Replace the image with a canvas and navigation toolbar
+        for widget in (self._image_label, self._interact_button):
+            widget.setParent(None)
+            widget.deleteLater()
+
+        self._image_label = None
+        self._interact_button = None
+        self._image = None
+        self._render_timer.stop()
+
+        self._canvas = MPLWidget(self.figure, self)
+        toolbar = NavigationToolbar2QT(self._canvas, self)
+
+        layout.addWidget(toolbar)
+        layout.addWidget(self._canvas)
+
+        self._canvas.draw_idle()
+
+        return
+
+
+class PlaceholderWidget(QtGui.QLabel):
+
+    """Label shown in place of a widget which is being prepared"""
+
+    def __init__(self, text="Loading...", parent=None):
+
+        super(PlaceholderWidget, self).__init__(text, parent)
+        self.setAlignment(QtCore.Qt.AlignCenter)
+        self.setSizePolicy(QtGui.QSizePolicy.Expanding,
+                           QtGui.QSizePolicy.Expanding)
+
         return
         
         
+def get_pixel_ratio(widget):
+
+    """Get the ratio of device pixels to logical pixels of a widget. This is
+    always 1 with Qt 4, which has no high DPI scaling."""
+
+    if not hasattr(widget, "devicePixelRatio"): return 1
+
+    return widget.devicePixelRatio()
+
+
+def render_figure(figure, size=None, pixel_ratio=1):
+
+    """Draw a figure with the Agg renderer and return the result as a QImage.
+    If size, the (width, height) in pixels of the target widget, is given
+    the figure is resized to fill it. The figure is drawn at pixel_ratio
+    times its resolution, for high DPI screens. QImages, unlike QPixmaps,
+    can be made outside of the GUI thread."""
+
+    dpi = figure.get_dpi()
+
+    if size is not None:
+
+        width, height = size
+        figure.set_size_inches(max(width, 1) / float(dpi),
+                               max(height, 1) / float(dpi))
+
+        # Choose the samples of decimated lines for the new width
+        update_figure(figure)
+
+    canvas = FigureCanvasAgg(figure)
+
+    if pixel_ratio != 1: figure.set_dpi(dpi * pixel_ratio)
+
+    try:
+        canvas.draw()
+        width, height = canvas.get_width_height()
+        rgba = np.frombuffer(canvas.buffer_rgba(), dtype=np.uint8)
+    finally:
+        if pixel_ratio != 1: figure.set_dpi(dpi)
+
+    rgba = rgba.reshape((height, width, 4))
+
+    # QImage.Format_ARGB32 is stored as BGRA on little endian machines
+    bgra = np.ascontiguousarray(rgba[:, :, [2, 1, 0, 3]])
+
+    data = bgra.tostring()
+    image = QtGui.QImage(data,
+                         width,
+                         height,
+                         width * 4,
+                         QtGui.QImage.Format_ARGB32)
+
+    # Copy the image out of the array
+    image = image.copy()
+
+    if hasattr(image, "setDevicePixelRatio"):
+        image.setDevicePixelRatio(pixel_ratio)
+
+    return image
+
+
+def set_current_figure(figure):
+
+    """Make the figure pyplot's current figure, so that it is saved by
+    save_current_figure"""
+
+    fignum = getattr(figure, "number", None)
+
+    with PLOT_LOCK:
+        if fignum is not None and plt.fignum_exists(fignum):
+            plt.figure(fignum)
+
+    return
+
+
+def close_figure(figure):
+
+    """Close a figure, given the figure or its number"""
+
+    with PLOT_LOCK:
+        plt.close(figure)
+
+    return
+
+
 def get_current_filetypes():
     
     fig = plt.gcf()
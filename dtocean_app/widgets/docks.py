@@ -21,6 +21,8 @@ Created on Thu Apr 23 12:51:14 2015
 @author: Mathew Topper
 """
 
+from collections import deque
+
 from PyQt4 import QtCore, QtGui
 
 from ..utils.display import is_high_dpi
@@ -112,12 +114,23 @@ class ListDock(QtGui.QDockWidget, Ui_ListDock):
 
 
 class LogDock(QtGui.QDockWidget, Ui_SystemDock):
+    
+    """Console of log messages. Messages are held in a ring buffer and
+    written to the console in batches every interval milliseconds. If more
+    than max_buffer messages arrive between batches the oldest are dropped
+    and the number of lines lost is written in their place. Only the last
+    max_lines lines are kept in the console."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, interval=100, max_buffer=1000, max_lines=5000):
     
         QtGui.QDockWidget.__init__(self, "Dockable", parent)
         Ui_SystemDock.__init__(self)
         
+        self._interval = interval
+        self._buffer = deque(maxlen=max_buffer)
+        self._n_dropped = 0
+        self._max_lines = max_lines
+        
         self._init_ui()
         
         self._close_filter = DockCloseFilter(self)
@@ -137,12 +150,17 @@ class LogDock(QtGui.QDockWidget, Ui_SystemDock):
         
         self._console = QtGui.QTextBrowser(self)
         self._console.setPalette(pal)
+        self._console.document().setMaximumBlockCount(self._max_lines)
 
         self._layout = QtGui.QVBoxLayout()
         self._layout.setSpacing(2)
         self._layout.setMargin(2)
         self._layout.addWidget(self._console)
         self.verticalLayout.addLayout(self._layout)
+        
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
 
         XStream.stdout().messageWritten.connect(self._add_text)
         XStream.stderr().messageWritten.connect(self._add_text)
@@ -153,8 +171,284 @@ class LogDock(QtGui.QDockWidget, Ui_SystemDock):
     def _add_text(self, arg1):
         """ C++: void _add_text(QString) """
         
-        self._console.insertPlainText(arg1)
+        # Count the lines of the oldest message if it is pushed out
+        if len(self._buffer) == self._buffer.maxlen:
+            self._n_dropped += self._buffer[0].count("\n")
+        
+        self._buffer.append(unicode(arg1))
+        
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(self._interval)
+        
+        return
+    
+    @QtCore.pyqtSlot()
+    def _flush(self):
+        
+        if not self._buffer and not self._n_dropped: return
+        
+        text = u"".join(self._buffer)
+        self._buffer.clear()
+        
+        if self._n_dropped:
+            
+            text = u"[... {} lines dropped ...]\n{}".format(self._n_dropped,
+                                                            text)
+            self._n_dropped = 0
+        
+        self._console.moveCursor(QtGui.QTextCursor.End)
+        self._console.insertPlainText(text)
         self._console.moveCursor(QtGui.QTextCursor.End)
         
         return
 
+
+
+class ProfileDock(QtGui.QDockWidget):
+    
+    '''Table of the wall time, process CPU time and peak memory of module and
+    theme executions, recorded by an ExecutionProfiler. Executions in
+    strategy worker processes are measured in the worker process.'''
+    
+    _headers = ["Simulation",
+                "Name",
+                "Type",
+                "Wall Time (s)",
+                "Process CPU Time (s)",
+                "Peak RSS (MB)"]
+
+    def __init__(self, parent, profiler):
+    
+        QtGui.QDockWidget.__init__(self, "Dockable", parent)
+        self._profiler = profiler
+        
+        self._init_ui()
+        
+        self._close_filter = DockCloseFilter(self)
+        self.installEventFilter(self._close_filter)
+        
+        return
+        
+    def _init_ui(self):
+        
+        self.setWindowTitle("Profile")
+        self.setObjectName("ProfileDock")
+        
+        self._table = QtGui.QTableWidget(0, len(self._headers), self)
+        self._table.setHorizontalHeaderLabels(self._headers)
+        self._table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        self._table.setSortingEnabled(True)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setStretchLastSection(True)
+        
+        self._export_button = QtGui.QPushButton("Export...", self)
+        self._export_button.clicked.connect(self._export)
+        self._clear_button = QtGui.QPushButton("Clear", self)
+        self._clear_button.clicked.connect(self._clear)
+        
+        button_layout = QtGui.QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(self._export_button)
+        button_layout.addWidget(self._clear_button)
+        
+        layout = QtGui.QVBoxLayout()
+        layout.setSpacing(2)
+        layout.setMargin(2)
+        layout.addWidget(self._table)
+        layout.addLayout(button_layout)
+        
+        contents = QtGui.QWidget(self)
+        contents.setLayout(layout)
+        self.setWidget(contents)
+        
+        for record in self._profiler.get_records():
+            self._add_record(record)
+        
+        return
+    
+    @QtCore.pyqtSlot(object)
+    def _add_record(self, record):
+        
+        if record["peak_rss"] is None:
+            peak_rss = None
+        else:
+            peak_rss = record["peak_rss"] / 1024. ** 2
+        
+        values = [record["simulation"],
+                  record["name"],
+                  record["kind"].capitalize(),
+                  record["wall_time"],
+                  record["process_cpu_time"],
+                  peak_rss]
+        
+        # Disable sorting while the row is filled
+        self._table.setSortingEnabled(False)
+        
+        row = self._table.rowCount()
+        self._table.insertRow(row)
+        
+        for column, value in enumerate(values):
+            
+            item = QtGui.QTableWidgetItem()
+            
+            if isinstance(value, float):
+                item.setData(QtCore.Qt.DisplayRole, round(value, 2))
+                item.setTextAlignment(QtCore.Qt.AlignRight |
+                                      QtCore.Qt.AlignVCenter)
+            elif value is not None:
+                item.setText(str(value))
+            
+            self._table.setItem(row, column, item)
+        
+        self._table.setSortingEnabled(True)
+        
+        return
+    
+    @QtCore.pyqtSlot()
+    def _export(self):
+        
+        msg = "Export Profile"
+        valid_exts = "comma-separated values (*.csv);;JSON (*.json)"
+        
+        file_path = QtGui.QFileDialog.getSaveFileName(None,
+                                                      msg,
+                                                      '.',
+                                                      valid_exts)
+        
+        if not file_path: return
+        
+        file_path = str(file_path)
+        
+        if file_path.lower().endswith(".json"):
+            self._profiler.to_json(file_path)
+        else:
+            self._profiler.to_csv(file_path)
+        
+        return
+    
+    @QtCore.pyqtSlot()
+    def _clear(self):
+        
+        self._profiler.clear()
+        self._table.setRowCount(0)
+        
+        return
+
+
+class JobDock(QtGui.QDockWidget):
+    
+    '''Table of the pending, running and completed jobs of a JobQueue'''
+    
+    _headers = ["Job",
+                "State",
+                "Priority",
+                "Time (s)"]
+
+    def __init__(self, parent, job_queue):
+    
+        QtGui.QDockWidget.__init__(self, "Dockable", parent)
+        self._job_queue = job_queue
+        self._jobs = []
+        self._timer = None
+        
+        self._init_ui()
+        
+        self._close_filter = DockCloseFilter(self)
+        self.installEventFilter(self._close_filter)
+        
+        return
+        
+    def _init_ui(self):
+        
+        self.setWindowTitle("Jobs")
+        self.setObjectName("JobDock")
+        
+        self._table = QtGui.QTableWidget(0, len(self._headers), self)
+        self._table.setHorizontalHeaderLabels(self._headers)
+        self._table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        self._table.setSelectionBehavior(QtGui.QAbstractItemView.SelectRows)
+        self._table.setSelectionMode(
+                                QtGui.QAbstractItemView.SingleSelection)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setStretchLastSection(True)
+        
+        self._cancel_button = QtGui.QPushButton("Cancel Job", self)
+        self._cancel_button.clicked.connect(self._cancel_selected)
+        self._clear_button = QtGui.QPushButton("Clear Finished", self)
+        self._clear_button.clicked.connect(self._clear_history)
+        
+        button_layout = QtGui.QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(self._cancel_button)
+        button_layout.addWidget(self._clear_button)
+        
+        layout = QtGui.QVBoxLayout()
+        layout.setSpacing(2)
+        layout.setMargin(2)
+        layout.addWidget(self._table)
+        layout.addLayout(button_layout)
+        
+        contents = QtGui.QWidget(self)
+        contents.setLayout(layout)
+        self.setWidget(contents)
+        
+        # Update the running times once a second
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self._update_jobs)
+        
+        self._job_queue.job_added.connect(self._update_jobs)
+        self._job_queue.job_started.connect(self._update_jobs)
+        self._job_queue.job_started.connect(lambda: self._timer.start())
+        self._job_queue.job_finished.connect(self._update_jobs)
+        self._job_queue.queue_empty.connect(self._timer.stop)
+        
+        self._update_jobs()
+        
+        return
+    
+    @QtCore.pyqtSlot()
+    def _update_jobs(self):
+        
+        self._jobs = self._job_queue.get_jobs()
+        self._table.setRowCount(len(self._jobs))
+        
+        for row, job in enumerate(self._jobs):
+            
+            elapsed = job.get_elapsed()
+            
+            if elapsed is None:
+                elapsed_str = ""
+            else:
+                elapsed_str = "{:.1f}".format(elapsed)
+            
+            values = [job.name,
+                      job.state,
+                      str(job.priority),
+                      elapsed_str]
+            
+            for column, value in enumerate(values):
+                
+                item = QtGui.QTableWidgetItem(value)
+                self._table.setItem(row, column, item)
+        
+        return
+    
+    @QtCore.pyqtSlot()
+    def _cancel_selected(self):
+        
+        row = self._table.currentRow()
+        
+        if row < 0 or row >= len(self._jobs): return
+        
+        self._job_queue.cancel(self._jobs[row])
+        
+        return
+    
+    @QtCore.pyqtSlot()
+    def _clear_history(self):
+        
+        self._job_queue.clear_history()
+        self._update_jobs()
+        
+        return
@@ -35,6 +35,7 @@ except AttributeError:
         return s
 
 from .datatable import DataTableWidget
+from .tablemodel import ArrayTableModel, CHUNK_SIZE
 from ..utils.display import is_high_dpi
 
 from .scientificselect import Ui_ScientificSelect
@@ -706,23 +707,31 @@ class InputDataTable(QtGui.QWidget):
         return
 
     def _set_value(self, value, dtypes=None):
-                
-        # setup a new empty model
-        model = DataFrameModel()
+        
+        data = self._get_dataframe(value, dtypes)
         
         # Modify the appearance and function of the table if fixed rows are
         # required.
         if (self._fixed_index_col is not None and
             self._fixed_index_names is not None):
             
+            model = DataFrameModel()
             model.freeze_first = True
             self.datatable.hideVerticalHeader(True)
+        
+        # Large tables are read on demand until they are edited
+        elif len(data) > CHUNK_SIZE:
+            
+            model = ArrayTableModel()
+            
+        else:
+            
+            model = DataFrameModel()
 
         # set table view widget model
         self.datatable.setViewModel(model)
         
         # fill the model with data
-        data = self._get_dataframe(value, dtypes)
         model.setDataFrame(data)
         
         return
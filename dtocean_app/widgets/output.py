@@ -24,7 +24,6 @@ Created on Thu Apr 23 12:51:14 2015
 import pandas as pd
 
 from PyQt4 import QtCore, QtGui
-from dtocean_qt.models.DataFrameModel import DataFrameModel
 
 try:
     _fromUtf8 = QtCore.QString.fromUtf8
@@ -33,6 +32,7 @@ except AttributeError:
         return s
 
 from .datatable import DataTableWidget
+from .tablemodel import ArrayTableModel
 from ..utils.display import is_high_dpi
 
 if is_high_dpi():
@@ -143,8 +143,8 @@ class OutputDataTable(QtGui.QWidget):
                 
             new_cols.append(new_col)
                     
-        # setup a new empty model
-        model = DataFrameModel()
+        # setup a new empty model, which reads the data on demand
+        model = ArrayTableModel()
         
         # set table view widget model
         self.datatable.setViewModel(model)
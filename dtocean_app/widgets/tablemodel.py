@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2016 Mathew Topper, Rui Duarte
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Read only table model for large DataFrames.
+
+The columns of the DataFrame are held as NumPy arrays, which are views of the
+DataFrame's data where possible, and cells are read from them on request.
+Rows are made available to the view in blocks as it scrolls. Sorting and
+filtering produce an array of row positions, so the data itself is never
+reordered or copied.
+"""
+
+import numpy as np
+import pandas as pd
+
+from PyQt4 import QtCore
+
+CHUNK_SIZE = 1000
+
+
+class ArrayTableModel(QtCore.QAbstractTableModel):
+
+    '''Table model serving the rows of a DataFrame on demand.
+
+    Args:
+      chunk_size (int, optional): number of rows added to the view each
+        time it requests more
+    '''
+
+    def __init__(self, parent=None, chunk_size=CHUNK_SIZE):
+
+        super(ArrayTableModel, self).__init__(parent)
+
+        self.chunk_size = chunk_size
+        self._frame = pd.DataFrame()
+        self._arrays = []
+        self._strings = {}
+        self._rows = np.arange(0)
+        self._n_loaded = 0
+        self._sort_column = None
+        self._sort_order = QtCore.Qt.AscendingOrder
+        self._filter_text = ""
+
+        return
+
+    def setDataFrame(self, frame):
+
+        self.beginResetModel()
+
+        self._frame = frame
+        self._arrays = [frame.iloc[:, i].values
+                                        for i in range(len(frame.columns))]
+        self._strings = {}
+        self._rows = np.arange(len(frame))
+        self._sort_column = None
+        self._filter_text = ""
+        self._n_loaded = min(self.chunk_size, len(self._rows))
+
+        self.endResetModel()
+
+        return
+
+    def dataFrame(self):
+
+        return self._frame
+
+    def enableEditing(self, enabled):
+
+        '''The model is read only. Editable widgets replace it with a
+        DataFrameModel instead.'''
+
+        return
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+
+        if parent.isValid(): return 0
+
+        return self._n_loaded
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+
+        if parent.isValid(): return 0
+
+        return len(self._arrays)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+
+        if parent.isValid(): return False
+
+        return self._n_loaded < len(self._rows)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+
+        if parent.isValid(): return
+
+        n_new = min(self.chunk_size, len(self._rows) - self._n_loaded)
+        if n_new <= 0: return
+
+        self.beginInsertRows(QtCore.QModelIndex(),
+                             self._n_loaded,
+                             self._n_loaded + n_new - 1)
+        self._n_loaded += n_new
+        self.endInsertRows()
+
+        return
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+
+        if (not index.isValid() or
+            role not in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole)):
+            return QtCore.QVariant()
+
+        row = self._rows[index.row()]
+        value = _get_display_value(self._arrays[index.column()][row])
+
+        if value is None: return QtCore.QVariant()
+
+        return QtCore.QVariant(value)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+
+        if role != QtCore.Qt.DisplayRole:
+            return QtCore.QAbstractTableModel.headerData(self,
+                                                         section,
+                                                         orientation,
+                                                         role)
+
+        if orientation == QtCore.Qt.Horizontal:
+            return str(self._frame.columns[section])
+
+        return str(self._frame.index[self._rows[section]])
+
+    def flags(self, index):
+
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+
+        self.layoutAboutToBeChanged.emit()
+
+        self._sort_column = column
+        self._sort_order = order
+        self._rows = self._get_rows()
+
+        self.layoutChanged.emit()
+
+        return
+
+    def set_filter(self, text):
+
+        '''Show only the rows where the text of any cell contains the given
+        text, ignoring case'''
+
+        self.beginResetModel()
+
+        self._filter_text = str(text).strip().lower()
+        self._rows = self._get_rows()
+        self._n_loaded = min(self.chunk_size, len(self._rows))
+
+        self.endResetModel()
+
+        return
+
+    def get_n_rows(self):
+
+        '''Get the number of rows which pass the filter'''
+
+        return len(self._rows)
+
+    def _get_rows(self):
+
+        rows = np.arange(len(self._frame))
+
+        if self._filter_text:
+
+            mask = np.zeros(len(rows), dtype=bool)
+
+            for column in range(len(self._arrays)):
+                strings = self._get_strings(column)
+                mask |= np.char.find(strings, self._filter_text) >= 0
+
+            rows = np.flatnonzero(mask)
+
+        if self._sort_column is None: return rows
+
+        keys = self._arrays[self._sort_column][rows]
+
+        try:
+            order = np.argsort(keys, kind="mergesort")
+        except TypeError:
+            order = np.argsort(self._get_strings(self._sort_column)[rows],
+                               kind="mergesort")
+
+        if self._sort_order == QtCore.Qt.DescendingOrder:
+            order = order[::-1]
+
+        return rows[order]
+
+    def _get_strings(self, column):
+
+        # Lower case text of the cells, made once per column
+        if column not in self._strings:
+
+            values = self._arrays[column]
+
+            if values.dtype.kind == "M":
+                strings = pd.Series(values).astype(str).values
+            else:
+                strings = values
+
+            self._strings[column] = np.char.lower(
+                                        np.asarray(strings).astype(unicode))
+
+        return self._strings[column]
+
+
+def _get_display_value(value):
+
+    if value is None: return None
+
+    if isinstance(value, np.datetime64):
+        if pd.isnull(value): return None
+        return str(pd.Timestamp(value))
+
+    if isinstance(value, np.generic): value = value.item()
+
+    if isinstance(value, float) and np.isnan(value): return None
+
+    return value
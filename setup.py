@@ -218,14 +218,19 @@ setup(name='dtocean-app',
            'dtocean-qt>=0.9',
            'pil',
            'polite==0.10.dev1',
+           'psutil',
           # 'sip',
           # 'PyQt4',
       ],
+      extras_require={
+          'hdf5': ['tables'],
+      },
       entry_points={
           'console_scripts':
               [
                'dtocean-app = dtocean_app:gui_interface',
-               'dtocean-app-config = dtocean_app:init_config_interface'
+               'dtocean-app-config = dtocean_app:init_config_interface',
+               'dtocean-app-batch = dtocean_app:batch_interface'
                ]},
       package_data={'': ['*.png', 'test_images/*.png'],
                     'dtocean_app': ['config/*.ini',
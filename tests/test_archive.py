@@ -0,0 +1,443 @@
+
+import os
+import copy
+import tarfile
+import cPickle as pickle
+from cStringIO import StringIO
+
+import pytest
+
+from dtocean_core.core import Core
+
+from dtocean_app.archive import (CompressedReader,
+                                 CompressedWriter,
+                                 ArchiveWriter,
+                                 LazyPoolData,
+                                 get_compression_types,
+                                 get_project_snapshot,
+                                 load_project_archive,
+                                 load_project_data,
+                                 save_project_archive,
+                                 set_project_saved)
+
+
+class MockPool(object):
+
+    def __init__(self):
+
+        self._data = {}
+        self._links = {}
+
+
+class MockSimulation(object):
+
+    def __init__(self, title):
+
+        self._title = title
+
+    def get_title(self):
+
+        return self._title
+
+
+class MockProject(object):
+
+    def __init__(self):
+
+        self.title = "Test"
+        self._pool = MockPool()
+        self._simulations = [MockSimulation("one"), MockSimulation("two")]
+
+
+@pytest.mark.parametrize("compression", get_compression_types())
+def test_compressed_roundtrip(compression):
+
+    test_obj = {"a": range(10000), "b": "line one\nline two"}
+
+    fileobj = StringIO()
+    writer = CompressedWriter(fileobj, compression)
+    pickle.dump(test_obj, writer, -1)
+    writer.close()
+
+    fileobj.seek(0)
+    reader = CompressedReader(fileobj, compression)
+    result = pickle.load(reader)
+
+    assert result == test_obj
+
+
+def test_compressed_writer_bad_compression():
+
+    with pytest.raises(ValueError):
+        CompressedWriter(StringIO(), "bad")
+
+
+def test_archive_writer(tmpdir):
+
+    archive_path = str(tmpdir.join("test.tar"))
+
+    with open(archive_path, "wb") as fileobj:
+
+        writer = ArchiveWriter(fileobj)
+        writer.add_bytes("test.txt", "Hello World")
+        member_name = writer.add_pickle("test.pkl", [1, 2, 3])
+        writer.close()
+
+    assert member_name == "test.pkl.gz"
+
+    tar = tarfile.open(archive_path)
+
+    assert tar.getnames() == ["test.txt", "test.pkl.gz"]
+    assert tar.extractfile("test.txt").read() == "Hello World"
+
+    reader = CompressedReader(tar.extractfile("test.pkl.gz"))
+
+    assert pickle.load(reader) == [1, 2, 3]
+
+    tar.close()
+
+
+def test_save_load_project_archive(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+    project._pool._links = {"index1": 1,
+                            "index2": 2}
+
+    save_path = str(tmpdir.join("test.dto"))
+
+    file_size, _ = save_project_archive(save_path, project, "local")
+
+    assert os.path.isfile(save_path)
+    assert file_size == os.path.getsize(save_path)
+    assert len(tmpdir.listdir()) == 1
+
+    core = Core()
+    test_project, scope, strategy = load_project_archive(save_path, core)
+
+    assert test_project.title == "Test"
+    assert test_project._pool._data == project._pool._data
+    assert test_project._pool._links == project._pool._links
+    assert scope == "local"
+    assert strategy is None
+
+
+def test_save_project_archive_bad_ext(tmpdir):
+
+    save_path = str(tmpdir.join("test.tar"))
+
+    with pytest.raises(ValueError):
+        save_project_archive(save_path, MockProject())
+
+
+def test_load_project_archive_lazy(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    core = Core()
+    test_project, _, _ = load_project_archive(save_path, core, lazy=True)
+    pool_data = test_project._pool._data
+
+    assert isinstance(pool_data, LazyPoolData)
+    assert len(pool_data) == 2
+    assert "index1" in pool_data
+    assert not pool_data.is_loaded("index1")
+    assert pool_data["index1"] == range(1000)
+    assert pool_data.is_loaded("index1")
+    assert not pool_data.is_loaded("index2")
+
+
+def test_save_project_archive_lazy_same_path(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    core = Core()
+    test_project, _, _ = load_project_archive(save_path, core, lazy=True)
+    pool_data = test_project._pool._data
+
+    assert pool_data["index2"] == "test"
+
+    save_project_archive(save_path, test_project, compression="gzip", level=1)
+
+    assert pool_data.get_n_unloaded() == 1
+    assert pool_data["index1"] == range(1000)
+
+    new_project, _, _ = load_project_archive(save_path, core)
+
+    assert new_project._pool._data == project._pool._data
+
+
+def test_save_project_archive_snapshot_same_path(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    core = Core()
+    test_project, _, _ = load_project_archive(save_path, core, lazy=True)
+    pool_data = test_project._pool._data
+
+    # Move the pool members of the new archive by enlarging the project
+    snapshot = get_project_snapshot(test_project)
+    snapshot.title = os.urandom(100000)
+
+    save_project_archive(save_path, snapshot)
+
+    # The project is not yet marked as saved, but reads the new archive
+    assert pool_data.get_n_unloaded() == 2
+    assert pool_data["index1"] == range(1000)
+    assert not os.path.isfile("{}.bak".format(save_path))
+
+    set_project_saved(test_project, snapshot)
+
+    assert pool_data["index2"] == "test"
+
+
+def test_lazy_pool_data_deepcopy(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    core = Core()
+    test_project, _, _ = load_project_archive(save_path, core, lazy=True)
+    pool_data = test_project._pool._data
+
+    pool_copy = copy.deepcopy(pool_data)
+
+    assert pool_copy.get_n_unloaded() == 2
+    assert pool_copy["index2"] == "test"
+    assert not pool_data.is_loaded("index2")
+
+    pool_data.load_all()
+
+    assert type(copy.deepcopy(pool_data)) is dict
+
+
+def test_load_project_data(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    core = Core()
+    test_project, _, _ = load_project_archive(save_path, core, lazy=True)
+    pool_data = test_project._pool._data
+
+    load_project_data(test_project)
+
+    assert pool_data.get_n_unloaded() == 0
+    assert type(pickle.loads(pickle.dumps(pool_data, -1))) is dict
+
+
+def test_save_project_archive_incremental(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    core = Core()
+    test_project, _, _ = load_project_archive(save_path, core, lazy=True)
+    pool_data = test_project._pool._data
+
+    pool_data["index2"] = "changed"
+    pool_data["index3"] = "new"
+
+    save_project_archive(save_path, test_project, incremental=True)
+
+    tar = tarfile.open(save_path)
+    names = tar.getnames()
+    tar.close()
+
+    pool_names = [name for name in names if name.startswith("pool/")]
+
+    assert len(pool_names) == 4
+    assert pool_data.is_saved("index2")
+    assert not pool_data.is_loaded("index1")
+
+    new_project, _, _ = load_project_archive(save_path, core)
+
+    assert new_project._pool._data == {"index1": range(1000),
+                                       "index2": "changed",
+                                       "index3": "new"}
+
+
+def test_save_project_archive_interrupted(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    # Append the members of a save which did not write its manifest
+    tar = tarfile.open(save_path)
+    tar.getmembers()
+    end_pos = tar.offset
+    tar.close()
+
+    changed = MockProject()
+    changed.title = "Changed"
+
+    with open(save_path, "r+b") as fileobj:
+
+        fileobj.seek(end_pos)
+        fileobj.truncate()
+
+        writer = ArchiveWriter(fileobj)
+        writer.add_bytes("scope.2.json", '"local"')
+        writer.add_pickle("project.2.pkl", changed)
+        writer.close()
+
+    core = Core()
+    test_project, scope, _ = load_project_archive(save_path, core, lazy=True)
+
+    assert test_project.title == "Test"
+    assert scope == "global"
+    assert "scope.2.json" not in test_project._pool._data.source._offsets
+
+    test_project._pool._data["index2"] = "changed"
+    save_project_archive(save_path, test_project, incremental=True)
+
+    tar = tarfile.open(save_path)
+    names = tar.getnames()
+    tar.close()
+
+    # The members of the interrupted save are replaced
+    assert names.count("scope.2.json") == 1
+    assert names.count("project.2.pkl.gz") == 1
+
+    new_project, _, _ = load_project_archive(save_path, core)
+
+    assert new_project.title == "Test"
+    assert new_project._pool._data == {"index1": range(1000),
+                                       "index2": "changed"}
+
+
+def test_save_project_archive_compact(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": range(1000)}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    project._pool._data["index2"] = range(10)
+    incremental_size, _ = save_project_archive(save_path,
+                                               project,
+                                               incremental=True)
+    compact_size, _ = save_project_archive(save_path, project)
+
+    tar = tarfile.open(save_path)
+    names = tar.getnames()
+    tar.close()
+
+    assert compact_size < incremental_size
+    assert len(names) == len(set(names))
+
+    core = Core()
+    new_project, _, _ = load_project_archive(save_path, core)
+
+    assert new_project._pool._data["index2"] == range(10)
+
+
+def test_save_project_archive_progress(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    progress = []
+
+    save_project_archive(save_path,
+                         project,
+                         progress_callback=lambda *args: progress.append(args))
+
+    assert len(progress) == 2
+    assert progress[-1][1:] == (2, 2)
+    assert progress[-1][0] > progress[0][0]
+
+
+def test_set_project_saved(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": "test"}
+
+    snapshot = get_project_snapshot(project)
+
+    # Change the project after the snapshot is taken
+    project._pool._data["index2"] = "changed"
+    project._simulations.append(MockSimulation("three"))
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, snapshot)
+    set_project_saved(project, snapshot)
+
+    pool_data = project._pool._data
+
+    assert len(snapshot._simulations) == 2
+    assert isinstance(pool_data, LazyPoolData)
+    assert pool_data.is_saved("index1")
+    assert not pool_data.is_saved("index2")
+
+    save_project_archive(save_path, project, incremental=True)
+
+    core = Core()
+    new_project, _, _ = load_project_archive(save_path, core)
+
+    assert new_project._pool._data["index2"] == "changed"
+    assert len(new_project._simulations) == 3
+
+
+def test_save_project_archive_dedup(tmpdir):
+
+    project = MockProject()
+    project._pool._data = {"index1": range(1000),
+                           "index2": range(1000),
+                           "index3": "test"}
+
+    save_path = str(tmpdir.join("test.dto"))
+    save_project_archive(save_path, project)
+
+    tar = tarfile.open(save_path)
+    names = tar.getnames()
+    tar.close()
+
+    pool_names = [name for name in names if name.startswith("pool/")]
+
+    assert len(pool_names) == 2
+
+    core = Core()
+    new_project, _, _ = load_project_archive(save_path, core, lazy=True)
+    pool_data = new_project._pool._data
+
+    assert pool_data["index1"] == range(1000)
+    assert pool_data["index2"] is pool_data["index1"]
+    assert len(pool_data.get_digests()) == 3
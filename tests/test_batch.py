@@ -0,0 +1,72 @@
+
+import pytest
+
+from dtocean_app import batch_parser
+from dtocean_app.batch import run_batch
+
+
+def test_batch_parser():
+    
+    (project_path,
+     run,
+     save_path,
+     compression,
+     level,
+     trace_warnings) = batch_parser(["test.dto"])
+    
+    assert project_path == "test.dto"
+    assert run == "current"
+    assert save_path is None
+    assert compression is None
+    assert level is None
+    assert not trace_warnings
+
+
+def test_batch_parser_options():
+    
+    (project_path,
+     run,
+     save_path,
+     compression,
+     level,
+     trace_warnings) = batch_parser(["test.dto",
+                                     "--run",
+                                     "strategy",
+                                     "--out",
+                                     "out.dto",
+                                     "--compression",
+                                     "gzip",
+                                     "--level",
+                                     "9"])
+    
+    assert project_path == "test.dto"
+    assert run == "strategy"
+    assert save_path == "out.dto"
+    assert compression == "gzip"
+    assert level == 9
+    
+    
+def test_run_batch_bad_run():
+    
+    with pytest.raises(ValueError):
+        run_batch("test.dto", run="bad")
+
+
+@pytest.mark.parametrize("allow_rerun", [True, False])
+def test_run_batch_strategy_run(mock, allow_rerun):
+    
+    strategy = mock.Mock(allow_rerun=allow_rerun, strategy_run=True)
+    
+    mock.patch("dtocean_app.batch.CachedCore")
+    mock.patch("dtocean_app.batch.get_result_cache")
+    mock.patch("dtocean_app.batch.load_project_archive",
+               return_value=(mock.Mock(), "global", strategy))
+    save_project_archive = mock.patch(
+                                "dtocean_app.batch.save_project_archive")
+    
+    run_batch("test.dto", run="strategy")
+    
+    # The stored state matches that set by the GUI after execution
+    assert strategy.execute.called
+    assert strategy.strategy_run is allow_rerun
+    assert save_project_archive.called
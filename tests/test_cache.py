@@ -0,0 +1,125 @@
+
+import os
+
+from dtocean_app.cache import ResultCache, connect_cached
+
+
+class MockInterface(object):
+
+    def __init__(self, data=None):
+
+        self.data = {"mock.input": None,
+                     "mock.optional": None,
+                     "mock.output": None}
+
+        if data is not None: self.data.update(data)
+
+    @classmethod
+    def get_name(cls):
+
+        return "Mock Module"
+
+    @classmethod
+    def get_inputs(cls, drop_masks=False):
+
+        return ["mock.input"], ["mock.optional"]
+
+    @classmethod
+    def get_outputs(cls):
+
+        return ["mock.output"]
+
+    def get_data(self, var_id):
+
+        return self.data[var_id]
+
+    def put_data(self, var_id, value):
+
+        self.data[var_id] = value
+
+
+class Connector(object):
+
+    def __init__(self):
+
+        self.calls = 0
+
+    def __call__(self, project, interface):
+
+        self.calls += 1
+        interface.put_data("mock.output", interface.get_data("mock.input") * 2)
+
+        return interface
+
+
+def test_result_cache_get_key(tmpdir):
+
+    cache = ResultCache(str(tmpdir))
+
+    key = cache.get_key(MockInterface({"mock.input": 1}))
+
+    assert key == cache.get_key(MockInterface({"mock.input": 1}))
+    assert key != cache.get_key(MockInterface({"mock.input": 2}))
+    assert key != cache.get_key(MockInterface({"mock.input": 1,
+                                               "mock.optional": 2}))
+
+
+def test_result_cache_get_key_unpicklable(tmpdir):
+
+    cache = ResultCache(str(tmpdir))
+
+    assert cache.get_key(MockInterface({"mock.input": lambda x: x})) is None
+
+
+def test_result_cache_put_get(tmpdir):
+
+    cache = ResultCache(str(tmpdir))
+
+    assert cache.get("missing") is None
+
+    cache.put("key", {"mock.output": range(10)})
+
+    assert cache.get("key") == {"mock.output": range(10)}
+    assert len(tmpdir.listdir()) == 1
+
+
+def test_result_cache_evict(tmpdir):
+
+    cache = ResultCache(str(tmpdir))
+
+    cache.put("old", {"mock.output": range(1000)})
+    cache.put("new", {"mock.output": range(1000)})
+
+    # Make the first result the least recently used
+    os.utime(os.path.join(str(tmpdir), "old.pkl"), (0, 0))
+
+    cache.max_size = cache.get_size() - 1
+    cache.evict()
+
+    assert cache.get("old") is None
+    assert cache.get("new") is not None
+
+
+def test_connect_cached(tmpdir):
+
+    cache = ResultCache(str(tmpdir))
+    connect = Connector()
+
+    interface = connect_cached(cache,
+                               connect,
+                               None,
+                               MockInterface({"mock.input": 2}))
+
+    assert interface.get_data("mock.output") == 4
+
+    interface = connect_cached(cache,
+                               connect,
+                               None,
+                               MockInterface({"mock.input": 2}))
+
+    assert interface.get_data("mock.output") == 4
+    assert connect.calls == 1
+
+    connect_cached(cache, connect, None, MockInterface({"mock.input": 3}))
+
+    assert connect.calls == 2
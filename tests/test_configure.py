@@ -4,7 +4,9 @@ from dtocean_app import (init_config,
                          init_config_parser,
                          init_config_interface,
                          start_logging)
-from dtocean_app.configure import get_install_paths
+from dtocean_app.configure import (get_cache_options,
+                                   get_console_options,
+                                   get_install_paths)
 
 
 def test_init_config(mocker, tmpdir):
@@ -167,3 +169,44 @@ def test_get_install_paths(mocker, tmpdir):
     test_dict = get_install_paths()
     
     assert "man_user_path" in test_dict
+
+
+def test_get_cache_options(mocker, tmpdir):
+    
+    # Make a source directory with some files
+    config_tmpdir = tmpdir.mkdir("config")
+    mock_dir = Directory(str(config_tmpdir))
+        
+    mocker.patch('dtocean_app.UserDataDirectory',
+                 return_value=mock_dir)
+                 
+    init_config()
+    
+    mocker.patch('dtocean_app.configure.UserDataDirectory',
+                 return_value=mock_dir)
+                 
+    test_dict = get_cache_options()
+    
+    assert not test_dict["enabled"]
+    assert test_dict["max_size"] == 1024
+
+
+def test_get_console_options(mocker, tmpdir):
+    
+    # Make a source directory with some files
+    config_tmpdir = tmpdir.mkdir("config")
+    mock_dir = Directory(str(config_tmpdir))
+        
+    mocker.patch('dtocean_app.UserDataDirectory',
+                 return_value=mock_dir)
+                 
+    init_config()
+    
+    mocker.patch('dtocean_app.configure.UserDataDirectory',
+                 return_value=mock_dir)
+                 
+    test_dict = get_console_options()
+    
+    assert test_dict["interval"] == 100
+    assert test_dict["max_buffer"] == 1000
+    assert test_dict["max_lines"] == 5000
@@ -0,0 +1,105 @@
+
+import pytest
+
+from dtocean_app.core import GUIProject, get_status_changes
+
+
+def test_get_status_changes():
+    
+    old_status = {"modules": {"Hydrodynamics": {"a": "required",
+                                                "b": "satisfied"}},
+                  "themes": {"Economics": {"a": "optional"}}}
+    new_status = {"modules": {"Hydrodynamics": {"a": "satisfied",
+                                                "b": "satisfied"}},
+                  "themes": {"Economics": {"a": "optional"}}}
+    
+    assert get_status_changes(old_status, new_status) == set(["a"])
+
+
+def test_get_status_changes_unchanged():
+    
+    status = {"modules": {"Hydrodynamics": {"a": "required"}}}
+    
+    assert get_status_changes(status, status) == set()
+
+
+def test_get_status_changes_new_interface():
+    
+    old_status = {"modules": {}}
+    new_status = {"modules": {"Hydrodynamics": {"a": "required",
+                                                "b": "optional"}},
+                  "themes": {"Economics": {"c": "optional"}}}
+    
+    assert get_status_changes(old_status, new_status) == set(["a",
+                                                              "b",
+                                                              "c"])
+
+
+def test_get_status_changes_none():
+    
+    status = {"modules": {"Hydrodynamics": {"a": "required"}}}
+    
+    assert get_status_changes(None, status) is None
+    assert get_status_changes(status, None) is None
+
+
+class MockSimulation(object):
+    
+    def __init__(self, title):
+        
+        self._title = title
+        
+    def get_title(self):
+        
+        return self._title
+        
+    def set_title(self, title):
+        
+        self._title = title
+
+
+def test_GUIProject_set_simulation_title_results():
+    
+    project = GUIProject("test")
+    project._set_simulation(MockSimulation("A"))
+    project._set_simulation(MockSimulation("B"))
+    
+    project.result_store.set("A", "level", "var", 1.)
+    project.result_store.set("B", "level", "var", 2.)
+    
+    project.set_simulation_title("X", title="A")
+    project.set_simulation_title("A", title="B")
+    
+    assert project.result_store.get("X", "level", "var") == 1.
+    assert project.result_store.get("A", "level", "var") == 2.
+
+
+def test_GUIProject_remove_simulation_results():
+    
+    project = GUIProject("test")
+    project._set_simulation(MockSimulation("A"))
+    project._set_simulation(MockSimulation("B"))
+    
+    project.result_store.set("A", "level", "var", 1.)
+    project.remove_simulation(title="A")
+    project._set_simulation(MockSimulation("C"))
+    project.set_simulation_title("A", title="C")
+    
+    with pytest.raises(KeyError):
+        project.result_store.get("A", "level", "var")
+
+
+def test_GUIProject_set_simulation_results(mock):
+    
+    project = GUIProject("test")
+    project.result_store.set("sim1", "level", "var", 1.)
+    project.result_store.set("sim2", "level", "var", 2.)
+    
+    simulation = mock.MagicMock()
+    simulation.get_title.return_value = "sim1"
+    project._set_simulation(simulation)
+    
+    assert project.result_store.get("sim2", "level", "var") == 2.
+    
+    with pytest.raises(KeyError):
+        project.result_store.get("sim1", "level", "var")
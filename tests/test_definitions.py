@@ -5,15 +5,22 @@ import datetime
 
 import numpy as np
 import pandas as pd
-from shapely.geometry import Point
+from shapely.geometry import MultiPoint, Point
 
 from attrdict import AttrDict
 from dtocean_app.data.definitions import (TimeSeries,
+                                          IndexTable,
+                                          IndexTableColumn,
+                                          LineTableColumn,
                                           NumpyLine,
                                           Histogram,
                                           SimpleDict,
                                           DateTimeDict,
-                                          PointDict)
+                                          PointDict,
+                                          get_auto_value,
+                                          get_coords_frame,
+                                          get_point_coords,
+                                          prepare_auto_value)
 
 
 def test_TimeSeries_input(qtbot):
@@ -232,3 +239,106 @@ def test_PointDict3D_output(qtbot):
     qtbot.addWidget(widget)
     
     assert True
+
+
+def test_get_coords_frame_2D():
+    
+    coords = np.array([(0, 1),
+                       (1, 2)])
+    
+    test = get_coords_frame(coords)
+    
+    assert list(test.columns) == ["x", "y", "z"]
+    assert np.array_equal(test["y"].values, [1, 2])
+    assert test["z"].isnull().all()
+
+
+def test_get_coords_frame_3D_keys():
+    
+    coords = [(0, 1, 2),
+              (1, 2, 3)]
+    
+    test = get_coords_frame(coords, ["a", "b"])
+    
+    assert list(test.columns) == ["Key", "x", "y", "z"]
+    assert list(test["Key"]) == ["a", "b"]
+    assert np.array_equal(test["z"].values, [2, 3])
+
+
+def test_get_coords_frame_mixed():
+    
+    coords = [(0, 1),
+              (1, 2, 3)]
+    
+    test = get_coords_frame(coords)
+    
+    assert np.array_equal(test["x"].values, [0, 1])
+    assert test["z"].iloc[0] is None
+    assert test["z"].iloc[1] == 3
+
+
+def test_get_coords_frame_empty():
+    
+    test = get_coords_frame([])
+    
+    assert test.empty
+    assert list(test.columns) == ["x", "y", "z"]
+
+
+def test_prepare_auto_value():
+    
+    test = PointDict()
+    test.get_connect_name = lambda: "auto_output"
+    
+    test_dict = {"b": Point([1, 1]),
+                 "a": Point([0, 0])}
+    test.data = AttrDict({'result': test_dict})
+    
+    prepare_auto_value(test, PointDict)
+    
+    # The prepared value is used without reading the data again
+    test.data.result = None
+    df = get_auto_value(test, PointDict.auto_output_value)
+    
+    assert list(df["Key"]) == ["a", "b"]
+    assert list(df["x"]) == [0, 1]
+
+
+def test_get_auto_value_not_prepared():
+    
+    test = SimpleDict()
+    test.get_connect_name = lambda: "auto_output"
+    test.data = AttrDict({'result': {"b": 2, "a": 1}})
+    
+    prepare_auto_value(test, DateTimeDict)
+    
+    # Values prepared by another method are not used
+    test.data.result = {"c": 3}
+    df = get_auto_value(test, SimpleDict.auto_output_value)
+    
+    assert list(df["Key"]) == ["c"]
+    
+    
+def test_auto_value_column_alias():
+    
+    assert IndexTableColumn.auto_input_value is IndexTable.auto_input_value
+    assert LineTableColumn.auto_output_value is IndexTable.auto_output_value
+
+
+def test_get_point_coords_multipoint():
+    
+    points = MultiPoint([(0, 1), (1, 2), (2, 3)])
+    
+    test = get_point_coords(points)
+    
+    assert isinstance(test, np.ndarray)
+    assert np.array_equal(test, [(0, 1), (1, 2), (2, 3)])
+
+
+def test_get_point_coords_list():
+    
+    points = [Point(0, 1), Point(1, 2, 3)]
+    
+    test = get_point_coords(points)
+    
+    assert test == [(0, 1), (1, 2, 3)]
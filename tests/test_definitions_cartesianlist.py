@@ -74,6 +74,25 @@ def test_CartesianList_output(qtbot):
     assert True
     
     
+def test_CartesianList_output_3D(qtbot):
+    
+    test = CartesianList()
+    setup_data(test)
+    test.data.result = np.array([(0, 1, 2),
+                                 (1, 2, 3)])
+    
+    test.auto_output(test)
+    widget = test.data.result
+    
+    widget.show()
+    qtbot.addWidget(widget)
+    
+    df = widget.datatable.model().dataFrame()
+    
+    assert len(df) == 2
+    assert np.array_equal(df.iloc[:, 2].values, [2, 3])
+    
+    
 def test_CartesianList_output_none(qtbot):
     
     test = CartesianList()
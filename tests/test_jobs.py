@@ -0,0 +1,103 @@
+
+from PyQt4 import QtCore
+
+from dtocean_app.jobs import Job, JobQueue
+
+
+class MockThread(QtCore.QThread):
+    
+    error_detected = QtCore.pyqtSignal(object, object, object)
+    
+    def __init__(self, log, name, fail=False):
+        
+        super(MockThread, self).__init__()
+        self._log = log
+        self._name = name
+        self._fail = fail
+    
+    def run(self):
+        
+        self._log.append(self._name)
+        
+        if self._fail:
+            self.error_detected.emit(ValueError, ValueError("Mock"), None)
+
+
+def test_job_queue_order(qtbot):
+    
+    log = []
+    queue = JobQueue(max_workers=1)
+    
+    # Block the queue until the other jobs are submitted
+    blocker = MockThread(log, "first")
+    first = queue.submit("first", blocker)
+    low = queue.submit("low", MockThread(log, "low"), priority=0)
+    high = queue.submit("high", MockThread(log, "high"), priority=1)
+    
+    assert first.state == Job.RUNNING
+    assert queue.get_pending() == [high, low]
+    
+    with qtbot.waitSignal(queue.queue_empty, timeout=5000):
+        pass
+    
+    assert log == ["first", "high", "low"]
+    assert low.state == Job.FINISHED
+
+
+def test_job_queue_dependency_failed(qtbot):
+    
+    log = []
+    queue = JobQueue()
+    
+    failing = queue.submit("fail", MockThread(log, "fail", fail=True))
+    dependent = queue.submit("dependent",
+                             MockThread(log, "dependent"),
+                             depends_on=[failing],
+                             resources=())
+    
+    with qtbot.waitSignal(queue.queue_empty, timeout=5000):
+        pass
+    
+    assert failing.state == Job.FAILED
+    assert failing.error[0] is ValueError
+    assert dependent.state == Job.CANCELLED
+    assert log == ["fail"]
+
+
+def test_job_queue_independent_resources(qtbot):
+    
+    log = []
+    queue = JobQueue(max_workers=2)
+    
+    first = queue.submit("first", MockThread(log, "first"))
+    second = queue.submit("second",
+                          MockThread(log, "second"),
+                          resources=("other",))
+    third = queue.submit("third", MockThread(log, "third"))
+    
+    assert first.state == Job.RUNNING
+    assert second.state == Job.RUNNING
+    assert third.state == Job.PENDING
+    
+    with qtbot.waitSignal(queue.queue_empty, timeout=5000):
+        pass
+    
+    assert sorted(log) == ["first", "second", "third"]
+
+
+def test_job_queue_cancel(qtbot):
+    
+    log = []
+    queue = JobQueue(max_workers=1)
+    
+    queue.submit("first", MockThread(log, "first"))
+    second = queue.submit("second", MockThread(log, "second"))
+    
+    assert queue.cancel(second)
+    assert not queue.cancel(second)
+    
+    with qtbot.waitSignal(queue.queue_empty, timeout=5000):
+        pass
+    
+    assert second.state == Job.CANCELLED
+    assert log == ["first"]
@@ -52,6 +52,38 @@ def test_new_project(qtbot, mock):
     assert test_var._id == "device.system_type"
 
 
+def test_jump_to_variable(qtbot, mock):
+    
+    shell = Shell()
+    window = DTOceanWindow(shell)
+    window.show()
+    qtbot.addWidget(window)
+    
+    mock.patch.object(QtGui.QMessageBox,
+                      'question',
+                      return_value=QtGui.QMessageBox.Yes)
+                      
+    # Get the new project button and click it
+    new_project_button = window.fileToolBar.widgetForAction(window.actionNew)
+    qtbot.mouseClick(new_project_button, QtCore.Qt.LeftButton)
+    
+    pipeline = window._pipeline_dock
+    unpopulated = [item for item in pipeline._branch_items
+                                                    if not item._populated]
+    
+    pipeline._jump_to_variable("device.system_type")
+    
+    test_var = pipeline.treeWidget.currentItem()
+    populated = [item for item in unpopulated if item._populated]
+    
+    assert isinstance(test_var, InputVarItem)
+    assert test_var._title == "Device Technology Type"
+    assert pipeline._get_var_item("Device Technology Type") is test_var
+    
+    # Only branches holding the variable are populated by the lookups
+    assert all("device.system_type" in item._id_index for item in populated)
+
+
 def test_set_device_type(qtbot, mock):
     
     shell = Shell()
@@ -81,8 +113,12 @@ def test_set_device_type(qtbot, mock):
                      pos=rect.topLeft())
     
     assert tree_widget.currentItem() == test_var
-    assert window._data_context._bottom_contents is not None
-    assert isinstance(window._data_context._bottom_contents, ListSelect)
+    
+    # The widget is built once the data has been loaded
+    def check_widget():
+        assert isinstance(window._data_context._bottom_contents, ListSelect)
+    
+    qtbot.waitUntil(check_widget)
                                   
     list_select = window._data_context._bottom_contents
     
@@ -102,6 +138,67 @@ def test_set_device_type(qtbot, mock):
     assert True
 
 
+def test_data_widget_not_cached(qtbot, mock):
+    
+    shell = Shell()
+    window = DTOceanWindow(shell)
+    window.show()
+    qtbot.addWidget(window)
+    
+    mock.patch.object(QtGui.QMessageBox,
+                      'question',
+                      return_value=QtGui.QMessageBox.Yes)
+                      
+    # Get the new project button and click it
+    new_project_button = window.fileToolBar.widgetForAction(window.actionNew)
+    qtbot.mouseClick(new_project_button, QtCore.Qt.LeftButton)
+    
+    test_var = window._pipeline_dock._find_item("Device Technology Type",
+                                                InputVarItem)
+    window._set_context_widget(test_var)
+    
+    def check_widget():
+        assert isinstance(window._data_context._bottom_contents, ListSelect)
+    
+    qtbot.waitUntil(check_widget)
+    
+    list_select = window._data_context._bottom_contents
+    
+    # Edit the value without submitting it
+    idx = list_select.comboBox.findText("Wave Floating",
+                                        QtCore.Qt.MatchFixedString)
+    list_select.comboBox.setCurrentIndex(idx)
+    
+    # Selecting the variable again builds a new input widget, which shows
+    # the value held by the project
+    window._set_context_widget(test_var, -1)
+    
+    def check_reloaded():
+        widget = window._data_context._bottom_contents
+        assert isinstance(widget, ListSelect)
+        assert widget is not list_select
+    
+    qtbot.waitUntil(check_reloaded)
+    
+    list_select = window._data_context._bottom_contents
+    
+    assert list_select.comboBox.currentIndex() != idx
+    
+    # Changing the data replaces it
+    list_select.comboBox.setCurrentIndex(idx)
+
+    qtbot.mouseClick(
+                list_select.buttonBox.button(QtGui.QDialogButtonBox.Ok),
+                QtCore.Qt.LeftButton)
+    
+    def check_replaced():
+        widget = window._data_context._bottom_contents
+        assert isinstance(widget, ListSelect)
+        assert widget is not list_select
+    
+    qtbot.waitUntil(check_replaced)
+
+
 def test_initiate_pipeline(qtbot, mock):
     
     shell = Shell()
@@ -129,6 +226,11 @@ def test_initiate_pipeline(qtbot, mock):
     qtbot.mouseClick(tree_widget.viewport(),
                      QtCore.Qt.LeftButton,
                      pos=rect.topLeft())
+    
+    def check_widget():
+        assert isinstance(window._data_context._bottom_contents, ListSelect)
+    
+    qtbot.waitUntil(check_widget)
                                   
     list_select = window._data_context._bottom_contents
     
@@ -201,6 +303,11 @@ def test_export_data(qtbot, mock, tmpdir):
     qtbot.mouseClick(tree_widget.viewport(),
                      QtCore.Qt.LeftButton,
                      pos=rect.topLeft())
+    
+    def check_widget():
+        assert isinstance(window._data_context._bottom_contents, ListSelect)
+    
+    qtbot.waitUntil(check_widget)
                                   
     list_select = window._data_context._bottom_contents
     
@@ -265,6 +372,11 @@ def test_import_data(qtbot, mock, tmpdir):
     qtbot.mouseClick(tree_widget.viewport(),
                      QtCore.Qt.LeftButton,
                      pos=rect.topLeft())
+    
+    def check_widget():
+        assert isinstance(window._data_context._bottom_contents, ListSelect)
+    
+    qtbot.waitUntil(check_widget)
                                   
     list_select = window._data_context._bottom_contents
     
@@ -326,3 +438,34 @@ def menu_click(qtbot, main_window, menu, action_name):
     errStr = "Action '{}' not found in menu '{}'".format(action_name,
                                                          menu.objectName())
     raise ValueError(errStr)
+
+
+def test_save_project_error(qtbot, mock, tmpdir):
+    
+    # The parent directory does not exist, so the save fails straight away
+    save_path = os.path.join(str(tmpdir), "missing", "project.dto")
+    
+    mock.patch.object(QtGui.QMessageBox,
+                      'question',
+                      return_value=QtGui.QMessageBox.Yes)
+    display_error = mock.patch.object(DTOceanWindow, '_display_error')
+    
+    shell = Shell()
+    window = DTOceanWindow(shell)
+    window.show()
+    qtbot.addWidget(window)
+                      
+    # Get the new project button and click it
+    new_project_button = window.fileToolBar.widgetForAction(window.actionNew)
+    qtbot.mouseClick(new_project_button, QtCore.Qt.LeftButton)
+    
+    window._start_save(save_path)
+    
+    def check_finished():
+        assert not window._save_progress.isVisible()
+        assert window.actionSave.isEnabled()
+        assert window.actionClose.isEnabled()
+    
+    qtbot.waitUntil(check_finished)
+    
+    assert display_error.called
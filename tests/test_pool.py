@@ -0,0 +1,96 @@
+
+import copy
+import cPickle as pickle
+
+from aneris.entity.data import DataPool
+
+from dtocean_app.pool import DedupDataPool, get_digest
+
+
+def test_get_digest():
+
+    assert get_digest(range(10)) == get_digest(range(10))
+    assert get_digest(range(10)) != get_digest(range(11))
+
+
+def test_dedup_data_pool_add():
+
+    pool = DedupDataPool()
+
+    index1 = pool.add(range(1000))
+    pool.link(index1)
+    index2 = pool.add(range(1000))
+    pool.link(index2)
+    index3 = pool.add("test")
+
+    assert index1 == index2
+    assert index3 != index1
+    assert len(pool) == 2
+    assert pool._links[index1] == 2
+
+
+def test_dedup_data_pool_add_index():
+
+    pool = DedupDataPool()
+
+    index1 = pool.add(range(1000))
+    index2 = pool.add(range(1000), "index2")
+
+    assert index2 == "index2"
+    assert index1 != index2
+
+
+def test_dedup_data_pool_pop():
+
+    pool = DedupDataPool()
+
+    index1 = pool.add(range(1000))
+    pool.pop(index1)
+    index2 = pool.add(range(1000))
+
+    assert index2 in pool
+    assert pool.get_digest(index2) == get_digest(range(1000))
+
+
+def test_dedup_data_pool_copy():
+
+    pool = DedupDataPool()
+
+    index1 = pool.add(range(1000))
+    index2 = pool.copy(index1)
+
+    assert index1 != index2
+    assert pool.get(index1) == pool.get(index2)
+
+
+def test_dedup_data_pool_pickle():
+
+    pool = DedupDataPool()
+    pool.add(range(1000))
+
+    test_pool = pickle.loads(pickle.dumps(pool, -1))
+
+    assert type(test_pool) is DataPool
+    assert test_pool._data == pool._data
+
+
+def test_dedup_data_pool_deepcopy():
+
+    pool = DedupDataPool()
+    index = pool.add(range(1000))
+
+    test_pool = copy.deepcopy(pool)
+
+    assert isinstance(test_pool, DedupDataPool)
+    assert test_pool.add(range(1000)) == index
+
+
+def test_dedup_data_pool_from_pool():
+
+    pool = DataPool()
+    index = pool.add(range(1000))
+
+    test_pool = DedupDataPool.from_pool(pool)
+
+    assert test_pool.get(index) == range(1000)
+    assert test_pool.add(range(1000)) != index
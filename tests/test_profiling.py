@@ -0,0 +1,91 @@
+
+import csv
+import json
+
+import pytest
+
+from dtocean_app.profiling import ExecutionProfiler, PeakMemoryMonitor
+
+
+def test_execution_profiler_measure():
+
+    records = []
+    profiler = ExecutionProfiler(records.append)
+
+    with profiler.measure("Default", "Mock Module", "module"):
+        sum(range(100000))
+
+    record = profiler.get_records()[0]
+
+    assert records == [record]
+    assert record["simulation"] == "Default"
+    assert record["name"] == "Mock Module"
+    assert record["kind"] == "module"
+    assert record["wall_time"] >= 0
+    assert record["process_cpu_time"] >= 0
+
+
+def test_execution_profiler_measure_error():
+
+    profiler = ExecutionProfiler()
+
+    with pytest.raises(ValueError):
+        with profiler.measure("Default", "Mock Theme", "theme"):
+            raise ValueError("Mock error")
+
+    assert len(profiler.get_records()) == 1
+
+
+def test_execution_profiler_clear():
+
+    profiler = ExecutionProfiler()
+
+    with profiler.measure("Default", "Mock Module", "module"):
+        pass
+
+    profiler.clear()
+
+    assert profiler.get_records() == []
+
+
+def test_execution_profiler_to_csv(tmpdir):
+
+    profiler = ExecutionProfiler()
+
+    with profiler.measure("Default", "Mock Module", "module"):
+        pass
+
+    csv_path = str(tmpdir.join("profile.csv"))
+    profiler.to_csv(csv_path)
+
+    with open(csv_path, "rb") as fstream:
+        rows = list(csv.DictReader(fstream))
+
+    assert len(rows) == 1
+    assert rows[0]["name"] == "Mock Module"
+
+
+def test_execution_profiler_to_json(tmpdir):
+
+    profiler = ExecutionProfiler()
+
+    with profiler.measure("Default", "Mock Module", "module"):
+        pass
+
+    json_path = str(tmpdir.join("profile.json"))
+    profiler.to_json(json_path)
+
+    with open(json_path) as fstream:
+        records = json.load(fstream)
+
+    assert len(records) == 1
+    assert records[0]["simulation"] == "Default"
+
+
+def test_peak_memory_monitor():
+
+    monitor = PeakMemoryMonitor(0.01)
+    monitor.start()
+    peak_rss = monitor.stop()
+
+    assert peak_rss > 0
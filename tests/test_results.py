@@ -0,0 +1,159 @@
+
+import os
+
+import pytest
+import pandas as pd
+
+from dtocean_app.results import ResultStore, export_results
+
+
+def test_ResultStore_get():
+    
+    store = ResultStore()
+    store.set("sim", "level", "var", 1.)
+    
+    assert store.get("sim", "level", "var") == 1.
+
+
+def test_ResultStore_get_missing():
+    
+    store = ResultStore()
+    store.set("sim", "level", "var", 1.)
+    
+    with pytest.raises(KeyError):
+        store.get("sim", "other level", "var")
+    
+    with pytest.raises(KeyError):
+        store.get("sim", "level", "other var")
+
+
+def test_ResultStore_remove_simulation():
+    
+    store = ResultStore()
+    store.set("sim1", "level", "var1", 1.)
+    store.set("sim1", "level", "var2", 2.)
+    store.set("sim2", "level", "var1", 3.)
+    
+    store.remove_simulation("sim1")
+    
+    assert store.get("sim2", "level", "var1") == 3.
+    
+    with pytest.raises(KeyError):
+        store.get("sim1", "level", "var1")
+    
+    with pytest.raises(KeyError):
+        store.get("sim1", "level", "var2")
+
+
+def test_ResultStore_rename_simulation():
+    
+    store = ResultStore()
+    store.set("sim1", "level", "var", 1.)
+    store.set("sim2", "level", "var", 2.)
+    
+    store.rename_simulation("sim1", "sim2")
+    
+    assert store.get("sim2", "level", "var") == 1.
+    
+    with pytest.raises(KeyError):
+        store.get("sim1", "level", "var")
+
+
+def test_ResultStore_clear():
+    
+    store = ResultStore()
+    store.set("sim", "level", "var", 1.)
+    store.clear()
+    
+    with pytest.raises(KeyError):
+        store.get("sim", "level", "var")
+
+
+def test_export_results(mock, tmpdir):
+    
+    pytest.importorskip("tables")
+    
+    metadata = {"scalar": mock.Mock(structure="SimpleData",
+                                    types=["float"],
+                                    title="Scalar",
+                                    units=["m"]),
+                "table": mock.Mock(structure="TableData",
+                                   types=None,
+                                   title="Table",
+                                   units=None),
+                "other": mock.Mock(structure="PointData",
+                                   types=None,
+                                   title="Other",
+                                   units=None)}
+    
+    def get_project_values(project, var_id, level, force_indexes, allow_none):
+        return [("sim", float(force_indexes[0]))]
+    
+    def get_simulation_value(project, var_id, level, sim_index):
+        return pd.DataFrame({"a": range(sim_index + 1)})
+    
+    core = mock.Mock()
+    core.get_metadata.side_effect = lambda var_id: metadata[var_id]
+    core.get_project_values.side_effect = get_project_values
+    core.get_simulation_value.side_effect = get_simulation_value
+    
+    project = mock.MagicMock()
+    project.__len__.return_value = 2
+    project.get_simulation_title.side_effect = \
+                                    lambda index: "sim{}".format(index)
+    
+    save_path = os.path.join(str(tmpdir), "results.h5")
+    outputs = [("level", "scalar"), ("level", "table"), ("level", "other")]
+    progress = []
+    
+    n_sims = export_results(core,
+                            project,
+                            save_path,
+                            outputs,
+                            progress_callback=lambda *x: progress.append(x))
+    
+    assert n_sims == 2
+    assert progress == [(1, 2), (2, 2)]
+    
+    sims = pd.read_hdf(save_path, "simulations")
+    variables = pd.read_hdf(save_path, "variables")
+    table = pd.read_hdf(save_path, "tables/table")
+    
+    assert list(sims["sim_title"]) == ["sim0", "sim1"]
+    assert list(sims["scalar"]) == [0., 1.]
+    assert set(variables["var_id"]) == set(["scalar", "table"])
+    assert list(table["sim_index"]) == [0, 1, 1]
+    assert list(table["a"]) == [0, 0, 1]
+
+
+def test_export_results_long_strings(mock, tmpdir):
+    
+    pytest.importorskip("tables")
+    
+    metadata = mock.Mock(structure="TableData",
+                         types=None,
+                         title="Table",
+                         units=None)
+    
+    # Strings in later simulations are longer than those first written
+    def get_simulation_value(project, var_id, level, sim_index):
+        return pd.DataFrame({"a": ["x" * 100 * (sim_index + 1)]})
+    
+    core = mock.Mock()
+    core.get_metadata.return_value = metadata
+    core.get_simulation_value.side_effect = get_simulation_value
+    
+    project = mock.MagicMock()
+    project.__len__.return_value = 3
+    project.get_simulation_title.side_effect = \
+                                    lambda index: "sim{}".format(index)
+    
+    save_path = os.path.join(str(tmpdir), "results.h5")
+    outputs = [("level", "table")]
+    
+    export_results(core, project, save_path, outputs)
+    
+    table = pd.read_hdf(save_path, "tables/table")
+    
+    assert list(table["sim_index"]) == [0, 1, 2]
+    assert [len(x) for x in table["a"]] == [100, 200, 300]
@@ -0,0 +1,59 @@
+
+import os
+
+from dtocean_app.strategies.checkpoint import StrategyCheckpoint
+
+
+def test_checkpoint_start(tmpdir):
+
+    checkpoint_path = os.path.join(str(tmpdir), "checkpoint")
+    checkpoint = StrategyCheckpoint(checkpoint_path)
+
+    assert not checkpoint.exists()
+
+    cases = [("Simulation 0", [("Mock Module", "mock.var", 1)]),
+             ("Simulation 1", [("Mock Module", "mock.var", 2)])]
+
+    checkpoint.start(cases)
+
+    assert checkpoint.exists()
+    assert checkpoint.get_cases() == cases
+    assert checkpoint.get_completed() == {}
+
+
+def test_checkpoint_set_completed(tmpdir):
+
+    checkpoint_path = os.path.join(str(tmpdir), "checkpoint")
+    checkpoint = StrategyCheckpoint(checkpoint_path)
+
+    cases = [("Simulation 0", [("Mock Module", "mock.var", 1)]),
+             ("Simulation 1", [("Mock Module", "mock.var", 2)])]
+
+    checkpoint.start(cases)
+
+    result_path = checkpoint.get_result_path(0)
+
+    with open(result_path, "wb") as fstream:
+        fstream.write("mock")
+
+    checkpoint.set_completed("Simulation 0", result_path)
+
+    # Missing files are not reported as completed
+    checkpoint.set_completed("Simulation 1", checkpoint.get_result_path(1))
+
+    assert checkpoint.get_completed() == {"Simulation 0": result_path}
+
+
+def test_checkpoint_clear(tmpdir):
+
+    checkpoint_path = os.path.join(str(tmpdir), "checkpoint")
+    checkpoint = StrategyCheckpoint(checkpoint_path)
+
+    checkpoint.start([])
+
+    assert os.path.isdir(checkpoint_path)
+
+    checkpoint.clear()
+
+    assert not os.path.isdir(checkpoint_path)
+    assert not checkpoint.exists()
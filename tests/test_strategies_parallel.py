@@ -0,0 +1,110 @@
+import sys
+
+import pytest
+
+from dtocean_app.profiling import ExecutionProfiler
+from dtocean_app.strategies import parallel
+from dtocean_app.strategies.parallel import ParallelExecutor
+from dtocean_app.strategies.progress import StrategyMonitor
+
+
+class MockCore(object):
+
+    def __init__(self, result_cache=None):
+
+        self.result_cache = result_cache
+        self.progress_monitor = None
+
+        return
+
+    def dump_project(self, project, dump_path):
+
+        with open(dump_path, "wb") as fstream:
+            fstream.write("mock")
+
+        return
+
+
+class MockProject(object):
+
+    def get_active_index(self):
+
+        return 0
+
+
+def mock_run_case(project_path, result_path, sim_title, var_values):
+
+    core = parallel._worker_core
+    core.progress_monitor.set_module(sim_title, "Mock Module")
+
+    with core.profiler.measure(sim_title, "Mock Module", "module"):
+        core.dump_project(None, result_path)
+
+    return sim_title, result_path, None
+
+
+# Worker processes only inherit the mocked functions when forked
+@pytest.mark.skipif(sys.platform == "win32",
+                    reason="Worker processes are not forked")
+def test_parallel_executor_progress(mock):
+
+    mock.patch.object(parallel, "CachedCore", MockCore)
+    mock.patch.object(parallel, "run_case", mock_run_case)
+    mock.patch.object(parallel, "load_project_data")
+    merge_result = mock.patch.object(ParallelExecutor, "_merge_result")
+
+    states = []
+    core = MockCore()
+    core.progress_monitor = StrategyMonitor(states.append)
+    core.profiler = ExecutionProfiler()
+
+    cases = [("Simulation 0", []),
+             ("Simulation 1", [])]
+
+    executor = ParallelExecutor(2)
+    sim_titles = executor.execute(core, MockProject(), cases)
+
+    assert sim_titles == ["Simulation 0", "Simulation 1"]
+    assert merge_result.call_count == 2
+
+    module_sims = set(state["simulation"] for state in states
+                                      if state["module"] == "Mock Module")
+
+    assert module_sims == set(["Simulation 0", "Simulation 1"])
+    assert states[-1]["n_complete"] == 2
+
+    profile_sims = set(record["simulation"]
+                                for record in core.profiler.get_records())
+
+    assert profile_sims == set(["Simulation 0", "Simulation 1"])
+
+
+def test_parallel_executor_one_task(mock):
+
+    cores = []
+
+    def run_case(project_path,
+                 result_path,
+                 sim_title,
+                 var_values,
+                 core=None):
+
+        cores.append(core)
+
+        return sim_title, result_path, None
+
+    mock.patch.object(parallel, "run_case", run_case)
+    mock.patch.object(parallel, "load_project_data")
+    mock.patch.object(parallel, "_worker_core", None)
+    mock.patch.object(ParallelExecutor, "_merge_result")
+
+    core = MockCore()
+    cases = [("Simulation 0", [])]
+
+    executor = ParallelExecutor(2)
+    sim_titles = executor.execute(core, MockProject(), cases)
+
+    # The case is run by the given core, without building a worker core
+    assert sim_titles == ["Simulation 0"]
+    assert cores == [core]
+    assert parallel._worker_core is None
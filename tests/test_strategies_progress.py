@@ -0,0 +1,88 @@
+
+import pytest
+
+from dtocean_app.strategies.progress import (StrategyCancelled,
+                                             StrategyMonitor,
+                                             format_progress)
+
+
+def test_strategy_monitor_set_module():
+
+    states = []
+    monitor = StrategyMonitor(states.append)
+    monitor.start(2)
+
+    monitor.set_module("Simulation 0", "Mock Module")
+    monitor.set_module("Simulation 0", "Mock Theme")
+
+    assert states[-1]["n_complete"] == 0
+    assert states[-1]["module"] == "Mock Theme"
+    assert monitor.get_eta() is None
+
+    monitor.set_module("Simulation 1", "Mock Module")
+
+    assert states[-1]["n_complete"] == 1
+    assert states[-1]["simulation"] == "Simulation 1"
+    assert monitor.get_eta() >= 0
+
+
+def test_strategy_monitor_set_simulation_complete():
+
+    monitor = StrategyMonitor()
+    monitor.start(3, 1)
+
+    assert monitor.get_eta() is None
+
+    monitor.set_simulation_complete("Simulation 1")
+    state = monitor.get_state()
+
+    assert state["n_complete"] == 2
+    assert state["module"] is None
+    assert monitor.get_eta() >= 0
+
+
+def test_strategy_monitor_cancel():
+
+    monitor = StrategyMonitor()
+    monitor.start(2)
+    monitor.check_cancelled()
+
+    monitor.cancel()
+
+    assert monitor.is_cancelled()
+
+    with pytest.raises(StrategyCancelled):
+        monitor.check_cancelled()
+
+
+def test_strategy_cancelled_is_keyboard_interrupt():
+
+    assert issubclass(StrategyCancelled, KeyboardInterrupt)
+
+
+def test_format_progress():
+
+    state = {"n_simulations": 4,
+             "n_complete": 1,
+             "simulation": "Simulation 1",
+             "module": "Mock Module",
+             "eta": 3725.,
+             "cancelled": False}
+
+    result = format_progress(state)
+
+    assert result == ("Simulation 2 of 4: Simulation 1\n"
+                      "Executing Mock Module\n"
+                      "Estimated time remaining: 1:02:05")
+
+
+def test_format_progress_unknown():
+
+    state = {"n_simulations": None,
+             "n_complete": 1,
+             "simulation": "Simulation 1",
+             "module": "Mock Module",
+             "eta": None,
+             "cancelled": False}
+
+    assert format_progress(state) == "1 simulations complete"
@@ -0,0 +1,19 @@
+
+import pytest
+
+from dtocean_app.utils.icons import get_status_icon
+
+
+def test_get_status_icon(qtbot):
+    
+    icon = get_status_icon("required")
+    
+    assert not icon.isNull()
+    assert get_status_icon("required") is icon
+    assert get_status_icon("satisfied") is not icon
+
+
+def test_get_status_icon_unknown(qtbot):
+    
+    with pytest.raises(KeyError):
+        get_status_icon("overwritten")
@@ -0,0 +1,72 @@
+
+from dtocean_app.widgets.cache import WidgetCache
+
+
+def test_WidgetCache_get():
+    
+    cache = WidgetCache()
+    widget = object()
+    cache.put(("sim", "var", 1), widget)
+    
+    assert cache.get(("sim", "var", 1)) is widget
+    assert cache.get(("sim", "var", 2)) is None
+
+
+def test_WidgetCache_evict():
+    
+    disposed = []
+    cache = WidgetCache(2, disposed.append)
+    
+    cache.put(("sim", "a"), "widget_a")
+    cache.put(("sim", "b"), "widget_b")
+    
+    # Use a, so b is the least recently used
+    cache.get(("sim", "a"))
+    cache.put(("sim", "c"), "widget_c")
+    
+    assert len(cache) == 2
+    assert disposed == ["widget_b"]
+    assert cache.get(("sim", "a")) == "widget_a"
+    assert cache.get(("sim", "b")) is None
+
+
+def test_WidgetCache_put_replace():
+    
+    disposed = []
+    cache = WidgetCache(dispose=disposed.append)
+    
+    cache.put(("sim", "a"), "widget_a")
+    cache.put(("sim", "a"), "widget_b")
+    
+    assert len(cache) == 1
+    assert disposed == ["widget_a"]
+    assert cache.has_widget("widget_b")
+    assert not cache.has_widget("widget_a")
+
+
+def test_WidgetCache_invalidate():
+    
+    disposed = []
+    cache = WidgetCache(dispose=disposed.append)
+    
+    cache.put(("sim1", "a", 1), "widget_a1")
+    cache.put(("sim2", "a", 1), "widget_a2")
+    cache.put(("sim1", "b", 1), "widget_b")
+    
+    cache.invalidate(set(["a"]))
+    
+    assert sorted(disposed) == ["widget_a1", "widget_a2"]
+    assert cache.get(("sim1", "b", 1)) == "widget_b"
+
+
+def test_WidgetCache_clear():
+    
+    disposed = []
+    cache = WidgetCache(dispose=disposed.append)
+    
+    cache.put(("sim", "a"), "widget_a")
+    cache.put(("sim", "b"), "widget_b")
+    cache.clear()
+    
+    assert len(cache) == 0
+    assert sorted(disposed) == ["widget_a", "widget_b"]
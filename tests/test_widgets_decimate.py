@@ -0,0 +1,96 @@
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from dtocean_app.widgets.decimate import (decimate_figure,
+                                          get_envelope_indices)
+
+
+def test_get_envelope_indices_small():
+    
+    x = np.arange(10.)
+    y = np.arange(10.)
+    
+    idx = get_envelope_indices(x, y, 0., 9., 10)
+    
+    assert (idx == np.arange(10)).all()
+
+
+def test_get_envelope_indices():
+    
+    x = np.arange(1000.)
+    y = np.zeros(1000)
+    y[123] = 5.
+    y[456] = -5.
+    
+    idx = get_envelope_indices(x, y, 0., 1000., 10)
+    
+    # Up to four samples in each of the ten columns
+    assert len(idx) <= 40
+    assert (np.diff(idx) > 0).all()
+    assert 123 in idx
+    assert 456 in idx
+    assert 0 in idx
+    assert 999 in idx
+
+
+def test_get_envelope_indices_view():
+    
+    x = np.arange(1000.)
+    y = np.sin(x)
+    
+    idx = get_envelope_indices(x, y, 200., 300., 10)
+    
+    # The samples either side of the view are included
+    assert idx[0] == 199
+    assert idx[-1] == 301
+
+
+def test_get_envelope_indices_nan():
+    
+    x = np.arange(1000.)
+    y = np.zeros(1000)
+    y[:100] = np.nan
+    y[50] = 1.
+    
+    idx = get_envelope_indices(x, y, 0., 1000., 10)
+    
+    assert 50 in idx
+
+
+def test_decimate_figure():
+    
+    x = np.arange(100000.)
+    y = np.sin(x / 1000.)
+    
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    line, = ax.plot(x, y)
+    
+    decimators = decimate_figure(fig)
+    n_full = len(line.get_xdata())
+    
+    ax.set_xlim(0, 1000)
+    n_zoom = len(line.get_xdata())
+    
+    plt.close(fig)
+    
+    assert len(decimators) == 1
+    assert decimators[0].get_n_samples() == 100000
+    assert n_full < 100000
+    assert n_zoom == 1002
+
+
+def test_decimate_figure_markers():
+    
+    x = np.arange(100000.)
+    
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    ax.plot(x, x, "o")
+    
+    decimators = decimate_figure(fig)
+    
+    plt.close(fig)
+    
+    assert not decimators
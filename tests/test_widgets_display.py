@@ -0,0 +1,71 @@
+
+import matplotlib.pyplot as plt
+from PyQt4 import QtCore, QtGui
+
+from dtocean_app.widgets.display import (PlotImageWidget,
+                                         render_figure,
+                                         close_figure)
+
+
+def test_render_figure():
+    
+    fig = plt.figure(figsize=(2, 1), dpi=50, facecolor="red")
+    image = render_figure(fig)
+    close_figure(fig)
+    
+    color = QtGui.QColor(image.pixel(0, 0))
+    
+    assert image.width() == 100
+    assert image.height() == 50
+    assert color.red() == 255
+    assert color.green() == 0
+    assert color.blue() == 0
+
+
+def test_render_figure_size():
+    
+    fig = plt.figure(figsize=(2, 1), dpi=50)
+    image = render_figure(fig, (80, 40))
+    hidpi_image = render_figure(fig, (80, 40), 2)
+    close_figure(fig)
+    
+    assert (image.width(), image.height()) == (80, 40)
+    assert (hidpi_image.width(), hidpi_image.height()) == (160, 80)
+    assert fig.get_dpi() == 50
+
+
+def test_PlotImageWidget_resize(qtbot):
+    
+    fig = plt.figure()
+    plt.plot([1, 2, 3])
+    
+    widget = PlotImageWidget(fig, render_figure(fig))
+    widget.show()
+    qtbot.addWidget(widget)
+    
+    widget.resize(300, 200)
+    label = widget._image_label
+    
+    qtbot.waitUntil(lambda: widget._image.width() == label.width() and
+                            widget._image.height() == label.height())
+    
+    close_figure(fig)
+
+
+def test_PlotImageWidget_interactive(qtbot):
+    
+    fig = plt.figure()
+    plt.plot([1, 2, 3])
+    
+    widget = PlotImageWidget(fig, render_figure(fig))
+    widget.show()
+    qtbot.addWidget(widget)
+    
+    assert not widget.is_interactive()
+    
+    qtbot.mouseClick(widget._interact_button, QtCore.Qt.LeftButton)
+    
+    assert widget.is_interactive()
+    assert widget.figure is fig
+    
+    close_figure(fig)
@@ -0,0 +1,42 @@
+
+from dtocean_app.widgets.docks import LogDock
+
+
+def test_LogDock_flush(qtbot):
+
+    dock = LogDock(None, interval=10)
+    qtbot.addWidget(dock)
+
+    dock._add_text("one\n")
+    dock._add_text("two\n")
+
+    assert dock._console.toPlainText() == ""
+
+    qtbot.waitUntil(lambda: dock._console.toPlainText() == "one\ntwo\n")
+
+
+def test_LogDock_dropped(qtbot):
+
+    dock = LogDock(None, max_buffer=2)
+    qtbot.addWidget(dock)
+
+    for i in range(5):
+        dock._add_text("{}\n".format(i))
+
+    dock._flush()
+
+    assert dock._console.toPlainText() == \
+                                    "[... 3 lines dropped ...]\n3\n4\n"
+
+
+def test_LogDock_max_lines(qtbot):
+
+    dock = LogDock(None, max_lines=3)
+    qtbot.addWidget(dock)
+
+    for i in range(5):
+        dock._add_text("{}\n".format(i))
+
+    dock._flush()
+
+    assert dock._console.document().blockCount() == 3
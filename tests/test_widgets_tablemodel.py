@@ -0,0 +1,74 @@
+
+import numpy as np
+import pandas as pd
+
+from PyQt4 import QtCore
+
+from dtocean_app.widgets.tablemodel import ArrayTableModel
+
+
+def get_model(n_rows=2500, chunk_size=1000):
+    
+    data = {"a": np.arange(n_rows),
+            "b": ["row{}".format(i) for i in range(n_rows)]}
+    frame = pd.DataFrame(data, columns=["a", "b"])
+    
+    model = ArrayTableModel(chunk_size=chunk_size)
+    model.setDataFrame(frame)
+    
+    return model
+
+
+def test_ArrayTableModel_fetch(qtbot):
+    
+    model = get_model()
+    
+    assert model.rowCount() == 1000
+    assert model.columnCount() == 2
+    assert model.canFetchMore()
+    
+    model.fetchMore()
+    model.fetchMore()
+    
+    assert model.rowCount() == 2500
+    assert not model.canFetchMore()
+
+
+def test_ArrayTableModel_data(qtbot):
+    
+    model = get_model()
+    index = model.index(10, 1)
+    
+    assert str(model.data(index).toString()) == "row10"
+    assert str(model.headerData(1, QtCore.Qt.Horizontal)) == "b"
+
+
+def test_ArrayTableModel_sort(qtbot):
+    
+    model = get_model()
+    model.sort(0, QtCore.Qt.DescendingOrder)
+    index = model.index(0, 0)
+    
+    assert model.data(index).toInt()[0] == 2499
+
+
+def test_ArrayTableModel_filter(qtbot):
+    
+    model = get_model()
+    model.set_filter("ROW24")
+    
+    # row24 and row240 to row249 and row2400 to row2499
+    assert model.get_n_rows() == 111
+    assert model.rowCount() == 111
+    
+    model.set_filter("")
+    
+    assert model.get_n_rows() == 2500
+
+
+def test_ArrayTableModel_no_copy(qtbot):
+    
+    model = get_model()
+    
+    assert np.may_share_memory(model._arrays[0],
+                               model.dataFrame()["a"].values)